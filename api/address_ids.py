@@ -0,0 +1,90 @@
+import contextvars
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 주소 사전 (주소 문자열 → 정수 id)
+# 파서(TxColumns)가 발급한 id 를 TxFrame 이 그대로 이어받으므로 주소 비교/조인을 int 배열 연산으로 할 수 있고,
+# 같은 주소 문자열은 한 사전 안에서 객체 하나만 메모리에 남음
+# 한 사전의 id 는 추가만 되고 재사용되지 않음 (0 = "unknown", 주소 없음은 -1)
+# 사전의 수명은 범위로 제한:
+#   - address_scope() 안 (분석 한 번, 배치 주소 하나)에서는 그 범위 전용 사전 — 범위가 끝나고 결과 객체가 사라지면 같이 해제
+#   - 범위 밖에서는 프로세스 기본 사전을 쓰되 ADDRESS_TABLE_MAX_SIZE 를 넘으면 새 사전(세대)으로 교체
+# 파싱 결과(TxColumns/TxRecords)와 TxFrame 은 자기 사전을 들고 있으므로 교체/범위 종료 뒤에도 id 가 그대로 유효
+UNKNOWN_ADDRESS = "unknown"
+NO_ADDRESS = -1
+ADDRESS_TABLE_MAX_SIZE = int(os.getenv("ADDRESS_TABLE_MAX_SIZE", "1000000"))
+
+
+class AddressTable:
+    """주소 ↔ id 사전. strings[id] 가 주소 문자열 (append-only 리스트라 그대로 인덱싱해도 됨)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = {UNKNOWN_ADDRESS: 0}
+        self.strings = [UNKNOWN_ADDRESS]
+
+    def __len__(self):
+        return len(self.strings)
+
+    def intern(self, address):
+        """주소의 id (처음 보는 주소면 새로 발급)"""
+        i = self._ids.get(address)
+        if i is None:
+            with self._lock:
+                i = self._ids.get(address)
+                if i is None:
+                    i = len(self.strings)
+                    self.strings.append(address)
+                    self._ids[address] = i
+        return i
+
+    def intern_many(self, addresses):
+        """주소 리스트 → int32 id 배열 (None/빈 문자열은 NO_ADDRESS)"""
+        intern = self.intern
+        return np.fromiter((intern(a) if a else NO_ADDRESS for a in addresses), dtype=np.int32)
+
+    def lookup(self, address):
+        """이미 발급된 id (없으면 NO_ADDRESS, 새로 발급하지 않음)"""
+        return self._ids.get(address, NO_ADDRESS)
+
+    def address(self, address_id):
+        return self.strings[address_id]
+
+    def addresses(self, ids):
+        strings = self.strings
+        return [strings[i] for i in np.asarray(ids).tolist()]
+
+
+_default = AddressTable()
+_default_lock = threading.Lock()
+_scoped = contextvars.ContextVar("address_table", default=None)
+
+
+def get_address_table():
+    """현재 범위의 주소 사전 (address_scope() 밖이면 프로세스 기본 사전 — 너무 커지면 새 세대로 교체)"""
+    table = _scoped.get()
+    if table is not None:
+        return table
+    global _default
+    if len(_default) > ADDRESS_TABLE_MAX_SIZE:
+        with _default_lock:
+            if len(_default) > ADDRESS_TABLE_MAX_SIZE:
+                _default = AddressTable()
+    return _default
+
+
+@contextmanager
+def address_scope():
+    """with 블록 안의 파싱/분석은 새 주소 사전 하나를 씀 (블록이 끝나면 이후 호출은 바깥 사전으로)"""
+    table = AddressTable()
+    token = _scoped.set(table)
+    try:
+        yield table
+    finally:
+        _scoped.reset(token)
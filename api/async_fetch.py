@@ -0,0 +1,70 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from api.fetch import get_transaction_data
+from api.parser import parse_mempool_transactions
+
+# 여러 주소를 동시에 조회하는 asyncio API
+# 실제 요청은 api.transport 의 공유 커넥션 풀을 쓰는 전용 스레드 풀에서 실행되므로
+# 커넥션 재사용, 재시도/백오프, 호스트별 요청 속도 제한이 그대로 적용됨
+DEFAULT_CONCURRENCY = 8
+
+
+def log(msg):
+    print(f"[ASYNC] {msg}")
+
+
+def _fetch_one(address, max_txs, parse):
+    try:
+        raw = get_transaction_data(address, max_txs=max_txs)
+    except Exception as e:
+        log(f"⚠️ {address}: {e}")
+        return address, [], str(e)
+    if isinstance(raw, dict) and "error" in raw:
+        return address, [], raw["error"]
+    return address, parse_mempool_transactions(raw) if parse else raw, None
+
+
+async def fetch_many(addresses, concurrency=DEFAULT_CONCURRENCY, max_txs=None, parse=True):
+    """
+    주소들의 트랜잭션을 동시에 가져와 완료되는 순서대로 돌려줍니다.
+    Args:
+        addresses: 주소 목록 (중복은 한 번만 조회)
+        concurrency: 동시에 조회할 최대 주소 수
+        max_txs: 주소당 최대 트랜잭션 수 (get_transaction_data 와 동일)
+        parse: True 면 parse_mempool_transactions 결과, False 면 원본 JSON 리스트
+    Yields:
+        (address, tx_list, error) — 실패 시 tx_list 는 빈 리스트, error 는 메시지
+    제너레이터를 중간에 닫거나 태스크가 취소되면 아직 시작하지 않은 조회는 버리고,
+    이미 진행 중인 조회(최대 concurrency 개)는 백그라운드에서 타임아웃 안에 마무리됩니다.
+    """
+    unique = list(dict.fromkeys(a.strip() for a in addresses if a and a.strip()))
+    if not unique:
+        return
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="fetch")
+    futures = [
+        asyncio.wrap_future(executor.submit(_fetch_one, address, max_txs, parse), loop=loop)
+        for address in unique
+    ]
+    try:
+        for next_done in asyncio.as_completed(futures):
+            yield await next_done
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def fetch_many_dict(addresses, concurrency=DEFAULT_CONCURRENCY, max_txs=None, parse=True):
+    """fetch_many 결과를 {address: tx_list} 로 모아서 반환"""
+    results = {}
+    async for address, tx_list, error in fetch_many(addresses, concurrency, max_txs, parse):
+        results[address] = tx_list
+    return results
+
+
+def fetch_many_sync(addresses, concurrency=DEFAULT_CONCURRENCY, max_txs=None, parse=True):
+    """이벤트 루프가 없는 스크립트/워커에서 쓰는 동기 래퍼"""
+    return asyncio.run(fetch_many_dict(addresses, concurrency, max_txs, parse))
@@ -0,0 +1,183 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import re
+import threading
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+
+from api import ratelimit
+from api.transport import http_get
+
+load_dotenv()
+
+# 체인 데이터 백엔드
+# 파이프라인은 Esplora REST 경로(/address/{a}/txs, /address/{a}/txs/chain/{txid},
+# /address/{a}/txs/mempool, /blocks/tip/height)만 사용하므로 백엔드는 경로 → JSON 만 책임짐
+# - mempool:  mempool.space 공개 API (기본값)
+# - esplora:  직접 운영하는 Esplora 노드 (ESPLORA_URL)
+# - fixture:  녹화해 둔 코퍼스를 로컬에서 그대로 서빙 (오프라인 벤치마크/테스트)
+MEMPOOL_BASE = "https://mempool.space/api"
+CHAIN_BACKEND = os.getenv("CHAIN_BACKEND", "mempool")
+ESPLORA_URL = os.getenv("ESPLORA_URL", "http://127.0.0.1:3002")
+# 자체 Esplora 노드의 초당 요청 수 (0 = 제한 없음)
+ESPLORA_RPS = float(os.getenv("ESPLORA_RPS", "0"))
+FIXTURE_DIR = os.getenv("FIXTURE_DIR", os.path.join(os.path.dirname(__file__), "..", "data", "fixtures"))
+
+# Esplora 의 confirmed 페이지 크기
+CHAIN_PAGE_SIZE = 25
+
+
+def log(msg):
+    print(f"[BACKEND] {msg}")
+
+
+class ChainBackend(ABC):
+    """
+    Esplora 호환 경로를 받아 (status, json, 받은 바이트 수) 를 돌려주는 백엔드
+    get_json 을 구현하지 않은 백엔드는 만들 때 TypeError
+    """
+
+    name = "base"
+    # 디스크 캐시(api.cache)를 거칠 가치가 있는지 (원격 백엔드만)
+    cacheable = True
+    # 요청을 보내는 호스트 (api.ratelimit 버킷 키, 로컬 백엔드는 None)
+    host = None
+
+    @abstractmethod
+    def get_json(self, path):
+        """path (예: /address/{a}/txs) → (status, json 또는 None, 받은 바이트 수)"""
+
+
+class EsploraBackend(ChainBackend):
+    """mempool.space 또는 직접 운영하는 Esplora REST 서버"""
+
+    def __init__(self, base_url, name="esplora"):
+        self.base_url = base_url.rstrip("/")
+        self.name = name
+        self.host = urlsplit(self.base_url).netloc
+
+    def get_json(self, path):
+        response = http_get(f"{self.base_url}{path}")
+        nbytes = len(response.content)
+        if response.status_code != 200:
+            return response.status_code, None, nbytes
+        return response.status_code, response.json(), nbytes
+
+
+class FixtureBackend(ChainBackend):
+    """
+    녹화된 코퍼스를 Esplora 와 같은 JSON 모양으로 서빙하는 로컬 백엔드.
+    코퍼스 구조:
+        <corpus>/address/<address>.json   최신순 전체 tx 리스트 (Esplora tx 형식)
+        <corpus>/tip_height.json          (선택) 체인 tip 높이
+    페이지네이션(첫 페이지 = 미확인 + confirmed 25개, 이후 txid 커서)도 Esplora 와 동일하게 흉내냄
+    """
+
+    name = "fixture"
+    cacheable = False
+
+    ROUTES = [
+        ("txs", re.compile(r"^/address/([^/]+)/txs$")),
+        ("chain", re.compile(r"^/address/([^/]+)/txs/chain(?:/([0-9A-Za-z_]+))?$")),
+        ("mempool", re.compile(r"^/address/([^/]+)/txs/mempool$")),
+        ("tip", re.compile(r"^/blocks/tip/height$")),
+    ]
+
+    def __init__(self, corpus_dir=None):
+        self.corpus_dir = corpus_dir or FIXTURE_DIR
+        self._histories = {}
+        self._lock = threading.Lock()
+
+    def history(self, address):
+        """주소의 최신순 전체 히스토리 (없으면 None)"""
+        with self._lock:
+            if address not in self._histories:
+                path = os.path.join(self.corpus_dir, "address", f"{address}.json")
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8") as f:
+                        self._histories[address] = json.load(f)
+                else:
+                    self._histories[address] = None
+            return self._histories[address]
+
+    def tip_height(self):
+        path = os.path.join(self.corpus_dir, "tip_height.json")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return int(json.load(f))
+        # 파일이 없으면 코퍼스에 있는 가장 높은 블록
+        heights = [tx.get("status", {}).get("block_height") or 0
+                   for name in os.listdir(os.path.join(self.corpus_dir, "address")) if name.endswith(".json")
+                   for tx in (self.history(name[:-5]) or [])]
+        return max(heights, default=0)
+
+    def route(self, path):
+        """경로를 처리해 (status, payload) 반환"""
+        for kind, pattern in self.ROUTES:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if kind == "tip":
+                return 200, self.tip_height()
+
+            history = self.history(match.group(1))
+            if history is None:
+                return 404, None
+            mempool = [tx for tx in history if not tx.get("status", {}).get("confirmed")]
+            chain = [tx for tx in history if tx.get("status", {}).get("confirmed")]
+            if kind == "txs":
+                return 200, mempool + chain[:CHAIN_PAGE_SIZE]
+            if kind == "mempool":
+                return 200, mempool
+
+            cursor = match.group(2)
+            start = 0
+            if cursor:
+                index = next((i for i, tx in enumerate(chain) if tx.get("txid") == cursor), None)
+                if index is None:
+                    return 400, None
+                start = index + 1
+            return 200, chain[start:start + CHAIN_PAGE_SIZE]
+        return 404, None
+
+    def get_json(self, path):
+        status, payload = self.route(path)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        return status, payload, len(body)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(kind=None):
+    kind = kind or CHAIN_BACKEND
+    if kind == "mempool":
+        return EsploraBackend(MEMPOOL_BASE, name="mempool")
+    if kind == "esplora":
+        # 공개 API 용 토큰 버킷을 자체 노드에까지 걸지 않도록 (RATE_LIMITS 에 명시했으면 그대로 둠)
+        ratelimit.RATE_LIMITS.setdefault(urlsplit(ESPLORA_URL).netloc, (ESPLORA_RPS, max(1.0, ESPLORA_RPS)))
+        return EsploraBackend(ESPLORA_URL)
+    if kind == "fixture":
+        return FixtureBackend()
+    raise ValueError(f"Unknown CHAIN_BACKEND: {kind}")
+
+
+def get_backend():
+    """CHAIN_BACKEND 설정에 따른 프로세스 전역 백엔드"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+                log(f"🔌 chain backend: {_backend.name}")
+    return _backend
+
+
+def set_backend(backend):
+    """백엔드 교체 (테스트, 배치 작업에서 사용). 이전 백엔드 반환"""
+    global _backend
+    with _backend_lock:
+        previous, _backend = _backend, backend
+    return previous
@@ -0,0 +1,516 @@
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from dotenv import load_dotenv
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+load_dotenv()
+
+# Bitcoin Core 블록 파일(blk*.dat) 직접 읽기
+# 주소마다 HTTP 로 히스토리를 긁는 대신 로컬 datadir 을 순차 스캔해서
+# Esplora 형식 트랜잭션 + 주소 → tx 인덱스를 만들고, 녹화 코퍼스(api.backends.FixtureBackend)로 내보냄
+#   python -m api.blockfile scan --addresses data/selected_addresses.csv --out data/fixtures
+#   CHAIN_BACKEND=fixture streamlit run app.py
+BITCOIN_BLOCKS_DIR = os.getenv("BITCOIN_BLOCKS_DIR", os.path.expanduser("~/.bitcoin/blocks"))
+BLOCKFILE_MAX_PASSES = int(os.getenv("BLOCKFILE_MAX_PASSES", "3"))
+
+# 네트워크 magic → (bech32 hrp, P2PKH 버전, P2SH 버전)
+NETWORKS = {
+    bytes.fromhex("f9beb4d9"): ("bc", 0x00, 0x05),    # mainnet
+    bytes.fromhex("0b110907"): ("tb", 0x6F, 0xC4),    # testnet3
+    bytes.fromhex("1c163f28"): ("tb", 0x6F, 0xC4),    # testnet4
+    bytes.fromhex("0a03cf40"): ("tb", 0x6F, 0xC4),    # signet
+    bytes.fromhex("fabfb5da"): ("bcrt", 0x6F, 0xC4),  # regtest
+}
+MAINNET = bytes.fromhex("f9beb4d9")
+
+NULL_TXID = bytes(32)
+COINBASE_VOUT = 0xFFFFFFFF
+
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+
+def log(msg):
+    print(f"[BLOCKFILE] {msg}")
+
+
+# ----------------------------------------------------------------------------
+# 주소 인코딩 (base58check, bech32/bech32m)
+# ----------------------------------------------------------------------------
+
+_B58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_B58_INDEX = {c: i for i, c in enumerate(_B58)}
+_BECH32 = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_BECH32_INDEX = {c: i for i, c in enumerate(_BECH32)}
+_BECH32M_CONST = 0x2BC830A3
+
+
+def sha256d(data):
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+
+
+def base58check_encode(version, payload):
+    data = bytes([version]) + payload
+    data += sha256d(data)[:4]
+    n = int.from_bytes(data, "big")
+    out = ""
+    while n:
+        n, r = divmod(n, 58)
+        out = _B58[r] + out
+    pad = len(data) - len(data.lstrip(b"\0"))
+    return "1" * pad + out
+
+
+def base58check_decode(text):
+    n = 0
+    for c in text:
+        n = n * 58 + _B58_INDEX[c]
+    pad = len(text) - len(text.lstrip("1"))
+    data = b"\0" * pad + (n.to_bytes((n.bit_length() + 7) // 8, "big") if n else b"")
+    if len(data) < 5 or sha256d(data[:-4])[:4] != data[-4:]:
+        raise ValueError("bad base58 checksum")
+    return data[0], data[1:-4]
+
+
+def _bech32_polymod(values):
+    gen = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+    chk = 1
+    for v in values:
+        top = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ v
+        for i in range(5):
+            chk ^= gen[i] if (top >> i) & 1 else 0
+    return chk
+
+
+def _bech32_hrp_expand(hrp):
+    return [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+
+
+def _convert_bits(data, from_bits, to_bits, pad=True):
+    acc = bits = 0
+    out = []
+    maxv = (1 << to_bits) - 1
+    for value in data:
+        acc = (acc << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            out.append((acc >> bits) & maxv)
+    if pad and bits:
+        out.append((acc << (to_bits - bits)) & maxv)
+    elif not pad and (bits >= from_bits or (acc << (to_bits - bits)) & maxv):
+        raise ValueError("invalid padding")
+    return out
+
+
+def segwit_encode(hrp, version, program):
+    """BIP173(v0) / BIP350(v1+) 주소"""
+    const = 1 if version == 0 else _BECH32M_CONST
+    data = [version] + _convert_bits(program, 8, 5)
+    polymod = _bech32_polymod(_bech32_hrp_expand(hrp) + data + [0] * 6) ^ const
+    checksum = [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+    return hrp + "1" + "".join(_BECH32[d] for d in data + checksum)
+
+
+def segwit_decode(address):
+    address = address.lower()
+    hrp, _, rest = address.rpartition("1")
+    data = [_BECH32_INDEX[c] for c in rest]
+    version = data[0]
+    const = 1 if version == 0 else _BECH32M_CONST
+    if _bech32_polymod(_bech32_hrp_expand(hrp) + data) != const:
+        raise ValueError("bad bech32 checksum")
+    return hrp, version, bytes(_convert_bits(data[1:-6], 5, 8, pad=False))
+
+
+def script_to_address(script, magic=MAINNET):
+    """scriptPubKey → (주소, Esplora scriptpubkey_type). 표준 스크립트가 아니면 주소는 None"""
+    hrp, p2pkh, p2sh = NETWORKS.get(magic, NETWORKS[MAINNET])
+    n = len(script)
+    if n == 25 and script[:3] == b"\x76\xa9\x14" and script[23:] == b"\x88\xac":
+        return base58check_encode(p2pkh, script[3:23]), "p2pkh"
+    if n == 23 and script[:2] == b"\xa9\x14" and script[22] == 0x87:
+        return base58check_encode(p2sh, script[2:22]), "p2sh"
+    if n == 22 and script[:2] == b"\x00\x14":
+        return segwit_encode(hrp, 0, script[2:]), "v0_p2wpkh"
+    if n == 34 and script[:2] == b"\x00\x20":
+        return segwit_encode(hrp, 0, script[2:]), "v0_p2wsh"
+    if n == 34 and script[:2] == b"\x51\x20":
+        return segwit_encode(hrp, 1, script[2:]), "v1_p2tr"
+    if n and script[0] == 0x6A:
+        return None, "op_return"
+    if n in (35, 67) and script[-1] == 0xAC:
+        return None, "p2pk"
+    return None, "unknown"
+
+
+def address_to_script(address):
+    """주소 → scriptPubKey (감시 목록을 바이트 비교로 찾기 위함)"""
+    if address[:3].lower() in ("bc1", "tb1") or address[:5].lower() == "bcrt1":
+        _, version, program = segwit_decode(address)
+        return bytes([0x50 + version if version else 0, len(program)]) + program
+    version, payload = base58check_decode(address)
+    if version in (0x00, 0x6F):
+        return b"\x76\xa9\x14" + payload + b"\x88\xac"
+    if version in (0x05, 0xC4):
+        return b"\xa9\x14" + payload + b"\x87"
+    raise ValueError(f"unsupported address version: {version}")
+
+
+# ----------------------------------------------------------------------------
+# 블록 / 트랜잭션 디코딩
+# ----------------------------------------------------------------------------
+
+def _varint(buf, pos):
+    n = buf[pos]
+    if n < 0xFD:
+        return n, pos + 1
+    if n == 0xFD:
+        return buf[pos + 1] | buf[pos + 2] << 8, pos + 3
+    if n == 0xFE:
+        return _U32.unpack_from(buf, pos + 1)[0], pos + 5
+    return _U64.unpack_from(buf, pos + 1)[0], pos + 9
+
+
+def parse_tx(buf, pos):
+    """
+    pos 에서 시작하는 트랜잭션 하나를 디코딩합니다.
+    buf 는 bytes 또는 mmap (슬라이스가 bytes 를 돌려주는 버퍼)
+    Returns:
+        (txid(표시용 hex), inputs[(prev_txid_bytes, vout)], outputs[(value, script)], vsize, 다음 위치)
+    """
+    start = pos
+    segwit = buf[pos + 4] == 0 and buf[pos + 5] == 1
+    pos += 6 if segwit else 4
+    body_start = pos
+
+    n_in, pos = _varint(buf, pos)
+    inputs = []
+    for _ in range(n_in):
+        prev = buf[pos:pos + 32]
+        vout = _U32.unpack_from(buf, pos + 32)[0]
+        script_len, pos = _varint(buf, pos + 36)
+        pos += script_len + 4
+        inputs.append((prev, vout))
+
+    n_out, pos = _varint(buf, pos)
+    outputs = []
+    for _ in range(n_out):
+        value = _U64.unpack_from(buf, pos)[0]
+        script_len, pos = _varint(buf, pos + 8)
+        outputs.append((value, buf[pos:pos + script_len]))
+        pos += script_len
+    body_end = pos
+
+    if segwit:
+        for _ in range(n_in):
+            n_items, pos = _varint(buf, pos)
+            for _ in range(n_items):
+                item_len, pos = _varint(buf, pos)
+                pos += item_len
+    locktime = buf[pos:pos + 4]
+    pos += 4
+
+    # txid 는 witness 를 뺀 직렬화의 double-SHA256
+    h = hashlib.sha256()
+    h.update(buf[start:start + 4])
+    h.update(buf[body_start:body_end])
+    h.update(locktime)
+    txid = hashlib.sha256(h.digest()).digest()[::-1].hex()
+
+    base_size = 8 + body_end - body_start
+    total_size = pos - start
+    vsize = (base_size * 3 + total_size + 3) // 4
+    return txid, inputs, outputs, vsize, pos
+
+
+def _read_xor_key(blocks_dir):
+    """Bitcoin Core 28+ 의 블록 파일 난독화 키 (없거나 0 이면 None)"""
+    path = os.path.join(blocks_dir, "xor.dat")
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        key = f.read()
+    return key if key.strip(b"\0") else None
+
+
+def _open_block_file(path):
+    """파일을 읽기 전용 mmap 으로 (빈 파일이면 b"")"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _unmask(data, xor_key, start, end):
+    """
+    data[start:end] 의 난독화를 푼 bytes — 키는 파일 오프셋 기준으로 반복 (key[(start + i) % len(key)])
+    파일 전체가 아니라 이 구간(블록 하나)만 복사함
+    """
+    import numpy as np
+    raw = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+    key = np.frombuffer(xor_key, dtype=np.uint8)
+    key = np.resize(np.roll(key, -(start % len(key))), len(raw))
+    plain = (raw ^ key).tobytes()
+    del raw  # mmap 을 닫을 수 있도록 뷰를 바로 놓음
+    return plain
+
+
+def iter_blocks(blocks_dir=None, files=None):
+    """
+    blk*.dat 을 순서대로 읽어 블록을 돌려줍니다 (파일 안 순서 = 디스크 순서, 높이 순서 아님).
+    파일은 mmap 으로 열고, 난독화된 파일(Core 28+ xor.dat)은 지금 블록 구간만 풀어서 넘김
+    Yields:
+        (magic, block_hash, prev_hash, block_time, buf, tx 시작 위치, tx 개수) — tx 위치는 buf 기준
+    """
+    blocks_dir = blocks_dir or BITCOIN_BLOCKS_DIR
+    paths = files or sorted(glob.glob(os.path.join(blocks_dir, "blk[0-9]*.dat")))
+    xor_key = _read_xor_key(blocks_dir)
+    for path in paths:
+        data = _open_block_file(path)
+        pos, end = 0, len(data)
+        try:
+            while pos + 88 <= end:
+                prefix = data[pos:pos + 8] if xor_key is None else _unmask(data, xor_key, pos, pos + 8)
+                magic = prefix[:4]
+                if magic not in NETWORKS:
+                    break  # 미리 할당된 0 영역
+                size = _U32.unpack_from(prefix, 4)[0]
+                if xor_key is None:
+                    buf, base = data, pos
+                else:
+                    buf, base = _unmask(data, xor_key, pos, min(pos + 8 + size, end)), 0
+                header = buf[base + 8:base + 88]
+                block_hash = sha256d(header)[::-1].hex()
+                prev_hash = header[4:36][::-1].hex()
+                block_time = _U32.unpack_from(header, 68)[0]
+                n_tx, tx_pos = _varint(buf, base + 88)
+                yield magic, block_hash, prev_hash, block_time, buf, tx_pos, n_tx
+                pos += 8 + size
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+# ----------------------------------------------------------------------------
+# 주소 → tx 인덱스
+# ----------------------------------------------------------------------------
+
+class BlockFileIndex:
+    """
+    블록 파일 스캔 결과. watch(감시 주소 집합)를 주면 그 주소가 입·출력에 등장하는 tx 만 모으고,
+    없으면 모든 tx 를 모음 (메모리를 많이 쓰므로 작은 구간/regtest 용).
+    입력의 prevout(보낸 주소, 금액)은 필요한 outpoint 만 기억했다가 다음 패스에서 채우므로
+    보통 2패스, 블록이 파일에 뒤섞여 저장된 경우 최대 max_passes 패스까지 돕니다.
+    """
+
+    def __init__(self, blocks_dir=None, watch=None, files=None):
+        self.blocks_dir = blocks_dir or BITCOIN_BLOCKS_DIR
+        self.files = files
+        self.watch = set(watch) if watch is not None else None
+        self.watch_scripts = {}
+        for address in self.watch or ():
+            try:
+                self.watch_scripts[address_to_script(address)] = address
+            except (ValueError, KeyError):
+                log(f"⚠️ 해석할 수 없는 주소 무시: {address}")
+
+        self.txs = {}            # txid → Esplora 형식 tx
+        self.address_txs = {}    # address → {txid}
+        self.blocks = {}         # block_hash → (prev_hash, block_time)
+        self.heights = {}        # block_hash → height (genesis 부터 이어진 경우)
+        self.tip_height = 0
+        self.stats = {"passes": 0, "blocks": 0, "txs_scanned": 0, "unresolved_prevouts": 0}
+        self._watched_outs = set()   # 감시 주소로 들어온 outpoint
+        self._needed = {}            # 채워야 할 prevout → [(txid, 입력 index)]
+
+    def _is_hit(self, txid, inputs, outputs):
+        if self.watch is None or txid in self.txs:
+            return True
+        if any(script in self.watch_scripts for _, script in outputs):
+            return True
+        return any(prevout in self._watched_outs for prevout in inputs)
+
+    def _add_tx(self, txid, inputs, outputs, vsize, magic, block_hash, block_time, tx_index):
+        vin = []
+        for prev, vout in inputs:
+            coinbase = prev == NULL_TXID and vout == COINBASE_VOUT
+            entry = {"txid": prev[::-1].hex(), "vout": vout, "is_coinbase": coinbase}
+            if not coinbase:
+                entry["prevout"] = None
+                self._needed.setdefault((prev, vout), []).append((txid, len(vin)))
+            vin.append(entry)
+
+        vout = []
+        for n, (value, script) in enumerate(outputs):
+            address, kind = script_to_address(script, magic)
+            out = {"scriptpubkey_type": kind, "value": value}
+            if address:
+                out["scriptpubkey_address"] = address
+                if self.watch is None or address in self.watch:
+                    self.address_txs.setdefault(address, set()).add(txid)
+                if script in self.watch_scripts:
+                    self._watched_outs.add((bytes.fromhex(txid)[::-1], n))
+            vout.append(out)
+
+        self.txs[txid] = {
+            "txid": txid,
+            "vin": vin,
+            "vout": vout,
+            "weight": vsize * 4,
+            "status": {"confirmed": True, "block_hash": block_hash, "block_time": block_time},
+            "_order": tx_index,
+        }
+
+    def _resolve(self, txid_bytes, outputs, magic):
+        for n, (value, script) in enumerate(outputs):
+            waiting = self._needed.pop((txid_bytes, n), None)
+            if waiting is None:
+                continue
+            address, kind = script_to_address(script, magic)
+            prevout = {"scriptpubkey_type": kind, "value": value}
+            if address:
+                prevout["scriptpubkey_address"] = address
+            for spender, index in waiting:
+                tx = self.txs[spender]
+                tx["vin"][index]["prevout"] = prevout
+                if address and (self.watch is None or address in self.watch):
+                    self.address_txs.setdefault(address, set()).add(spender)
+
+    def _scan_pass(self):
+        added = 0
+        for magic, block_hash, prev_hash, block_time, buf, pos, n_tx in iter_blocks(self.blocks_dir, self.files):
+            self.blocks[block_hash] = (prev_hash, block_time)
+            for tx_index in range(n_tx):
+                txid, inputs, outputs, vsize, pos = parse_tx(buf, pos)
+                if txid not in self.txs and self._is_hit(txid, inputs, outputs):
+                    self._add_tx(txid, inputs, outputs, vsize, magic, block_hash, block_time, tx_index)
+                    added += 1
+                if self._needed:
+                    self._resolve(bytes.fromhex(txid)[::-1], outputs, magic)
+                self.stats["txs_scanned"] += 1
+        self.stats["blocks"] = len(self.blocks)
+        self.stats["passes"] += 1
+        return added
+
+    def scan(self, max_passes=None):
+        max_passes = max_passes or BLOCKFILE_MAX_PASSES
+        for i in range(max_passes):
+            added = self._scan_pass()
+            log(f"🔎 pass {i + 1}: +{added} txs, {len(self._needed)} prevouts pending")
+            # 새로 찾은 tx 가 없으면 이번 패스에서 남은 prevout 을 모두 확인한 것
+            if added == 0:
+                break
+        self.stats["unresolved_prevouts"] = len(self._needed)
+        self._assign_heights()
+        self._finalize_fees()
+        return self
+
+    def _assign_heights(self):
+        """prev_hash 를 따라 높이를 계산하고 최장 체인에 없는(stale) 블록의 tx 는 제외"""
+        for block_hash in self.blocks:
+            chain = []
+            cursor = block_hash
+            while cursor in self.blocks and cursor not in self.heights:
+                chain.append(cursor)
+                cursor = self.blocks[cursor][0]
+            if cursor in self.heights:
+                base = self.heights[cursor]
+            elif cursor == "0" * 64:
+                base = -1
+            else:
+                continue  # genesis 까지 이어지지 않는 부분 스캔
+            for offset, h in enumerate(reversed(chain), start=1):
+                self.heights[h] = base + offset
+
+        if not self.heights:
+            return
+        tip = max(self.heights, key=self.heights.get)
+        self.tip_height = self.heights[tip]
+        best = set()
+        cursor = tip
+        while cursor in self.blocks:
+            best.add(cursor)
+            cursor = self.blocks[cursor][0]
+
+        for txid, tx in list(self.txs.items()):
+            block_hash = tx["status"]["block_hash"]
+            if block_hash in self.heights and block_hash not in best:
+                del self.txs[txid]
+                continue
+            tx["status"]["block_height"] = self.heights.get(block_hash)
+        for txids in self.address_txs.values():
+            txids.intersection_update(self.txs)
+
+    def _finalize_fees(self):
+        for tx in self.txs.values():
+            vin = tx["vin"]
+            if any(v["is_coinbase"] for v in vin):
+                tx["fee"] = 0
+            elif all(v.get("prevout") for v in vin):
+                tx["fee"] = sum(v["prevout"]["value"] for v in vin) - sum(o["value"] for o in tx["vout"])
+
+    def history(self, address):
+        """주소의 최신순 tx 리스트 (Esplora /address/{a}/txs 이어붙인 것과 같은 모양)"""
+        txs = [self.txs[txid] for txid in self.address_txs.get(address, ())]
+        txs.sort(key=lambda tx: (tx["status"].get("block_height") or 0, tx["status"]["block_time"], tx["_order"]),
+                 reverse=True)
+        return [{k: v for k, v in tx.items() if k != "_order"} for tx in txs]
+
+    def records(self, address):
+        """api.parser 가 만드는 정규화 레코드 리스트"""
+        from api.parser import parse_mempool_transactions
+        return parse_mempool_transactions(self.history(address))
+
+    def write_corpus(self, out_dir, addresses=None):
+        """FixtureBackend 가 그대로 서빙할 수 있는 코퍼스로 저장"""
+        os.makedirs(os.path.join(out_dir, "address"), exist_ok=True)
+        addresses = addresses if addresses is not None else sorted(self.address_txs)
+        for address in addresses:
+            with open(os.path.join(out_dir, "address", f"{address}.json"), "w", encoding="utf-8") as f:
+                json.dump(self.history(address), f)
+        with open(os.path.join(out_dir, "tip_height.json"), "w", encoding="utf-8") as f:
+            json.dump(self.tip_height, f)
+        log(f"💾 {len(addresses)} addresses → {out_dir}")
+
+
+def load_addresses(path):
+    """CSV(address / hacker_address 컬럼) 또는 한 줄에 하나씩 적힌 텍스트 파일"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            reader = csv.DictReader(f)
+            column = next((c for c in ("address", "hacker_address") if c in (reader.fieldnames or [])), None)
+            if column is None:
+                raise ValueError(f"{path}: address 컬럼이 없습니다")
+            return [row[column].strip() for row in reader if row[column].strip()]
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index addresses straight from Bitcoin Core block files")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_scan = sub.add_parser("scan", help="scan blk*.dat and write a fixture corpus")
+    p_scan.add_argument("--blocks-dir", default=None)
+    p_scan.add_argument("--addresses", required=True, help="CSV or text file of addresses to index")
+    p_scan.add_argument("--out", required=True)
+    p_scan.add_argument("--max-passes", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    watch = load_addresses(args.addresses)
+    log(f"🔍 {len(watch)} addresses, blocks dir: {args.blocks_dir or BITCOIN_BLOCKS_DIR}")
+    index = BlockFileIndex(args.blocks_dir, watch=watch).scan(args.max_passes)
+    index.write_corpus(args.out, addresses=watch)
+    log(f"✅ {index.stats}")
+
+
+if __name__ == "__main__":
+    main()
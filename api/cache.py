@@ -0,0 +1,244 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 주소별 트랜잭션 조회 결과를 디스크(SQLite)에 보관하는 캐시
+# - tx 본문은 txid(= 내용 해시)를 키로 한 번만 저장 (content-addressed, 주소 간 공유)
+# - 충분히 깊게 confirm 된 tx 는 불변이므로 배포 기간 동안 한 번만 가져옴
+# - 미확인/얕은 confirm 구간(head)은 TTL 동안만 유효
+# - 전체 크기가 상한을 넘으면 가장 오래 조회되지 않은 주소부터 제거 (LRU)
+# - 주소별 분석 상태(증분 탐지 상태, 금액 스케치 등)도 같은 주소 키로 보관하고 함께 제거
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "cache", "tx_cache.sqlite")
+TX_CACHE_PATH = os.getenv("TX_CACHE_PATH", DEFAULT_CACHE_PATH)
+TX_CACHE_MAX_BYTES = int(os.getenv("TX_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+TX_CACHE_UNCONFIRMED_TTL = float(os.getenv("TX_CACHE_UNCONFIRMED_TTL", "60"))
+# 이 깊이 이상 confirm 된 tx 만 불변으로 취급 (reorg 대비)
+REORG_SAFE_DEPTH = int(os.getenv("REORG_SAFE_DEPTH", "6"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tx (
+    txid TEXT PRIMARY KEY,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS address_tx (
+    address TEXT NOT NULL,
+    txid TEXT NOT NULL,
+    ord INTEGER NOT NULL,
+    PRIMARY KEY (address, txid)
+);
+CREATE INDEX IF NOT EXISTS address_tx_ord ON address_tx (address, ord);
+CREATE TABLE IF NOT EXISTS address_meta (
+    address TEXT PRIMARY KEY,
+    tip_height INTEGER,
+    complete INTEGER NOT NULL DEFAULT 0,
+    head BLOB,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS address_state (
+    address TEXT NOT NULL,
+    name TEXT NOT NULL,
+    body BLOB NOT NULL,
+    updated_at REAL NOT NULL,           -- 저장/조회 시각 (상태 LRU)
+    PRIMARY KEY (address, name)
+);
+"""
+
+
+def log(msg):
+    print(f"[CACHE] {msg}")
+
+
+def _pack(obj):
+    return zlib.compress(json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+def _unpack(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def is_stable(tx, tip_height):
+    """reorg 걱정 없이 영구 보관해도 되는 tx 인지"""
+    status = tx.get("status", {})
+    if not status.get("confirmed") or tip_height is None:
+        return False
+    height = status.get("block_height")
+    return height is not None and tip_height - height + 1 >= REORG_SAFE_DEPTH
+
+
+class TxCache:
+    """주소 트랜잭션 히스토리 디스크 캐시"""
+
+    def __init__(self, path=None, max_bytes=None, unconfirmed_ttl=None):
+        self.path = path or TX_CACHE_PATH
+        self.max_bytes = TX_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.unconfirmed_ttl = TX_CACHE_UNCONFIRMED_TTL if unconfirmed_ttl is None else unconfirmed_ttl
+        self.stats = {"hits": 0, "partial_hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def record(self, kind):
+        self.stats[kind] += 1
+
+    def get_entry(self, address):
+        """
+        주소 메타 정보 (없으면 None). 조회 시 LRU 시각 갱신
+        tip 없이 저장된 행(예전 버전이 상태만 저장하며 만든 빈 메타 행 등)은 히스토리로 치지 않음
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tip_height, complete, head, fetched_at FROM address_meta "
+                "WHERE address = ? AND tip_height IS NOT NULL", (address,)).fetchone()
+            if row is None:
+                return None
+            stable_count = self._conn.execute(
+                "SELECT COUNT(*) FROM address_tx WHERE address = ?", (address,)).fetchone()[0]
+            self._conn.execute("UPDATE address_meta SET last_access = ? WHERE address = ?",
+                               (time.time(), address))
+            self._conn.commit()
+        return {
+            "tip_height": row[0],
+            "complete": bool(row[1]),
+            "head": _unpack(row[2]) if row[2] else [],
+            "fetched_at": row[3],
+            "stable_count": stable_count,
+        }
+
+    def stable_txids(self, address):
+        with self._lock:
+            rows = self._conn.execute("SELECT txid FROM address_tx WHERE address = ?", (address,))
+            return {r[0] for r in rows}
+
+    def oldest_stable_txid(self, address):
+        """페이지네이션 커서로 쓸 가장 오래된 불변 txid"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT txid FROM address_tx WHERE address = ? ORDER BY ord ASC LIMIT 1",
+                (address,)).fetchone()
+        return row[0] if row else None
+
+    def stable_txs(self, address, limit=None):
+        """불변 구간 tx 를 최신순으로 반환"""
+        sql = ("SELECT tx.body FROM address_tx JOIN tx ON tx.txid = address_tx.txid "
+               "WHERE address_tx.address = ? ORDER BY address_tx.ord DESC")
+        params = (address,)
+        if limit:
+            sql += " LIMIT ?"
+            params += (limit,)
+        with self._lock:
+            return [_unpack(r[0]) for r in self._conn.execute(sql, params)]
+
+    def put(self, address, head, tip_height, complete, newer=(), older=()):
+        """
+        주소 캐시 갱신.
+        Args:
+            head: 미확인 + 얕은 confirm tx (최신순), 통째로 교체됨
+            newer: 기존 불변 구간보다 최신인 불변 tx (최신순)
+            older: 기존 불변 구간보다 오래된 불변 tx (최신순, 커서 이어받기 결과)
+        """
+        now = time.time()
+        with self._lock:
+            lo, hi = self._conn.execute(
+                "SELECT MIN(ord), MAX(ord) FROM address_tx WHERE address = ?", (address,)).fetchone()
+            lo = 0 if lo is None else lo
+            hi = -1 if hi is None else hi
+
+            rows = [(tx["txid"], hi + len(newer) - i) for i, tx in enumerate(newer)]
+            rows += [(tx["txid"], lo - 1 - i) for i, tx in enumerate(older)]
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tx (txid, body) VALUES (?, ?)",
+                [(tx["txid"], _pack(tx)) for tx in list(newer) + list(older)])
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO address_tx (address, txid, ord) VALUES (?, ?, ?)",
+                [(address, txid, ord_) for txid, ord_ in rows])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO address_meta "
+                "(address, tip_height, complete, head, fetched_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (address, tip_height, int(complete), _pack(head), now, now))
+            self._conn.commit()
+        self.evict()
+
+    def get_state(self, address, name):
+        """주소에 붙여 둔 직렬화 상태 (없으면 None). 조회 시 상태 LRU 시각 갱신"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM address_state WHERE address = ? AND name = ?", (address, name)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE address_state SET updated_at = ? WHERE address = ? AND name = ?",
+                                   (time.time(), address, name))
+                self._conn.commit()
+        return bytes(row[0]) if row else None
+
+    def put_state(self, address, name, body):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO address_state (address, name, body, updated_at) VALUES (?, ?, ?, ?)",
+                (address, name, body, now))
+            self._conn.commit()
+        self.evict()
+
+    def reset(self, address):
+        with self._lock:
+            self._drop(address)
+            self._conn.commit()
+
+    def _drop(self, address):
+        self._conn.execute("DELETE FROM address_tx WHERE address = ?", (address,))
+        self._conn.execute("DELETE FROM address_meta WHERE address = ?", (address,))
+        self._conn.execute("DELETE FROM address_state WHERE address = ?", (address,))
+
+    def size_bytes(self):
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        free_count = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_count) * page_size
+
+    def evict(self):
+        """크기 상한을 넘으면 LRU 순서로 주소를 제거 (상한의 90% 까지)"""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            if self.size_bytes() <= self.max_bytes:
+                return
+            # 히스토리(address_meta)와 상태(address_state) 중 더 최근에 쓴 시각 기준 — 상태만 있는 주소도 대상
+            victims = [r[0] for r in self._conn.execute(
+                "SELECT address, MAX(t) AS touched FROM ("
+                "SELECT address, last_access AS t FROM address_meta "
+                "UNION ALL SELECT address, updated_at AS t FROM address_state) "
+                "GROUP BY address ORDER BY touched ASC")]
+            for address in victims:
+                self._drop(address)
+                self._conn.execute(
+                    "DELETE FROM tx WHERE txid NOT IN (SELECT txid FROM address_tx)")
+                self.stats["evictions"] += 1
+                if self.size_bytes() <= self.max_bytes * 0.9:
+                    break
+            self._conn.commit()
+        log(f"🧹 evicted → {self.size_bytes():,} bytes")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """프로세스 전역 캐시 인스턴스"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TxCache()
+    return _cache
@@ -0,0 +1,241 @@
+import numpy as np
+
+from api.address_ids import NO_ADDRESS, UNKNOWN_ADDRESS, get_address_table
+
+# 컬럼형 트랜잭션 저장소
+# 기존 파서는 (입력 주소 × 출력) 마다 dict 를 하나씩 만들어서 50-in/50-out CoinJoin 하나가 2,500개 dict 가 됨
+# 여기서는 tx / 입력 / 출력을 각각 NumPy 배열로 한 번씩만 저장하고
+# from→to 엣지는 소비자가 요청할 때 (edges, to_records) 벡터 연산으로 펼침
+# 주소 id 는 현재 범위의 주소 사전(api.address_ids)의 id — 같은 사전으로 여러 번 파싱해도 같은 주소는 같은 id
+# to_records() 는 레코드마다 보낸/받은 주소 id 를 같이 들고 있는 TxRecords 를 돌려주고, TxFrame 이 그 id 를 그대로 씀
+# 주소가 없는 입력/출력(coinbase, OP_RETURN, 비표준 스크립트)의 주소 id 는 NO_ADDRESS(-1)
+
+
+class TxRecords(list):
+    """
+    레코드 리스트 + 파싱 때 발급한 주소 id
+        table              id 를 발급한 주소 사전
+        from_ids/to_ids    레코드별 보낸/받은 주소 id (int32, 레코드와 같은 순서)
+    순서를 바꾸거나 일부만 고를 때는 take(rows) 로 id 도 같이 옮김 (그냥 list 로 다루면 id 없는 보통 리스트가 됨)
+    """
+
+    def __init__(self, records, table, from_ids, to_ids):
+        super().__init__(records)
+        self.table = table
+        self.from_ids = np.asarray(from_ids, dtype=np.int32)
+        self.to_ids = np.asarray(to_ids, dtype=np.int32)
+
+    def take(self, rows, records=None):
+        """rows 위치의 레코드들 (records 를 주면 레코드는 그것으로 — 값만 고친 dict 를 넣을 때)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if records is None:
+            records = [self[i] for i in rows.tolist()]
+        return TxRecords(records, self.table, self.from_ids[rows], self.to_ids[rows])
+
+    def has_ids(self):
+        """리스트가 만들어진 뒤 append 등으로 바뀌지 않았는지 (바뀌었으면 id 를 믿지 않음)"""
+        return len(self.from_ids) == len(self) == len(self.to_ids)
+
+
+class TxColumns:
+    """
+    tx 단위 컬럼:      txid(list), block_time(int64, epoch 초), block_height(int64, 모르면 0), fee(int64, sat)
+    입력/출력 단위 컬럼: *_tx(tx 인덱스), *_addr(주소 id), *_value(int64, sat), *_type(스크립트 타입 id)
+    주소 id 는 table(파싱할 때의 주소 사전)의 id 이고 addresses 는 그 사전의 문자열 리스트 (0 = "unknown", -1 = 주소 없음),
+    스크립트 타입 id 는 script_types 리스트의 인덱스 (Esplora scriptpubkey_type 문자열)
+    입력/출력은 주소가 없어도 모두 담고(믹서 탐지용 I/O 구조), 엣지에는 주소가 있는 것만 씀 (기존 파서와 동일)
+    """
+
+    def __init__(self, txids, block_time, block_height, fee, in_tx, in_addr, in_value, in_type,
+                 out_tx, out_addr, out_value, out_type, table, script_types):
+        self.txids = txids
+        self.block_time = block_time
+        self.block_height = block_height
+        self.fee = fee
+        self.in_tx = in_tx
+        self.in_addr = in_addr
+        self.in_value = in_value
+        self.in_type = in_type
+        self.out_tx = out_tx
+        self.out_addr = out_addr
+        self.out_value = out_value
+        self.out_type = out_type
+        self.table = table
+        self.addresses = table.strings
+        self.script_types = script_types
+        self._edges = None
+
+    @classmethod
+    def from_esplora(cls, txs):
+        """Esplora(mempool.space) tx JSON 리스트에서 생성. block_time 이 없는 미확인 tx 는 건너뜀"""
+        table = get_address_table()
+        intern = table.intern
+        type_id = {}
+        txids, times, heights, fees = [], [], [], []
+        in_tx, in_addr, in_value, in_type = [], [], [], []
+        out_tx, out_addr, out_value, out_type = [], [], [], []
+
+        for tx in txs:
+            status = tx.get("status", {})
+            timestamp = status.get("block_time")
+            if not timestamp:
+                continue
+            t = len(txids)
+            txids.append(tx.get("txid", ""))
+            times.append(timestamp)
+            heights.append(status.get("block_height") or 0)
+            fees.append(tx.get("fee") or 0)
+
+            for inp in tx.get("vin", []):
+                prevout = inp.get("prevout") or {}
+                address = prevout.get("scriptpubkey_address")
+                kind = "coinbase" if inp.get("is_coinbase") else prevout.get("scriptpubkey_type", "unknown")
+                in_tx.append(t)
+                in_addr.append(NO_ADDRESS if address is None else intern(address))
+                in_value.append(prevout.get("value", 0))
+                in_type.append(type_id.setdefault(kind, len(type_id)))
+
+            for out in tx.get("vout", []):
+                address = out.get("scriptpubkey_address")
+                out_tx.append(t)
+                out_addr.append(intern(address) if address else NO_ADDRESS)
+                out_value.append(out.get("value", 0))
+                out_type.append(type_id.setdefault(out.get("scriptpubkey_type", "unknown"), len(type_id)))
+
+        return cls(
+            txids,
+            np.asarray(times, dtype=np.int64),
+            np.asarray(heights, dtype=np.int64),
+            np.asarray(fees, dtype=np.int64),
+            np.asarray(in_tx, dtype=np.int32),
+            np.asarray(in_addr, dtype=np.int32),
+            np.asarray(in_value, dtype=np.int64),
+            np.asarray(in_type, dtype=np.int16),
+            np.asarray(out_tx, dtype=np.int32),
+            np.asarray(out_addr, dtype=np.int32),
+            np.asarray(out_value, dtype=np.int64),
+            np.asarray(out_type, dtype=np.int16),
+            table,
+            list(type_id),
+        )
+
+    def __len__(self):
+        return len(self.txids)
+
+    @property
+    def n_edges(self):
+        """펼쳤을 때의 엣지 수 (실제로 펼치지 않고 계산)"""
+        in_counts = np.bincount(self.in_tx[self.in_addr != NO_ADDRESS], minlength=len(self.txids))
+        return int(np.maximum(in_counts, 1)[self.out_tx[self.out_addr != NO_ADDRESS]].sum())
+
+    def edges(self):
+        """
+        from→to 엣지 배열 (출력 순서, 그 안에서 입력 순서 — 기존 파서 레코드 순서와 동일)
+        주소가 있는 입력 × 주소가 있는 출력만 펼치고, 입력 주소가 하나도 없으면 from 은 "unknown"
+        Returns:
+            dict(tx, src, dst, value) — value 는 출력 금액(sat)
+        """
+        if self._edges is not None:
+            return self._edges
+
+        in_mask = self.in_addr != NO_ADDRESS
+        out_mask = self.out_addr != NO_ADDRESS
+        in_tx, in_addr = self.in_tx[in_mask], self.in_addr[in_mask]
+        out_tx, out_addr, out_value = self.out_tx[out_mask], self.out_addr[out_mask], self.out_value[out_mask]
+
+        n_tx = len(self.txids)
+        in_counts = np.bincount(in_tx, minlength=n_tx)
+        per_output = np.maximum(in_counts, 1)[out_tx]
+        total = int(per_output.sum())
+
+        # 출력 하나를 fanin 만큼 반복하고, 그 블록 안에서 몇 번째 입력인지 계산
+        out_index = np.repeat(np.arange(len(out_tx)), per_output)
+        local = np.arange(total) - np.repeat(np.cumsum(per_output) - per_output, per_output)
+        edge_tx = out_tx[out_index]
+
+        # in_tx 는 tx 순서대로 쌓였으므로 tx 별 첫 입력 위치 = 앞선 입력 개수의 누적합
+        in_start = np.cumsum(in_counts) - in_counts
+        src = np.zeros(total, dtype=np.int32)  # 0 = "unknown"
+        known = in_counts[edge_tx] > 0
+        src[known] = in_addr[in_start[edge_tx[known]] + local[known]]
+
+        self._edges = {
+            "tx": edge_tx,
+            "src": src,
+            "dst": out_addr[out_index],
+            "value": out_value[out_index],
+        }
+        return self._edges
+
+    def io_tables(self):
+        """
+        tx 별 입력/출력 요약 dict 리스트. to_records 가 같은 tx 의 모든 행에 같은 객체를 참조로 붙임
+        {"n_inputs", "n_outputs", "input_values", "output_values", "input_types", "output_types"} (금액은 sat)
+        """
+        n_tx = len(self.txids)
+        in_bounds = np.concatenate(([0], np.cumsum(np.bincount(self.in_tx, minlength=n_tx)))).tolist()
+        out_bounds = np.concatenate(([0], np.cumsum(np.bincount(self.out_tx, minlength=n_tx)))).tolist()
+        in_values, out_values = self.in_value.tolist(), self.out_value.tolist()
+        types = self.script_types
+        in_types = [types[k] for k in self.in_type.tolist()]
+        out_types = [types[k] for k in self.out_type.tolist()]
+        return [
+            {
+                "n_inputs": in_bounds[t + 1] - in_bounds[t],
+                "n_outputs": out_bounds[t + 1] - out_bounds[t],
+                "input_values": in_values[in_bounds[t]:in_bounds[t + 1]],
+                "output_values": out_values[out_bounds[t]:out_bounds[t + 1]],
+                "input_types": in_types[in_bounds[t]:in_bounds[t + 1]],
+                "output_types": out_types[out_bounds[t]:out_bounds[t + 1]],
+            }
+            for t in range(n_tx)
+        ]
+
+    def io_counts(self, txs=None):
+        """
+        tx 별 (입력 수, 출력 수, 가장 많이 반복된 양수 출력 금액의 개수) 배열 — txs 를 주면 그 tx 들만
+        반복 개수는 입력 수보다 많으면 0 (detection.equal_output_count 와 같은 규칙, io_tables 를 만들지 않고 계산)
+        """
+        n_tx = len(self.txids)
+        n_inputs = np.bincount(self.in_tx, minlength=n_tx)
+        n_outputs = np.bincount(self.out_tx, minlength=n_tx)
+        positive = self.out_value > 0
+        pairs, counts = np.unique(np.stack([self.out_tx[positive].astype(np.int64), self.out_value[positive]], axis=1),
+                                  axis=0, return_counts=True)
+        equal = np.zeros(n_tx, dtype=np.int64)
+        np.maximum.at(equal, pairs[:, 0], counts)
+        equal[n_inputs < equal] = 0
+        if txs is not None:
+            return n_inputs[txs], n_outputs[txs], equal[txs]
+        return n_inputs, n_outputs, equal
+
+    def to_records(self):
+        """
+        기존 parse_mempool_transactions 와 같은 dict 리스트 (호출할 때마다 새로 만듦, 주소 id 를 같이 든 TxRecords)
+        "block_time" 은 epoch 초(int) — 이후 단계는 문자열 timestamp 대신 이 값을 씀
+        "block_height" 는 포함된 블록 높이 (모르면 None) — 증분 재채점이 이미 넣은 행을 거를 때 씀
+        각 행의 "io" 는 해당 tx 의 입력/출력 요약 (같은 tx 의 행끼리 같은 객체를 공유)
+        """
+        edges = self.edges()
+        times = self.block_time.tolist()
+        heights = [height or None for height in self.block_height.tolist()]
+        timestamps = np.datetime_as_string(self.block_time.astype("datetime64[s]"), unit="s").tolist()
+        fees = [fee / 1e8 if fee else 0 for fee in self.fee.tolist()]
+        io = self.io_tables()
+        addresses = self.addresses
+        txids = self.txids
+        return TxRecords([
+            {
+                "timestamp": timestamps[t],
+                "block_time": times[t],
+                "block_height": heights[t],
+                "amount": round(value / 1e8, 8),
+                "from": addresses[s],
+                "to": addresses[d],
+                "tx_hash": txids[t],
+                "fee": fees[t],
+                "io": io[t],
+            }
+            for t, s, d, value in zip(edges["tx"].tolist(), edges["src"].tolist(),
+                                      edges["dst"].tolist(), edges["value"].tolist())
+        ], self.table, edges["src"], edges["dst"])
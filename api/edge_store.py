@@ -0,0 +1,260 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 한 번 확장한 주소 주변 거래를 디스크(SQLite)에 쌓아 두는 엣지 저장소
+# - 레코드(보낸 주소 → 받은 주소) 하나가 엣지 한 행: tx_hash, block_time, 금액(sat), tx 안 순번(ord)
+# - 주소는 저장소 전용 정수 id 로 저장하고 src/dst 인덱스로 나가는/들어오는 엣지를 바로 찾음
+# - 추가만 함 (이미 있는 tx 는 건너뜀). 동시에 쓰다 생긴 중복이나 빈 공간은 compact() 가 정리
+# - expanded 에 주소별로 히스토리를 언제, 몇 개 상한으로 가져왔는지 남겨, EDGE_STORE_TTL 안이고 필요한 만큼 있으면
+#   네트워크 조회 없이 저장소에서 서빙 (상한에 걸려 잘린 히스토리는 더 많이 필요할 때 miss)
+# 미확인 tx 는 바뀔 수 있으므로 저장하지 않음
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "cache", "edge_store.sqlite")
+EDGE_STORE_PATH = os.getenv("EDGE_STORE_PATH", DEFAULT_STORE_PATH)
+EDGE_STORE_ENABLED = os.getenv("EDGE_STORE_ENABLED", "1") == "1"
+EDGE_STORE_TTL = float(os.getenv("EDGE_STORE_TTL", str(24 * 3600)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS address (
+    id INTEGER PRIMARY KEY,
+    address TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS edge (
+    src INTEGER,
+    dst INTEGER,
+    tx_hash TEXT NOT NULL,
+    ord INTEGER NOT NULL,
+    block_time INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    fee INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS edge_src ON edge (src);
+CREATE INDEX IF NOT EXISTS edge_dst ON edge (dst);
+CREATE INDEX IF NOT EXISTS edge_tx ON edge (tx_hash, ord);
+CREATE TABLE IF NOT EXISTS expanded (
+    address_id INTEGER PRIMARY KEY,
+    n_records INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    complete INTEGER NOT NULL DEFAULT 0,
+    max_txs INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# 예전 파일의 expanded 에 없던 열 (기본값이면 잘렸는지 모르는 히스토리 → 다시 조회)
+EXPANDED_COLUMNS = {
+    "complete": "INTEGER NOT NULL DEFAULT 0",
+    "max_txs": "INTEGER NOT NULL DEFAULT 0",
+}
+
+# SQLite 변수 개수 제한 안에서 IN (...) 조회를 나눠서
+CHUNK = 500
+
+
+def log(msg):
+    print(f"[EDGES] {msg}")
+
+
+def _chunks(items):
+    items = list(items)
+    for i in range(0, len(items), CHUNK):
+        yield items[i:i + CHUNK]
+
+
+class EdgeStore:
+    """주소 주변 엣지 저장소 (append-only + compact)"""
+
+    def __init__(self, path=None, ttl=None):
+        self.path = path or EDGE_STORE_PATH
+        self.ttl = EDGE_STORE_TTL if ttl is None else ttl
+        self.stats = {"hits": 0, "misses": 0, "appended": 0}
+        self._lock = threading.Lock()
+        self._ids = {}
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(expanded)")}
+        for name, spec in EXPANDED_COLUMNS.items():
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE expanded ADD COLUMN {name} {spec}")
+        self._conn.commit()
+
+    def _address_id(self, address, create=True):
+        if address is None:
+            return None
+        i = self._ids.get(address)
+        if i is None:
+            if create:
+                self._conn.execute("INSERT OR IGNORE INTO address (address) VALUES (?)", (address,))
+            row = self._conn.execute("SELECT id FROM address WHERE address = ?", (address,)).fetchone()
+            if row is None:
+                return None
+            i = self._ids[address] = row[0]
+        return i
+
+    def append(self, address, tx_list, max_txs=0):
+        """
+        address 의 히스토리(레코드 리스트)를 추가하고 확장 시각을 기록. 새로 넣은 엣지 수 반환
+        max_txs: 히스토리를 가져올 때 쓴 tx 수 상한 (0 = 무제한) — tx 가 상한보다 적으면 전체 히스토리로 기록
+        """
+        confirmed = [tx for tx in tx_list if tx.get('block_time')]
+        n_txs = len({tx.get('tx_hash') for tx in tx_list})
+        complete = not max_txs or n_txs < max_txs
+        with self._lock:
+            hashes = {tx.get('tx_hash') for tx in confirmed}
+            known = set()
+            for chunk in _chunks(hashes):
+                marks = ",".join("?" * len(chunk))
+                known.update(r[0] for r in self._conn.execute(
+                    f"SELECT DISTINCT tx_hash FROM edge WHERE tx_hash IN ({marks})", chunk))
+
+            rows, ords = [], {}
+            for tx in confirmed:
+                tx_hash = tx.get('tx_hash')
+                # 같은 tx 안에서 몇 번째 레코드인지 (tx_hash, ord) 가 엣지의 정체
+                ord_ = ords[tx_hash] = ords.get(tx_hash, -1) + 1
+                if tx_hash in known:
+                    continue
+                rows.append((self._address_id(tx.get('from')), self._address_id(tx.get('to')), tx_hash, ord_,
+                             int(tx['block_time']), int(round((tx.get('amount') or 0) * 1e8)),
+                             int(round((tx.get('fee') or 0) * 1e8))))
+            self._conn.executemany(
+                "INSERT INTO edge (src, dst, tx_hash, ord, block_time, value, fee) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO expanded (address_id, n_records, fetched_at, complete, max_txs) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self._address_id(address), len(confirmed), time.time(), int(complete), max_txs or 0))
+            self._conn.commit()
+            self.stats["appended"] += len(rows)
+        return len(rows)
+
+    def expanded_entry(self, address):
+        """address 히스토리를 마지막으로 저장한 기록 {fetched_at, complete, max_txs} (없으면 None)"""
+        with self._lock:
+            i = self._address_id(address, create=False)
+            row = self._conn.execute("SELECT fetched_at, complete, max_txs FROM expanded WHERE address_id = ?",
+                                     (i,)).fetchone()
+        if row is None:
+            return None
+        return {"fetched_at": row[0], "complete": bool(row[1]), "max_txs": row[2]}
+
+    def expanded_at(self, address):
+        """address 히스토리를 마지막으로 저장한 시각 (없으면 None)"""
+        entry = self.expanded_entry(address)
+        return entry["fetched_at"] if entry else None
+
+    def edges(self, address, direction="out"):
+        """나가는(out) / 들어오는(in) 엣지 [(상대 주소, tx_hash, block_time, 금액 BTC)] — 시간순"""
+        column, other = ("src", "dst") if direction == "out" else ("dst", "src")
+        with self._lock:
+            i = self._address_id(address, create=False)
+            rows = self._conn.execute(
+                f"SELECT a.address, e.tx_hash, e.block_time, e.value FROM edge e "
+                f"LEFT JOIN address a ON a.id = e.{other} "
+                f"WHERE e.rowid IN (SELECT MIN(rowid) FROM edge WHERE {column} = ? GROUP BY tx_hash, ord) "
+                f"ORDER BY e.block_time, e.tx_hash, e.ord", (i,)).fetchall()
+        return [(peer, tx_hash, block_time, round(value / 1e8, 8)) for peer, tx_hash, block_time, value in rows]
+
+    def neighborhood(self, address, max_age=None, min_txs=0):
+        """
+        address 가 관여한 tx 들의 전체 레코드 (parse_mempool_transactions 와 같은 키, io 제외)
+        저장한 지 max_age(기본 ttl) 초가 지났거나 저장한 적이 없으면 None — 호출한 쪽이 네트워크에서 가져옴
+        min_txs: 필요한 tx 수 (0 = 전체 히스토리). 상한에 잘린 히스토리가 이보다 작은 상한으로 가져온 것이면 None
+        """
+        max_age = self.ttl if max_age is None else max_age
+        entry = self.expanded_entry(address)
+        if entry is None or (max_age and time.time() - entry["fetched_at"] > max_age):
+            self.stats["misses"] += 1
+            return None
+        if not entry["complete"] and not (min_txs and min_txs <= entry["max_txs"]):
+            self.stats["misses"] += 1
+            return None
+        with self._lock:
+            i = self._address_id(address, create=False)
+            rows = self._conn.execute(
+                "SELECT s.address, d.address, e.tx_hash, e.block_time, e.value, e.fee FROM edge e "
+                "LEFT JOIN address s ON s.id = e.src LEFT JOIN address d ON d.id = e.dst "
+                "WHERE e.rowid IN (SELECT MIN(rowid) FROM edge WHERE tx_hash IN "
+                "(SELECT tx_hash FROM edge WHERE src = ?1 UNION SELECT tx_hash FROM edge WHERE dst = ?1) "
+                "GROUP BY tx_hash, ord) "
+                "ORDER BY e.block_time, e.tx_hash, e.ord", (i,)).fetchall()
+        self.stats["hits"] += 1
+        times = np.array([r[3] for r in rows], dtype=np.int64)
+        timestamps = np.datetime_as_string(times.astype("datetime64[s]"), unit="s").tolist()
+        return [
+            {
+                "timestamp": timestamp,
+                "block_time": block_time,
+                "amount": round(value / 1e8, 8),
+                "from": sender,
+                "to": receiver,
+                "tx_hash": tx_hash,
+                "fee": fee / 1e8 if fee else 0,
+            }
+            for (sender, receiver, tx_hash, block_time, value, fee), timestamp in zip(rows, timestamps)
+        ]
+
+    def size_bytes(self):
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        return page_count * page_size
+
+    def summary(self):
+        with self._lock:
+            edges = self._conn.execute("SELECT COUNT(*) FROM edge").fetchone()[0]
+            addresses = self._conn.execute("SELECT COUNT(*) FROM address").fetchone()[0]
+            expanded = self._conn.execute("SELECT COUNT(*) FROM expanded").fetchone()[0]
+            size = self.size_bytes()
+        return {"edges": edges, "addresses": addresses, "expanded": expanded, "bytes": size}
+
+    def compact(self):
+        """중복 엣지((tx_hash, ord) 가 같은 행) 제거 후 VACUUM. 지운 행 수 반환"""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM edge WHERE rowid NOT IN (SELECT MIN(rowid) FROM edge GROUP BY tx_hash, ord)").rowcount
+            self._conn.commit()
+            if self.path != ":memory:":
+                self._conn.execute("VACUUM")
+        log(f"🧹 compacted: -{removed} duplicate edges → {self.size_bytes():,} bytes")
+        return removed
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_edge_store():
+    """프로세스 전역 엣지 저장소"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = EdgeStore()
+    return _store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or compact the local transaction edge store")
+    parser.add_argument("command", choices=("stats", "compact"))
+    parser.add_argument("--path", default=None)
+    args = parser.parse_args(argv)
+
+    store = EdgeStore(args.path)
+    if args.command == "compact":
+        store.compact()
+    log(f"📦 {store.summary()}")
+
+
+if __name__ == "__main__":
+    main()
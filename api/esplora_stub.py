@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from api.backends import FixtureBackend, create_backend
+
+# 로컬 Esplora 대역 서버
+#   녹화:  python -m api.esplora_stub record --out data/fixtures <address> ...
+#   서빙:  python -m api.esplora_stub serve --corpus data/fixtures --port 3002
+# 서빙 중에는 CHAIN_BACKEND=esplora, ESPLORA_URL=http://127.0.0.1:3002 로 앱/배치를 그대로 붙일 수 있음
+# (같은 프로세스에서 쓸 때는 HTTP 없이 CHAIN_BACKEND=fixture 가 더 빠름)
+
+
+def log(msg):
+    print(f"[STUB] {msg}")
+
+
+def make_handler(backend):
+    class EsploraStubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path.startswith("/api/"):  # mempool.space 스타일 prefix 도 허용
+                path = path[4:]
+            status, payload = backend.route(path)
+            body = json.dumps(payload).encode("utf-8") if payload is not None else b"Not Found"
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json" if payload is not None else "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return EsploraStubHandler
+
+
+def serve(corpus_dir, host="127.0.0.1", port=3002):
+    server = ThreadingHTTPServer((host, port), make_handler(FixtureBackend(corpus_dir)))
+    log(f"🚀 serving {corpus_dir} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def record(addresses, out_dir, backend=None, max_txs=0):
+    """
+    현재 백엔드(기본: CHAIN_BACKEND)에서 주소들의 전체 히스토리를 받아 코퍼스로 저장합니다.
+    max_txs=0 이면 끝까지 가져옴
+    """
+    from api.fetch import fetch_all_from_mempool, fetch_tip_height
+    from api.backends import set_backend
+
+    previous = set_backend(backend) if backend is not None else None
+    try:
+        os.makedirs(os.path.join(out_dir, "address"), exist_ok=True)
+        for address in addresses:
+            txs, stats = fetch_all_from_mempool(address, max_txs=max_txs)
+            if stats["error"] and not txs:
+                log(f"❌ {address}: {stats['error']}")
+                continue
+            with open(os.path.join(out_dir, "address", f"{address}.json"), "w", encoding="utf-8") as f:
+                json.dump(txs, f)
+            log(f"💾 {address}: {len(txs)} txs (complete={stats['complete']})")
+
+        tip = fetch_tip_height()
+        if tip is not None:
+            with open(os.path.join(out_dir, "tip_height.json"), "w", encoding="utf-8") as f:
+                json.dump(tip, f)
+    finally:
+        if backend is not None:
+            set_backend(previous)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Esplora stand-in")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="serve a recorded corpus over HTTP")
+    p_serve.add_argument("--corpus", default=None)
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=3002)
+
+    p_record = sub.add_parser("record", help="record address histories into a corpus")
+    p_record.add_argument("addresses", nargs="+")
+    p_record.add_argument("--out", required=True)
+    p_record.add_argument("--backend", default=None, help="mempool | esplora (default: CHAIN_BACKEND)")
+    p_record.add_argument("--max-txs", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(args.corpus or FixtureBackend().corpus_dir, args.host, args.port)
+    else:
+        backend = create_backend(args.backend) if args.backend else None
+        record(args.addresses, args.out, backend=backend, max_txs=args.max_txs)
+
+
+if __name__ == "__main__":
+    main()
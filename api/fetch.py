@@ -1,16 +1,221 @@
-import requests
 import os
+import time
 from dotenv import load_dotenv
 
+from api.backends import CHAIN_PAGE_SIZE, get_backend
+from api.cache import get_cache, is_stable
+
 load_dotenv()
-MEMPOOL_BASE = "https://mempool.space/api"
+
+# Esplora(mempool.space 포함)는 confirmed 트랜잭션을 페이지당 25개씩 돌려줌
+MEMPOOL_CHAIN_PAGE_SIZE = CHAIN_PAGE_SIZE
+# 주소 하나당 가져올 최대 트랜잭션 수 (None/0 이면 무제한)
+MEMPOOL_MAX_TXS = int(os.getenv("MEMPOOL_MAX_TXS", "5000"))
+# 디스크 캐시 사용 여부
+TX_CACHE_ENABLED = os.getenv("TX_CACHE_ENABLED", "1") == "1"
+
+
+def log(msg):
+    print(f"[FETCH] {msg}")
+
+
+def _get_json(path):
+    """설정된 체인 백엔드(CHAIN_BACKEND)에서 Esplora 경로를 조회해 (status, json, 받은 바이트 수) 반환"""
+    return get_backend().get_json(path)
+
+
+def iter_mempool_pages(address, max_txs=None, stats=None, after_txid=None):
+    """
+    주소의 전체 트랜잭션 히스토리를 페이지 단위로 스트리밍합니다.
+    - 첫 페이지: /address/{address}/txs (미확인 + 최신 confirmed 25개)
+    - 이후: /address/{address}/txs/chain/{last_seen_txid} 커서를 소진될 때까지 따라감
+    Args:
+        address: 비트코인 주소
+        max_txs: 최대 트랜잭션 수 (None이면 MEMPOOL_MAX_TXS, 0이면 무제한)
+        stats: 전달하면 pages / bytes / txs / complete / error 를 채워줌
+        after_txid: 지정하면 해당 confirmed tx 이후(더 오래된 쪽)부터 이어서 가져옴
+    Yields:
+        트랜잭션 dict 리스트 (페이지 하나)
+    """
+    if max_txs is None:
+        max_txs = MEMPOOL_MAX_TXS
+    if stats is None:
+        stats = {}
+    stats.update({"pages": 0, "bytes": 0, "txs": 0, "complete": False, "error": None})
+
+    if after_txid:
+        url = f"/address/{address}/txs/chain/{after_txid}"
+    else:
+        url = f"/address/{address}/txs"
+    while True:
+        status, page, nbytes = _get_json(url)
+        stats["bytes"] += nbytes
+        if status != 200 or not isinstance(page, list):
+            stats["error"] = f"Status {status}"
+            log(f"⚠️ {address}: page {stats['pages'] + 1} failed ({stats['error']})")
+            return
+
+        stats["pages"] += 1
+        # 커서는 마지막 confirmed 트랜잭션 (미확인 tx는 chain 페이지에 없음)
+        confirmed = [tx for tx in page if tx.get("status", {}).get("confirmed")]
+        exhausted = len(confirmed) < MEMPOOL_CHAIN_PAGE_SIZE
+
+        if max_txs and stats["txs"] + len(page) > max_txs:
+            page = page[:max_txs - stats["txs"]]
+            exhausted = False
+        stats["txs"] += len(page)
+        if page:
+            yield page
+
+        if exhausted:
+            stats["complete"] = True
+            return
+        if max_txs and stats["txs"] >= max_txs:
+            log(f"⏹ {address}: max_txs budget ({max_txs}) reached")
+            return
+        url = f"/address/{address}/txs/chain/{confirmed[-1]['txid']}"
+
+
+def fetch_all_from_mempool(address, max_txs=None):
+    """전체 히스토리를 모아서 (트랜잭션 리스트, 통계) 반환"""
+    stats = {}
+    txs = []
+    for page in iter_mempool_pages(address, max_txs=max_txs, stats=stats):
+        txs.extend(page)
+    log(f"✅ {address}: {stats['txs']} txs, {stats['pages']} pages, {stats['bytes']:,} bytes")
+    return txs, stats
+
+
+def fetch_tip_height():
+    """현재 체인 tip 높이 (실패 시 None)"""
+    try:
+        status, height, _ = _get_json("/blocks/tip/height")
+    except Exception as e:
+        log(f"⚠️ tip height 조회 실패: {e}")
+        return None
+    return height if status == 200 and isinstance(height, int) else None
+
+
+def fetch_mempool_txs(address):
+    """주소의 미확인 트랜잭션만 조회 (실패 시 None)"""
+    status, txs, _ = _get_json(f"/address/{address}/txs/mempool")
+    return txs if status == 200 and isinstance(txs, list) else None
+
+
+def fetch_with_cache(address, max_txs=None, cache=None):
+    """
+    디스크 캐시를 거쳐 히스토리를 가져옵니다.
+    - TTL 이내: 네트워크 없이 캐시에서 바로 반환
+    - tip 변화 없음: 미확인 tx 만 새로 조회
+    - tip 변화: 최신 페이지부터 이미 캐시된 불변 tx 를 만날 때까지만 조회
+    - 예산이 남았고 히스토리가 덜 채워졌으면 가장 오래된 txid 커서부터 이어서 조회
+    Returns:
+        (최신순 트랜잭션 리스트, 통계 dict)
+    """
+    cache = cache or get_cache()
+    if max_txs is None:
+        max_txs = MEMPOOL_MAX_TXS
+    stats = {"pages": 0, "bytes": 0, "txs": 0, "complete": False, "error": None, "cache": "miss"}
+
+    def assemble(head, complete):
+        stable = cache.stable_txs(address, limit=max(max_txs - len(head), 0) if max_txs else None)
+        txs = (head + stable)[:max_txs] if max_txs else head + stable
+        stats.update({"txs": len(txs), "complete": complete})
+        return txs, stats
+
+    entry = cache.get_entry(address)
+    if entry:
+        enough = entry["complete"] or (max_txs and len(entry["head"]) + entry["stable_count"] >= max_txs)
+        if enough and time.time() - entry["fetched_at"] < cache.unconfirmed_ttl:
+            cache.record("hits")
+            stats["cache"] = "hit"
+            return assemble(entry["head"], entry["complete"])
+
+    tip = fetch_tip_height()
+    if tip is None and entry:
+        # 네트워크 장애 시 오래된 캐시라도 반환
+        cache.record("hits")
+        stats["cache"] = "stale"
+        return assemble(entry["head"], entry["complete"])
+
+    if entry and tip == entry["tip_height"] and enough:
+        mempool_txs = fetch_mempool_txs(address)
+        if mempool_txs is not None:
+            cache.record("partial_hits")
+            stats["cache"] = "partial"
+            head = mempool_txs + [tx for tx in entry["head"] if tx.get("status", {}).get("confirmed")]
+            cache.put(address, head, tip, entry["complete"])
+            return assemble(head, entry["complete"])
+
+    # 최신 페이지부터 이미 캐시된 불변 구간과 겹칠 때까지 조회
+    known = cache.stable_txids(address) if entry else set()
+    fresh, overlapped = [], False
+    walk = {}
+    for page in iter_mempool_pages(address, max_txs=0, stats=walk):
+        for tx in page:
+            if tx.get("txid") in known:
+                overlapped = True
+                break
+            fresh.append(tx)
+        if overlapped or (max_txs and len(fresh) >= max_txs):
+            break
+    stats["pages"] += walk["pages"]
+    stats["bytes"] += walk["bytes"]
+
+    if walk["error"] and not fresh and not overlapped:
+        stats["error"] = walk["error"]
+        if entry:
+            stats["cache"] = "stale"
+            return assemble(entry["head"], entry["complete"])
+        cache.record("misses")
+        return [], stats
+
+    if known and not overlapped:
+        # 새 tx 가 예산보다 많아 기존 구간과 이어지지 않음 → 처음부터 다시 쌓음
+        cache.reset(address)
+        known = set()
+    complete = entry["complete"] if overlapped else walk["complete"]
+
+    head = [tx for tx in fresh if not is_stable(tx, tip)]
+    newer = [tx for tx in fresh if is_stable(tx, tip)]
+    cache.put(address, head, tip, complete, newer=newer)
+
+    total = len(head) + len(known) + len(newer)
+    if not complete and (not max_txs or total < max_txs):
+        oldest = cache.oldest_stable_txid(address)
+        if oldest:
+            older_stats = {}
+            older = []
+            for page in iter_mempool_pages(address, max_txs=(max_txs - total) if max_txs else 0,
+                                           stats=older_stats, after_txid=oldest):
+                older.extend(page)
+            stats["pages"] += older_stats["pages"]
+            stats["bytes"] += older_stats["bytes"]
+            complete = older_stats["complete"]
+            cache.put(address, head, tip, complete, older=[tx for tx in older if is_stable(tx, tip)])
+
+    cache.record("partial_hits" if entry and known else "misses")
+    stats["cache"] = "partial" if entry and known else "miss"
+    txs, stats = assemble(head, complete)
+    log(f"✅ {address}: {stats['txs']} txs (cache {stats['cache']}), "
+        f"{stats['pages']} pages, {stats['bytes']:,} bytes")
+    return txs, stats
+
 
 # ✅ mempool.space API (프리미엄)
-def fetch_from_mempool(address):
-    url = f"{MEMPOOL_BASE}/address/{address}/txs"
-    response = requests.get(url)
-    return response.json() if response.status_code == 200 else {"error": f"Status {response.status_code}"}
+def fetch_from_mempool(address, max_txs=None):
+    txs, stats = fetch_all_from_mempool(address, max_txs=max_txs)
+    if stats["error"] and not txs:
+        return {"error": stats["error"]}
+    return txs
 
 # ✅ 외부에서 호출하는 통합 함수
-def get_transaction_data(address, mode="premium"):
-    return fetch_from_mempool(address)
+def get_transaction_data(address, mode="premium", max_txs=None, use_cache=None):
+    if use_cache is None:
+        use_cache = TX_CACHE_ENABLED and get_backend().cacheable
+    if not use_cache:
+        return fetch_from_mempool(address, max_txs=max_txs)
+    txs, stats = fetch_with_cache(address, max_txs=max_txs)
+    if stats["error"] and not txs:
+        return {"error": stats["error"]}
+    return txs
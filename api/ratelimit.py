@@ -0,0 +1,167 @@
+import os
+import struct
+import tempfile
+import threading
+import time
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 공유 없이 프로세스 내부에서만 제한
+    fcntl = None
+
+load_dotenv()
+
+# 호스트별 토큰 버킷 요청 속도 제한기
+# 버킷 상태(토큰 수, 갱신 시각)를 호스트마다 작은 파일에 두고 flock 으로 보호하므로
+# 같은 머신의 Streamlit 앱, 배치 스크립트, 워커 프로세스가 하나의 quota 를 나눠 씀
+# 토큰이 부족하면 음수로 '예약'하고 그만큼만 기다림 → 락을 잡은 채로 자지 않음
+RATE_LIMIT_DIR = os.getenv("RATE_LIMIT_DIR", os.path.join(tempfile.gettempdir(), "btc-anomaly-lens-ratelimit"))
+RATE_LIMIT_DEFAULT_RPS = float(os.getenv("RATE_LIMIT_DEFAULT_RPS", "5"))
+
+# 호스트 → (초당 요청 수, 버스트 크기)
+RATE_LIMITS = {
+    "mempool.space": (8.0, 16.0),
+    "api.blockchair.com": (0.5, 2.0),
+    "www.walletexplorer.com": (1.0, 2.0),
+}
+
+_STATE = struct.Struct("dd")  # tokens, updated_at
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def log(msg):
+    print(f"[RATE] {msg}")
+
+
+def _parse_env_limits(value):
+    """RATE_LIMITS="mempool.space=10:20,api.blockchair.com=0.5:1" 형식 파싱"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        try:
+            host, spec = item.split("=", 1)
+            rate, _, burst = spec.partition(":")
+            limits[host.strip()] = (float(rate), float(burst or rate))
+        except ValueError:
+            log(f"⚠️ 잘못된 RATE_LIMITS 항목 무시: {item}")
+    return limits
+
+
+RATE_LIMITS.update(_parse_env_limits(os.getenv("RATE_LIMITS", "")))
+
+
+class TokenBucket:
+    """파일에 상태를 두는 프로세스 간 공유 토큰 버킷"""
+
+    def __init__(self, host, rate, burst, state_dir=None):
+        self.host = host
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.stats = {"acquired": 0, "waited": 0.0, "last_wait": 0.0}
+        self._lock = threading.Lock()
+        self._fd = None
+        self._local = (self.burst, time.time())
+
+        if fcntl is not None:
+            state_dir = state_dir or RATE_LIMIT_DIR
+            os.makedirs(state_dir, exist_ok=True)
+            path = os.path.join(state_dir, host.replace(":", "_") + ".bucket")
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _read(self):
+        if self._fd is None:
+            return self._local
+        data = os.pread(self._fd, _STATE.size, 0)
+        if len(data) < _STATE.size:
+            return self.burst, time.time()
+        return _STATE.unpack(data)
+
+    def _write(self, tokens, updated_at):
+        if self._fd is None:
+            self._local = (tokens, updated_at)
+        else:
+            os.pwrite(self._fd, _STATE.pack(tokens, updated_at), 0)
+
+    def _update(self, take=0.0, floor=None):
+        """락 안에서 토큰을 채우고 take 만큼 꺼낸 뒤 남은 토큰 수 반환"""
+        with self._lock:
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                tokens, updated_at = self._read()
+                now = time.time()
+                tokens = min(self.burst, tokens + max(0.0, now - updated_at) * self.rate)
+                tokens -= take
+                if floor is not None:
+                    tokens = min(tokens, floor)
+                self._write(tokens, now)
+                return tokens
+            finally:
+                if self._fd is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def acquire(self):
+        """토큰 하나를 예약하고 필요한 만큼 대기. 기다린 시간(초) 반환"""
+        tokens = self._update(take=1.0)
+        wait = max(0.0, -tokens / self.rate)
+        if wait > 0:
+            time.sleep(wait)
+        self.stats["acquired"] += 1
+        self.stats["waited"] += wait
+        self.stats["last_wait"] = wait
+        return wait
+
+    def penalize(self, seconds):
+        """서버가 429/Retry-After 로 거절하면 모든 프로세스가 그만큼 쉬도록 버킷을 비움"""
+        self._update(floor=-seconds * self.rate)
+
+    def current_wait(self):
+        """지금 요청하면 기다려야 할 시간(초)"""
+        tokens = self._update()
+        return max(0.0, (1.0 - tokens) / self.rate)
+
+
+def _limit_for(host):
+    for suffix, limit in RATE_LIMITS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return limit
+    return RATE_LIMIT_DEFAULT_RPS, max(1.0, RATE_LIMIT_DEFAULT_RPS)
+
+
+def get_bucket(host):
+    bucket = _buckets.get(host)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(host)
+            if bucket is None:
+                rate, burst = _limit_for(host)
+                bucket = _buckets[host] = TokenBucket(host, rate, burst)
+    return bucket
+
+
+def acquire(host):
+    """host 로 요청을 보내기 전에 호출. 제한이 꺼져 있으면(rate<=0) 바로 반환"""
+    if _limit_for(host)[0] <= 0:
+        return 0.0
+    return get_bucket(host).acquire()
+
+
+def penalize(host, seconds):
+    if seconds and _limit_for(host)[0] > 0:
+        get_bucket(host).penalize(seconds)
+
+
+def metrics(hosts=()):
+    """
+    호스트별 현재 대기 시간과 누적 대기 통계 (누적 통계는 이 프로세스 것)
+    hosts 에 준 호스트는 이 프로세스에서 아직 요청하지 않았어도 공유 버킷 파일을 열어 다른 프로세스가 만든 대기를 보여 줌
+    """
+    for host in hosts:
+        if _limit_for(host)[0] > 0:
+            get_bucket(host)
+    return {
+        host: dict(bucket.stats, current_wait=bucket.current_wait(), rate=bucket.rate, burst=bucket.burst)
+        for host, bucket in list(_buckets.items())
+    }
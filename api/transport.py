@@ -0,0 +1,139 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from api import ratelimit
+
+load_dotenv()
+
+# 모든 외부 HTTP 호출이 공유하는 전송 계층
+# - keep-alive 커넥션 풀 (호스트마다 TCP+TLS 핸드셰이크 1회)
+# - 호스트별 동시 요청 수 제한 + 프로세스 간 공유 토큰 버킷 (api.ratelimit)
+# - 429/5xx, 연결 오류 시 지수 백오프 + jitter 재시도
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "4"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "30"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+HTTP_HOST_CONCURRENCY = int(os.getenv("HTTP_HOST_CONCURRENCY", "8"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 호스트별 동시 요청 수 (기본값보다 엄격하게 제한할 곳만)
+HOST_CONCURRENCY = {
+    "api.blockchair.com": 2,
+    "www.walletexplorer.com": 2,
+}
+
+DEFAULT_HEADERS = {
+    "User-Agent": "btc-anomaly-lens/1.0",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+_session = None
+_session_lock = threading.Lock()
+_host_slots = {}
+
+stats = {"requests": 0, "retries": 0, "failures": 0}
+
+
+def log(msg):
+    print(f"[HTTP] {msg}")
+
+
+def get_session():
+    """프로세스 전역 requests.Session (커넥션 풀 공유)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # 재시도는 request()에서 직접 처리 (백오프/jitter/Retry-After 제어)
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE,
+                                      pool_maxsize=HTTP_POOL_SIZE,
+                                      max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+
+def _host_slot(host):
+    slot = _host_slots.get(host)
+    if slot is None:
+        with _session_lock:
+            slot = _host_slots.setdefault(
+                host, threading.BoundedSemaphore(HOST_CONCURRENCY.get(host, HTTP_HOST_CONCURRENCY)))
+    return slot
+
+
+def backoff_delay(attempt, retry_after=None):
+    """full jitter 지수 백오프. Retry-After 가 있으면 그보다 짧게 기다리지 않음"""
+    delay = random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, HTTP_BACKOFF_MAX))
+    return delay
+
+
+def _retry_after_seconds(response):
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def request(method, url, retries=None, timeout=None, **kwargs):
+    """
+    공유 세션으로 HTTP 요청을 보냅니다.
+    재시도 후에도 429/5xx 이면 마지막 응답을 그대로 반환하고,
+    연결 오류가 계속되면 마지막 예외를 다시 발생시킵니다.
+    """
+    if retries is None:
+        retries = HTTP_MAX_RETRIES
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+    session = get_session()
+    host = urlsplit(url).netloc
+    slot = _host_slot(host)
+
+    for attempt in range(retries + 1):
+        response = None
+        try:
+            ratelimit.acquire(host)
+            with slot:
+                stats["requests"] += 1
+                response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= retries:
+                stats["failures"] += 1
+                raise
+            delay = backoff_delay(attempt)
+            log(f"⚠️ {e.__class__.__name__} on {url} → retry in {delay:.2f}s")
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                if response.status_code in RETRY_STATUSES:
+                    stats["failures"] += 1
+                return response
+            retry_after = _retry_after_seconds(response)
+            if response.status_code == 429:
+                ratelimit.penalize(host, retry_after)
+            delay = backoff_delay(attempt, retry_after)
+            log(f"⚠️ Status {response.status_code} on {url} → retry in {delay:.2f}s")
+            response.close()
+
+        stats["retries"] += 1
+        time.sleep(delay)
+
+
+def http_get(url, **kwargs):
+    return request("GET", url, **kwargs)
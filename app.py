@@ -3,23 +3,22 @@ import pandas as pd
 import plotly.express as px
 from ui.layout import show_layout
 from ui.language import get_text
-from logic.detection import (
-    interval_anomaly_score,
-    amount_anomaly_score,
-    repeated_address_score,
-    time_gap_anomaly_score,
-    blacklist_score,
-    mixer_detection_score,
-    cross_chain_detection_score,
-    money_laundering_risk_score,
-    exchange_detection_score
-)
-from logic.graph import generate_transaction_network, get_network_stats
+from ui.events import streamlit_sink
+from ui.network import network_figure
+from logic.detection import exchange_detection_score
+from logic.events import listening
+from logic.graph import build_network_view, get_network_stats
 from api.fetch import get_transaction_data
-from api.parser import parse_mempool_transactions
-from logic.preprocess import preprocess
+from api import ratelimit
+from api.backends import get_backend
+from api.address_ids import address_scope
+from api.parser import parse_mempool_columns
+from logic.txframe import TxFrame
+from logic.txgraph import TxGraph
+from logic.frontier import FrontierExpansion
+from logic.scoring import score_transactions
 from logic.report_generator import generate_pdf_report
-from logic.scenario_matcher import load_scenarios, match_scenarios
+from logic.scenario_matcher import load_scenarios, match_scenarios, compute_tx_stats
 import base64
 import streamlit as st
 import os
@@ -78,9 +77,69 @@ with st.expander("🧠 About This Tool"):
     </div>
     """, unsafe_allow_html=True)
 
-def get_dynamic_top_nodes(tx_list, max_hops):
+def show_network(t, tx_graph, tx_list, address, max_hops, top_nodes, live_expansion=False):
+    """네트워크 통계 + 시각화 (live_expansion 이면 hop 마다 이웃 주소를 조회하며 그림을 갱신)"""
+    # 네트워크 통계 표시
+    network_stats = get_network_stats(tx_graph, max_hops)
+    if network_stats:
+        st.markdown(f"#### 📈 {t['network_stats']}")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric(t['total_nodes'], network_stats.get('total_nodes', 0))
+        with col2:
+            st.metric(t['total_edges'], network_stats.get('total_edges', 0))
+        with col3:
+            st.metric(t['unique_recipients'], network_stats.get('unique_recipients', 0))
+        with col4:
+            st.metric(t['total_volume'], f"{network_stats.get('total_volume', 0):.2f} BTC")
+
+    with st.expander(f"🔸 {t['network_visualization_title']}", expanded=True):
+        status = st.empty()
+        chart = st.empty()
+        caption = st.empty()
+
+        def draw(graph, key='network_chart'):
+            # 같은 그래프/설정으로 다시 실행될 때는 만든 배열을 그대로 (서버는 직렬화만)
+            settings = (address, max_hops, top_nodes)
+            cached = st.session_state.get('network_view')
+            if cached and cached[0] is graph and cached[1] == settings:
+                view = cached[2]
+            else:
+                view = build_network_view(graph, max_hops=max_hops, top_n=top_nodes, source_address=address)
+                st.session_state['network_view'] = (graph, settings, view)
+            if view:
+                chart.plotly_chart(network_figure(view), use_container_width=True, key=key)
+                caption.caption(t['network_visualization_help'].format(max_hops=max_hops, top_nodes=top_nodes))
+            return view
+
+        if not live_expansion:
+            # 네트워크 시각화 생성 및 표시
+            with st.spinner(f"네트워크 시각화 생성 중... (Hop: {max_hops}, 노드: {top_nodes})"):
+                if not draw(tx_graph):
+                    st.warning(t['network_visualization_error'])
+            return
+
+        # 같은 주소/hop 으로 다시 그릴 때는 이미 확장한 레코드를 재사용 (재실행마다 다시 조회하지 않도록)
+        cache_key = (address, max_hops)
+        expanded = st.session_state.setdefault('live_expansion', {})
+        if cache_key in expanded:
+            draw(expanded[cache_key])
+            return
+        for result in FrontierExpansion(address, max_hops, tx_list=tx_list).run():
+            status.caption(t['live_expansion_status'].format(hop=result.hop, addresses=len(result.hop_of),
+                                                             records=len(result.records)))
+            graph = result.graph()
+            # hop 마다 같은 자리를 새 차트로 교체 (내용이 같아도 요소 id 가 겹치지 않게)
+            draw(graph, key=f'network_chart_{result.hop}')
+            # 끝까지 확장한 결과만 캐시 — 중간에 재실행되면 다음 실행에서 다시 확장
+            # (이미 조회한 주소는 엣지 저장소에서 바로 나옴)
+            if result.exhausted or result.hop >= max_hops:
+                expanded[cache_key] = graph
+
+
+def get_dynamic_top_nodes(tx_graph, max_hops):
     from logic.graph import get_max_available_nodes
-    max_available_nodes = get_max_available_nodes(tx_list, max_hops)
+    max_available_nodes = get_max_available_nodes(tx_graph, max_hops)
     current_top_nodes = st.session_state.get('top_nodes_slider', 15)
     if current_top_nodes > max_available_nodes:
         current_top_nodes = max_available_nodes
@@ -128,6 +187,13 @@ def main():
 
     st.sidebar.markdown(t["premium_on"] if premium_mode else t["premium_off"])
 
+    # API 요청 속도 제한 상태 (다른 프로세스와 공유되는 토큰 버킷, 지금 쓰는 백엔드의 호스트)
+    backend_host = get_backend().host
+    backend_rate = ratelimit.metrics(hosts=(backend_host,)).get(backend_host) if backend_host else None
+    if backend_rate:
+        st.sidebar.caption(f"⏱ {backend_host} rate-limit wait: {backend_rate['current_wait']:.2f}s "
+                           f"(total {backend_rate['waited']:.1f}s)")
+
     st.sidebar.markdown("""
     <span style='font-size:13px; color:gray'>
     🔍 Developed for real-world blockchain forensic simulation.
@@ -298,38 +364,36 @@ def main():
             
             # 트랜잭션 데이터 가져오기
             raw_data = get_transaction_data(address, mode="premium")
-            tx_list = parse_mempool_transactions(raw_data)
+            # 분석마다 새 주소 사전 — 세션이 결과를 놓으면 이 분석의 주소들도 같이 해제
+            with address_scope():
+                columns = parse_mempool_columns(raw_data)
+            # 파서 컬럼에서 바로 시간순 TxFrame (레코드 dict 는 필요한 소비자가 읽을 때만 만듦)
+            frame = TxFrame.from_columns(columns)
 
-            if not tx_list:
+            if not len(frame):
                 st.warning("트랜잭션 데이터를 찾을 수 없습니다. (주소는 유효하지만 거래 내역이 없을 수 있습니다)")
                 return
 
-            tx_list = preprocess(tx_list)
             st.success(f"✅ Real blockchain data successfully retrieved via mempool.space")
 
-            interval_score, short_intervals = interval_anomaly_score(tx_list)
-            amount_score, outliers = amount_anomaly_score(tx_list)
-            address_score, flagged_addresses = repeated_address_score(tx_list)
-            time_score, abnormal_gaps = time_gap_anomaly_score(tx_list)
-            blacklist_flag, blacklist_score_val = blacklist_score(tx_list)
-            mixer_score_val, mixer_indicators = mixer_detection_score(tx_list)
-            cross_chain_score_val, cross_chain_indicators = cross_chain_detection_score(tx_list)
-            money_laundering_score_val, laundering_indicators = money_laundering_risk_score(tx_list)
-            total_score = interval_score + amount_score + address_score + time_score + blacklist_score_val + mixer_score_val + cross_chain_score_val + money_laundering_score_val
+            # 모든 탐지를 TxFrame 한 번 위에서 계산 (공유 결과는 한 번만)
+            scores = score_transactions(frame)
+            # 네트워크 BFS/통계/노드 상한이 공유하는 CSR 그래프 (분석당 한 번)
+            tx_graph = TxGraph(frame)
+            total_score = scores['total_score']
+            interval_score, short_intervals = scores['interval_score'], scores['short_intervals']
+            amount_score, outliers = scores['amount_score'], scores['outliers']
+            address_score, flagged_addresses = scores['address_score'], scores['flagged_addresses']
+            time_score, abnormal_gaps = scores['time_score'], scores['abnormal_gaps']
+            blacklist_flag, blacklist_score_val = scores['blacklist_flag'], scores['blacklist_score_val']
+            mixer_score_val, mixer_indicators = scores['mixer_score_val'], scores['mixer_indicators']
+            cross_chain_score_val, cross_chain_indicators = scores['cross_chain_score_val'], scores['cross_chain_indicators']
+            money_laundering_score_val, laundering_indicators = scores['money_laundering_score_val'], scores['laundering_indicators']
 
             # 거래소 탐지 + 패턴 분석 (새로운 종합 식별 시스템으로 대체)
-            exchange_hits, exchange_details, pattern_analysis = exchange_detection_score(tx_list, address)
-
-            scores_dict = {
-                "Short Interval Score": interval_score,
-                "Amount Outlier Score": amount_score,
-                "Repeated Address Score": address_score,
-                "Time Gap Score": time_score,
-                "Blacklist Score": blacklist_score_val,
-                "Mixer Score": mixer_score_val,
-                "Cross-chain Score": cross_chain_score_val,
-                "Money Laundering Risk Score": money_laundering_score_val
-            }
+            exchange_hits, exchange_details, pattern_analysis = exchange_detection_score(frame, address)
+
+            scores_dict = scores['scores_dict']
 
             # 분석 결과를 세션에 저장
             st.session_state.analysis_results = {
@@ -352,7 +416,8 @@ def main():
                 'money_laundering_score_val': money_laundering_score_val,
                 'laundering_indicators': laundering_indicators,
                 'pattern_analysis': pattern_analysis,
-                'tx_list': tx_list,
+                'tx_list': frame,
+                'tx_graph': tx_graph,
                 'scores_dict': scores_dict
             }
 
@@ -371,12 +436,9 @@ def main():
 
             if premium_mode:
                 scenario_db = load_scenarios()
-                tx_stats = {
-                    "tx_count": len(tx_list),
-                    "avg_interval": sum(short_intervals)/len(short_intervals) if short_intervals else 9999,
-                    "reused_address_ratio": len(flagged_addresses) / len(tx_list) if tx_list else 0,
-                    "high_fee_flag": any(tx.get("fee", 0) > 500 for tx in tx_list)
-                }
+                tx_stats = compute_tx_stats(frame, short_intervals, flagged_addresses)
+                # 임계값을 바꿨을 때 다시 매칭할 수 있도록 세션에도 저장
+                st.session_state.analysis_results['tx_stats'] = tx_stats
                 # 시나리오 매칭 임계값 로그 추가
                 print(f"🔍 Scenario matching threshold: {final_min_similarity}%")
                 scenario_matches = match_scenarios(tx_stats, scenario_db, min_similarity=final_min_similarity)
@@ -438,7 +500,7 @@ def main():
                 
                 with col2:
                     st.markdown("**📊 노드 수 설정**")
-                    max_available_nodes, current_top_nodes = get_dynamic_top_nodes(tx_list, max_hops)
+                    max_available_nodes, current_top_nodes = get_dynamic_top_nodes(tx_graph, max_hops)
                     top_nodes = st.slider(
                         f"{t['max_nodes_setting']}",
                         min_value=5,
@@ -451,30 +513,10 @@ def main():
                 
                 # 현재 설정값 표시
                 st.info(f"🎯 {t['current_settings']}: 최대 {max_hops} hop, 상위 {top_nodes}개 노드")
+                live_expansion = st.checkbox(t['live_expansion'], value=False, help=t['live_expansion_help'],
+                                             key="live_expansion_toggle")
             
-            # 네트워크 통계 표시
-            network_stats = get_network_stats(tx_list, max_hops)
-            if network_stats:
-                st.markdown(f"#### 📈 {t['network_stats']}")
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric(t['total_nodes'], network_stats.get('total_nodes', 0))
-                with col2:
-                    st.metric(t['total_edges'], network_stats.get('total_edges', 0))
-                with col3:
-                    st.metric(t['unique_recipients'], network_stats.get('unique_recipients', 0))
-                with col4:
-                    st.metric(t['total_volume'], f"{network_stats.get('total_volume', 0):.2f} BTC")
-            
-            # 네트워크 시각화 생성 및 표시
-            with st.spinner(f"네트워크 시각화 생성 중... (Hop: {max_hops}, 노드: {top_nodes})"):
-                encoded_img = generate_transaction_network(tx_list, max_hops=max_hops, top_n=top_nodes, source_address=address)
-                if encoded_img:
-                    with st.expander(f"🔸 {t['network_visualization_title']}", expanded=True):
-                        st.image(f"data:image/png;base64,{encoded_img}", use_container_width=True)
-                        st.caption(t['network_visualization_help'].format(max_hops=max_hops, top_nodes=top_nodes))
-                else:
-                    st.warning(t['network_visualization_error'])
+            show_network(t, tx_graph, frame, address, max_hops, top_nodes, live_expansion)
 
             if premium_mode:
                 pdf_io = generate_pdf_report(address, total_score, scores_dict, scenario_matches, similarity_threshold=min_similarity).getvalue()
@@ -505,6 +547,7 @@ def main():
             st.info("아직 분석 결과가 없습니다. 먼저 분석을 실행하세요.")
         else:
             tx_list = results['tx_list']
+            tx_graph = results.get('tx_graph') or TxGraph(tx_list)
             scores_dict = results['scores_dict']
             
             # 시나리오 매칭 임계값이 변경되었는지 확인하고 재계산
@@ -549,7 +592,7 @@ def main():
                 
                 with col2:
                     st.markdown("**📊 노드 수 설정**")
-                    max_available_nodes, current_top_nodes = get_dynamic_top_nodes(tx_list, max_hops)
+                    max_available_nodes, current_top_nodes = get_dynamic_top_nodes(tx_graph, max_hops)
                     top_nodes = st.slider(
                         f"{t['max_nodes_setting']}",
                         min_value=5,
@@ -562,30 +605,10 @@ def main():
                 
                 # 현재 설정값 표시
                 st.info(f"🎯 {t['current_settings']}: 최대 {max_hops} hop, 상위 {top_nodes}개 노드")
+                live_expansion = st.checkbox(t['live_expansion'], value=False, help=t['live_expansion_help'],
+                                             key="live_expansion_toggle")
             
-            # 네트워크 통계 표시
-            network_stats = get_network_stats(tx_list, max_hops)
-            if network_stats:
-                st.markdown(f"#### 📈 {t['network_stats']}")
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric(t['total_nodes'], network_stats.get('total_nodes', 0))
-                with col2:
-                    st.metric(t['total_edges'], network_stats.get('total_edges', 0))
-                with col3:
-                    st.metric(t['unique_recipients'], network_stats.get('unique_recipients', 0))
-                with col4:
-                    st.metric(t['total_volume'], f"{network_stats.get('total_volume', 0):.2f} BTC")
-            
-            # 네트워크 시각화 생성 및 표시
-            with st.spinner(f"네트워크 시각화 생성 중... (Hop: {max_hops}, 노드: {top_nodes})"):
-                encoded_img = generate_transaction_network(tx_list, max_hops=max_hops, top_n=top_nodes, source_address=address)
-                if encoded_img:
-                    with st.expander(f"🔸 {t['network_visualization_title']}", expanded=True):
-                        st.image(f"data:image/png;base64,{encoded_img}", use_container_width=True)
-                        st.caption(t['network_visualization_help'].format(max_hops=max_hops, top_nodes=top_nodes))
-                else:
-                    st.warning(t['network_visualization_error'])
+            show_network(t, tx_graph, tx_list, address, max_hops, top_nodes, live_expansion)
 
     if premium_mode:
         st.markdown("### 📊 Premium Features")
@@ -596,4 +619,6 @@ def main():
         st.caption("Premium features such as PDF export and darknet detection are unavailable in free mode.")
 
 if __name__ == "__main__":
-    main()
+    # logic/ 계층의 알림(logic.events)을 이 세션 화면에 그림
+    with listening(streamlit_sink()):
+        main()
@@ -0,0 +1,219 @@
+import argparse
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from dotenv import load_dotenv
+
+from api.address_ids import address_scope
+from api.blockfile import load_addresses
+from api.fetch import get_transaction_data
+from api.parser import parse_mempool_columns
+from logic.scenario_matcher import compute_tx_stats, load_scenarios, match_scenarios
+from logic.scoring import AnomalyScores
+from logic.txframe import TxFrame
+
+load_dotenv()
+
+# 헤드리스 배치 점수 계산 (Streamlit 없이 주소 목록 전체를 처리)
+# 주소마다 fetch → parse(TxColumns → 시간순 TxFrame) → 모든 탐지 → 시나리오 매칭을 프로세스 풀에서 돌리고,
+# 끝나는 대로 JSONL 한 줄씩 기록하므로 중간에 끊겨도 같은 명령으로 다시 실행하면 이어서 처리함
+# 이 모듈(과 워커)은 streamlit 을 import 하지 않음
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+
+# 결과에 그대로 남길 탐지 상세 (나머지는 점수만)
+DETAIL_FIELDS = ("blacklist_flag", "mixer_indicators", "cross_chain_indicators", "laundering_indicators")
+
+_scenarios = None
+_options = {}
+
+
+def log(msg):
+    print(f"[BATCH] {msg}")
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (np.ndarray, set, tuple)):
+        return list(value.tolist() if isinstance(value, np.ndarray) else value)
+    return str(value)
+
+
+def _init_worker(scenario_path, min_similarity, max_txs):
+    """워커 프로세스마다 한 번: 시나리오 DB 로드"""
+    global _scenarios
+    _scenarios = load_scenarios(scenario_path)
+    _options.update(min_similarity=min_similarity, max_txs=max_txs)
+
+
+def score_address(address):
+    """주소 하나의 결과 레코드 (JSON 으로 바로 쓸 수 있는 dict, 실패해도 예외 대신 status=error)"""
+    start = time.perf_counter()
+    record = {"address": address, "status": "ok", "error": None, "tx_count": 0}
+    try:
+        raw = get_transaction_data(address, mode="premium", max_txs=_options.get("max_txs"))
+        if isinstance(raw, dict) and raw.get("error"):
+            record.update(status="error", error=str(raw["error"]))
+            return record
+        # 주소마다 새 주소 사전 (워커 프로세스가 처리한 모든 주소를 계속 들고 있지 않도록)
+        with address_scope():
+            frame = TxFrame.from_columns(parse_mempool_columns(raw))
+        record["tx_count"] = len(frame)
+        if not len(frame):
+            record["status"] = "empty"
+            return record
+
+        # 프로세스 풀이 이미 병렬이므로 탐지는 워커 안에서 순서대로
+        scores = AnomalyScores(frame, workers=0).results()
+        tx_stats = compute_tx_stats(frame, scores["short_intervals"], scores["flagged_addresses"])
+        matches = match_scenarios(tx_stats, _scenarios or [], min_similarity=_options.get("min_similarity", 50))
+        record.update(
+            total_score=scores["total_score"],
+            scores=scores["scores_dict"],
+            tx_stats=tx_stats,
+            scenarios=[{"id": m["id"], "actor": m["actor"], "similarity": m["similarity"]} for m in matches],
+            detector_timings=scores["detector_timings"],
+        )
+        record.update((field, scores[field]) for field in DETAIL_FIELDS)
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        record["elapsed"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def read_checkpoint(path):
+    """체크포인트 JSONL 의 주소별 마지막 레코드 (깨진 마지막 줄은 무시)"""
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["address"]] = record
+    return records
+
+
+def checkpoint_path(out_path):
+    """JSONL 출력은 그 파일 자체가 체크포인트, Parquet 출력은 옆에 .jsonl 체크포인트를 둠"""
+    return out_path if out_path.endswith(".jsonl") else out_path + ".checkpoint.jsonl"
+
+
+def _rewrite(path, records):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, default=_json_default) + "\n")
+    os.replace(tmp, path)
+
+
+def parquet_engine():
+    """pandas.to_parquet 이 쓸 엔진 이름 (pyarrow 우선) — 둘 다 없으면 None"""
+    for engine in ("pyarrow", "fastparquet"):
+        try:
+            importlib.import_module(engine)
+        except ImportError:
+            continue
+        return engine
+    return None
+
+
+def write_parquet(records, out_path):
+    """주소당 한 행 — 점수는 컬럼으로 펼치고, 리스트/dict 상세는 JSON 문자열로"""
+    import pandas as pd
+
+    rows = []
+    for record in records:
+        row = {key: value for key, value in record.items() if key not in ("scores", "tx_stats")}
+        row.update((f"score.{label}", value) for label, value in (record.get("scores") or {}).items())
+        row.update((f"stats.{key}", value) for key, value in (record.get("tx_stats") or {}).items())
+        for key, value in row.items():
+            if isinstance(value, (list, dict)):
+                row[key] = json.dumps(value, ensure_ascii=False, default=_json_default)
+        rows.append(row)
+    pd.DataFrame(rows).to_parquet(out_path, index=False, engine=parquet_engine() or "auto")
+
+
+def run_batch(addresses, out_path, workers=BATCH_WORKERS, resume=True, scenario_path=None,
+              min_similarity=50, max_txs=None):
+    """
+    addresses 를 모두 점수 매겨 out_path(.jsonl / .parquet)에 기록하고 {status: 개수} 반환
+    resume=True 면 체크포인트에 status=ok/empty 로 남은 주소는 건너뜀 (error 는 다시 시도)
+    workers=0 이면 프로세스 풀 없이 현재 프로세스에서 순서대로
+    """
+    scenario_path = scenario_path or "data/100_scenario_db_from_blacklist.json"
+    if out_path.endswith(".parquet") and parquet_engine() is None:
+        # 배치를 다 돌린 뒤에 쓰기에서 실패하지 않도록 시작 전에 확인
+        raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)")
+    checkpoint = checkpoint_path(out_path)
+    done = read_checkpoint(checkpoint) if resume else {}
+    if not resume and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    done_before = set(done)
+    # 입력 순서 유지, 중복 제거
+    addresses = list(dict.fromkeys(addresses))
+    pending = [a for a in addresses if done.get(a, {}).get("status") not in ("ok", "empty")]
+    log(f"🔍 {len(pending)} addresses to score ({len(addresses) - len(pending)} already done), "
+        f"{workers} workers → {out_path}")
+
+    start = time.perf_counter()
+    counts = {}
+    with open(checkpoint, "a", encoding="utf-8") as f:
+        def write(record):
+            f.write(json.dumps(record, ensure_ascii=False, default=_json_default) + "\n")
+            f.flush()
+            done[record["address"]] = record
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+            finished = sum(counts.values())
+            if finished % 100 == 0 or finished == len(pending):
+                log(f"⏳ {finished}/{len(pending)} ({time.perf_counter() - start:.1f}s)")
+
+        if workers > 0 and pending:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(scenario_path, min_similarity, max_txs)) as pool:
+                futures = [pool.submit(score_address, address) for address in pending]
+                for future in as_completed(futures):
+                    write(future.result())
+        else:
+            _init_worker(scenario_path, min_similarity, max_txs)
+            for address in pending:
+                write(score_address(address))
+
+    # 다시 시도한 error 주소는 줄이 두 번 남으므로 주소별 마지막 레코드만 남기도록 정리
+    if any(a in done_before for a in pending):
+        _rewrite(checkpoint, list(done.values()))
+    if out_path.endswith(".parquet"):
+        ordered = [done[a] for a in addresses if a in done]
+        write_parquet(ordered, out_path)
+    log(f"✅ {counts} in {time.perf_counter() - start:.1f}s")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score address lists without the Streamlit UI")
+    parser.add_argument("addresses", help="CSV (address / hacker_address column) or text file of addresses")
+    parser.add_argument("--out", required=True, help="results file (.jsonl or .parquet)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="process pool size (0 = inline)")
+    parser.add_argument("--no-resume", action="store_true", help="ignore an existing checkpoint and start over")
+    parser.add_argument("--scenarios", default=None, help="scenario DB JSON")
+    parser.add_argument("--min-similarity", type=int, default=50)
+    parser.add_argument("--max-txs", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if not args.out.endswith((".jsonl", ".parquet")):
+        parser.error("--out must end with .jsonl or .parquet")
+    if args.out.endswith(".parquet") and parquet_engine() is None:
+        parser.error("--out .parquet needs pyarrow (pip install pyarrow) — or use .jsonl")
+    run_batch(load_addresses(args.addresses), args.out, workers=args.workers, resume=not args.no_resume,
+              scenario_path=args.scenarios, min_similarity=args.min_similarity, max_txs=args.max_txs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import argparse
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+# 대용량 라벨 목록(제재/어뷰즈 피드 수천만 주소)용 디스크 필터
+# 파이썬 set 에 문자열로 올리면 GB 단위 메모리를 쓰므로, 파일 하나를 mmap 으로 열어
+#   1) Bloom 필터 비트 배열 — 대부분인 "목록에 없음" 을 디스크 접근 없이 걸러냄
+#   2) 정렬된 고정폭 주소 배열 + 라벨 번호 — Bloom 통과분만 이진 탐색으로 정확히 확인 (오탐 없음)
+# 으로 조회함. 페이지 캐시를 공유하므로 워커 프로세스가 여러 개여도 메모리에는 한 벌만 올라감
+#   빌드:  python -m logic.bloom build --category blacklist --out data/filters/blacklist.lbf feed.txt ...
+FILTER_MAGIC = b"BTCLBF01"
+DEFAULT_FP_RATE = 0.001
+# 빌드할 때 한 번에 해시하는 주소 수
+BUILD_CHUNK = 1_000_000
+
+
+def log(msg):
+    print(f"[BLOOM] {msg}")
+
+
+def _hash_pairs(addresses):
+    """주소별 (h1, h2) uint64 쌍 — 이중 해싱으로 k 개 비트 위치를 만듦"""
+    digests = b"".join(hashlib.blake2b(a.encode("utf-8"), digest_size=16).digest() for a in addresses)
+    pairs = np.frombuffer(digests, dtype="<u8").reshape(-1, 2)
+    # h2 가 짝수면 m 이 2 의 배수일 때 위치가 겹치므로 홀수로 만듦
+    return pairs[:, 0], pairs[:, 1] | np.uint64(1)
+
+
+def _bit_positions(addresses, m_bits, k):
+    h1, h2 = _hash_pairs(addresses)
+    steps = np.arange(k, dtype=np.uint64)
+    # uint64 곱/합은 2^64 로 감김 — 해시 값이라 상관없음
+    with np.errstate(over="ignore"):
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(m_bits)
+
+
+def filter_params(n, fp_rate=DEFAULT_FP_RATE):
+    """n 개 원소, 오탐률 fp_rate 에 맞는 (비트 수 m, 해시 수 k). m 은 64 의 배수"""
+    n = max(n, 1)
+    m_bits = int(math.ceil(-n * math.log(fp_rate) / (math.log(2) ** 2)))
+    m_bits = max(64, (m_bits + 63) // 64 * 64)
+    k = max(1, int(round(m_bits / n * math.log(2))))
+    return m_bits, k
+
+
+def build_filter(entries, out_path, fp_rate=DEFAULT_FP_RATE, category=""):
+    """
+    {주소: 라벨} (또는 (주소, 라벨) 이터러블) 로 필터 파일을 만듭니다
+    파일 구성: magic | 헤더 길이(u32) | JSON 헤더 | Bloom 비트 | 주소(S{width}, 정렬) | 라벨 번호(u32)
+    임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완성된 파일만 봄
+    """
+    items = dict(entries.items() if isinstance(entries, Mapping) else entries)
+    addresses = sorted(items)
+    n = len(addresses)
+    m_bits, k = filter_params(n, fp_rate)
+    width = max((len(a.encode("utf-8")) for a in addresses), default=1)
+
+    label_names = sorted(set(items.values()))
+    label_id = {label: i for i, label in enumerate(label_names)}
+
+    bits = np.zeros(m_bits // 8, dtype=np.uint8)
+    for start in range(0, n, BUILD_CHUNK):
+        positions = _bit_positions(addresses[start:start + BUILD_CHUNK], m_bits, k).ravel()
+        np.bitwise_or.at(bits, (positions >> np.uint64(3)).astype(np.int64),
+                         (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+
+    header = json.dumps({
+        "category": category,
+        "n": n,
+        "m_bits": m_bits,
+        "k": k,
+        "width": width,
+        "labels": label_names,
+    }).encode("utf-8")
+    # 헤더 뒤 배열들이 8 바이트 정렬되도록 패딩
+    prefix = len(FILTER_MAGIC) + 4 + len(header)
+    header += b" " * (-prefix % 8)
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp_path = f"{out_path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(FILTER_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(bits.tobytes())
+        for start in range(0, n, BUILD_CHUNK):
+            chunk = addresses[start:start + BUILD_CHUNK]
+            f.write(np.array([a.encode("utf-8") for a in chunk], dtype=f"S{width}").tobytes())
+        f.write(np.array([label_id[items[a]] for a in addresses], dtype="<u4").tobytes())
+    os.replace(tmp_path, out_path)
+    log(f"💾 {out_path}: {n} addresses, {m_bits // 8} filter bytes, k={k}, width={width}")
+    return out_path
+
+
+class LabelFilter(Mapping):
+    """
+    build_filter 로 만든 파일을 읽기 전용 mmap 으로 여는 {주소: 라벨} 매핑
+    `in`, [], get 은 Bloom 확인 → 통과 시 정렬 배열 이진 탐색. contains_many 는 여러 주소를 한 번에 확인
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(FILTER_MAGIC)] != FILTER_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"not a label filter file: {path}")
+        header_len = struct.unpack_from("<I", self._mmap, len(FILTER_MAGIC))[0]
+        offset = len(FILTER_MAGIC) + 4
+        header = json.loads(self._mmap[offset:offset + header_len])
+        offset += header_len
+
+        self.category = header["category"]
+        self.n = header["n"]
+        self.m_bits = header["m_bits"]
+        self.k = header["k"]
+        self.width = header["width"]
+        self.label_names = header["labels"]
+
+        self._bits = np.frombuffer(self._mmap, dtype=np.uint8, count=self.m_bits // 8, offset=offset)
+        offset += self.m_bits // 8
+        self._addresses = np.frombuffer(self._mmap, dtype=f"S{self.width}", count=self.n, offset=offset)
+        offset += self.n * self.width
+        self._labels = np.frombuffer(self._mmap, dtype="<u4", count=self.n, offset=offset)
+
+    def _maybe(self, addresses):
+        positions = _bit_positions(addresses, self.m_bits, self.k)
+        probes = self._bits[(positions >> np.uint64(3)).astype(np.int64)]
+        masks = np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)
+        return ((probes & masks) != 0).all(axis=1)
+
+    def _find(self, addresses):
+        """정렬 배열에서의 위치 (없으면 -1)"""
+        keys = np.array([a.encode("utf-8") for a in addresses], dtype=f"S{max(self.width, 1)}")
+        rows = np.searchsorted(self._addresses, keys)
+        rows = np.minimum(rows, max(self.n - 1, 0))
+        found = (self._addresses[rows] == keys) if self.n else np.zeros(len(keys), dtype=bool)
+        # 폭보다 긴 주소는 잘려서 같아 보일 수 있으므로 제외
+        found &= np.array([len(a.encode("utf-8")) <= self.width for a in addresses], dtype=bool)
+        return np.where(found, rows, -1)
+
+    def contains_many(self, addresses):
+        """주소 리스트 → bool 배열"""
+        addresses = list(addresses)
+        result = np.zeros(len(addresses), dtype=bool)
+        if not addresses or not self.n:
+            return result
+        maybe = np.flatnonzero(self._maybe(addresses))
+        if len(maybe):
+            result[maybe] = self._find([addresses[i] for i in maybe]) >= 0
+        return result
+
+    def __contains__(self, address):
+        return isinstance(address, str) and bool(self.contains_many([address])[0])
+
+    def __getitem__(self, address):
+        if not isinstance(address, str) or not self.n or not self._maybe([address])[0]:
+            raise KeyError(address)
+        row = self._find([address])[0]
+        if row < 0:
+            raise KeyError(address)
+        return self.label_names[self._labels[row]]
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        for raw in self._addresses:
+            yield raw.decode("utf-8")
+
+    def close(self):
+        self._bits = self._addresses = self._labels = None
+        self._mmap.close()
+
+
+def main(argv=None):
+    from logic.labels import PARSERS
+
+    parser = argparse.ArgumentParser(description="Build memory-mapped label filters")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="build a filter file from label lists")
+    p_build.add_argument("inputs", nargs="+", help="label list files (data/*.txt format)")
+    p_build.add_argument("--category", required=True, choices=sorted(PARSERS))
+    p_build.add_argument("--out", required=True)
+    p_build.add_argument("--fp-rate", type=float, default=DEFAULT_FP_RATE)
+
+    args = parser.parse_args(argv)
+    parse = PARSERS[args.category]
+    entries = {}
+    for path in args.inputs:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                parsed = parse(line) if line else None
+                if parsed:
+                    entries[parsed[0]] = parsed[1]
+    build_filter(entries, args.out, fp_rate=args.fp_rate, category=args.category)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,209 +1,231 @@
 from datetime import datetime
 from collections import Counter
 import numpy as np
-import pandas as pd  # ✅ 이거 반드시 추가
 import os
-import streamlit as st # 경고 메시지 출력용
+
+from logic.events import emit
+from logic.txframe import as_frame
+from logic.labels import LABEL_FILES, get_label_index
+
+# 탐지 함수는 preprocess 된 tx_list 또는 그것으로 만든 TxFrame 을 받음 (한 번 만든 TxFrame 을 공유하면 재계산 없음)
+
+# 탐지 기준값과 점수 규칙 — 아래 탐지 함수(전체 계산)와 logic.incremental(감시 주소 증분 재채점)이 같이 씀
+# 기준을 바꿀 때는 여기만 고치면 두 경로가 같이 바뀜
+SHORT_INTERVAL_SECONDS = 60       # 짧은 간격 (interval)
+GAP_MIN_SECONDS = 10              # 이상 간격: 이보다 짧거나
+GAP_MAX_SECONDS = 3600            # 이보다 긴 간격 (time gap)
+IQR_FACTOR = 1.5                  # Q3 + 1.5·IQR 초과 = 금액 이상치
+REPEATED_RECEIVER_MIN = 3         # 이만큼 이상 받은 수신 주소
+RAPID_INTERVAL_SECONDS = 30       # 믹서의 빠른 연속 tx 간격
+RAPID_INTERVAL_RATIO = 0.5        # 빠른 간격이 전체 간격에서 이 비율 초과
+LARGE_TX_AMOUNT = 1000000         # 대용량 tx (브릿지)
+BRIDGE_SPLIT_MIN_MAX = 500000     # 최대 금액이 이보다 크고
+BRIDGE_SPLIT_RATIO = 0.1          # 최대 금액의 이 비율 미만인 양수 금액이 2개 이상 = 브릿지 후 분산
+HIGH_VOLUME_TXS = 10              # 세탁 위험도: 행 수가 이보다 많으면
+HIGH_VARIANCE = 1000000           # 세탁 위험도: 금액 분산이 이보다 크면
+
+
+def short_interval_mask(intervals):
+    return intervals < SHORT_INTERVAL_SECONDS
+
+
+def abnormal_gap_mask(intervals):
+    return (intervals < GAP_MIN_SECONDS) | (intervals > GAP_MAX_SECONDS)
+
+
+def outlier_threshold(q1, q3):
+    return q3 + IQR_FACTOR * (q3 - q1)
+
+
+def score_intervals(n_short, short_intervals):
+    return min(25, n_short * 5), short_intervals
+
+
+def score_outliers(outliers):
+    return min(len(outliers) * 5, 25), outliers
+
+
+def score_repeated_receivers(flagged):
+    return min(25, len(flagged) * 5), flagged
+
+
+def score_time_gaps(n_abnormal, abnormal_gaps):
+    return min(15, n_abnormal * 5), abnormal_gaps
+
+
+def score_blacklist(hits):
+    return (True, 100) if hits else (False, 0)  # 블랙리스트 주소가 포함되면 100점
+
+
+def score_mixer(mixer_hits, multi_io_count, coinjoin_count, repeated_amounts, n_intervals, rapid_intervals):
+    """믹서 지표 개수들 → (점수, 지표). mixer_hits 는 매칭된 믹서 라벨 집합"""
+    mixer_indicators = []
+    mixer_score = 0
+    if mixer_hits:
+        mixer_score += min(25, len(mixer_hits) * 10)
+        for mixer_type in mixer_hits:
+            mixer_indicators.append(f"알려진 믹서 주소: {mixer_type}")
+    if multi_io_count > 0:
+        mixer_score += min(20, multi_io_count * 5)
+        mixer_indicators.append(f"다중 I/O 패턴: {multi_io_count}개 트랜잭션")
+    if coinjoin_count > 0:
+        mixer_score += min(25, coinjoin_count * 10)
+        mixer_indicators.append(f"동일 금액 출력 CoinJoin: {coinjoin_count}개 트랜잭션")
+    if repeated_amounts:
+        mixer_score += min(15, repeated_amounts * 3)
+        mixer_indicators.append(f"동일 금액 패턴: {repeated_amounts}개 중복 금액")
+    if n_intervals >= 1 and rapid_intervals > n_intervals * RAPID_INTERVAL_RATIO:
+        mixer_score += 10
+        mixer_indicators.append("빠른 연속 트랜잭션 패턴")
+    return mixer_score, mixer_indicators
+
+
+def score_cross_chain(bridge_hits, large_txs, split_pattern):
+    """브릿지 지표 → (점수, 지표). bridge_hits 는 매칭된 브릿지 라벨 집합"""
+    bridge_indicators = []
+    bridge_score = 0
+    if bridge_hits:
+        bridge_score += min(30, len(bridge_hits) * 10)
+        for bridge_type in bridge_hits:
+            bridge_indicators.append(f"브릿지 주소 감지: {bridge_type}")
+    if large_txs:
+        bridge_score += min(20, large_txs * 5)
+        bridge_indicators.append(f"대용량 트랜잭션: {large_txs}개")
+    if split_pattern:
+        bridge_score += 15
+        bridge_indicators.append("브릿지 후 분산 패턴 감지")
+    return bridge_score, bridge_indicators
+
+
+def score_laundering(mixer_result, bridge_result, n_rows, variance):
+    """믹서/브릿지 (점수, 지표) + 행 수, 금액 분산 → (점수, 지표)"""
+    mixer_score, mixer_indicators = mixer_result
+    bridge_score, bridge_indicators = bridge_result
+    total_risk_score = mixer_score + bridge_score
+    risk_indicators = list(mixer_indicators) + list(bridge_indicators)
+    if n_rows > HIGH_VOLUME_TXS:
+        risk_indicators.append("높은 트랜잭션 볼륨")
+        total_risk_score += 10
+    if variance > HIGH_VARIANCE:
+        risk_indicators.append("불규칙한 금액 분산 패턴")
+        total_risk_score += 15
+    return total_risk_score, risk_indicators
+
 
 # 1. 거래 간격 이상 탐지 (60초 미만)
 def interval_anomaly_score(tx_list):
-    if len(tx_list) < 2:
-        return 0, []
-    try:
-        timestamps = [
-            datetime.fromisoformat(tx['timestamp'])
-            for tx in tx_list
-            if isinstance(tx, dict) and 'timestamp' in tx
-        ]
-    except Exception:
-        return 0, []
-    
-    if len(timestamps) < 2:
+    frame = as_frame(tx_list)
+    if len(frame.intervals) < 1:
         return 0, []
 
-    intervals = [
-        (t2 - t1).total_seconds()
-        for t1, t2 in zip(timestamps[:-1], timestamps[1:])
-    ]
-    short_intervals = [i for i in intervals if i < 60]
-    score = min(25, len(short_intervals) * 5)
-    return score, short_intervals
+    intervals = frame.intervals
+    short_intervals = intervals[short_interval_mask(intervals)].astype(float).tolist()
+    return score_intervals(len(short_intervals), short_intervals)
 
 
 # 2. 이상 금액 탐지 (IQR 이상)
-def amount_anomaly_score(tx_list):
-    values = [tx['amount'] for tx in tx_list if isinstance(tx, dict) and 'amount' in tx]
-    if not values:
+def amount_anomaly_score(tx_list, sketch=None):
+    """
+    sketch(logic.sketch.KLLSketch) 를 넘기면 Q1/Q3 를 스케치에서 구함
+    — 주소 캐시에 저장해 둔 전체 히스토리 스케치로 최근 tx 만 판정할 때 (메모리는 히스토리 길이와 무관)
+    """
+    frame = as_frame(tx_list)
+    values = frame.amounts[frame.has_amount]
+    if not len(values):
         return 0, []
 
-    df = pd.DataFrame(values, columns=['amount'])
-    q1 = df['amount'].quantile(0.25)
-    q3 = df['amount'].quantile(0.75)
-    iqr = q3 - q1
-    threshold = q3 + 1.5 * iqr
-    outliers = df[df['amount'] > threshold]['amount'].tolist()
-
-    score = min(len(outliers) * 5, 25)
-    return score, outliers
+    if sketch is not None and len(sketch):
+        q1, q3 = sketch.quantile([0.25, 0.75])
+    else:
+        q1, q3 = np.quantile(values, [0.25, 0.75])
+    outliers = values[values > outlier_threshold(q1, q3)].tolist()
+    return score_outliers(outliers)
 
 # 3. 동일 수신 주소 반복 탐지
 def repeated_address_score(tx_list):
-    targets = [tx.get('to') for tx in tx_list if isinstance(tx, dict) and tx.get('to')]
-
-    counter = Counter(targets)
-    flagged = [addr for addr, count in counter.items() if count >= 3]
-    score = min(25, len(flagged) * 5)
-    return score, flagged
+    return score_repeated_receivers(as_frame(tx_list).repeated_receivers(REPEATED_RECEIVER_MIN))
 
 # 4. 시계열 상 이상 간격 탐지
 def time_gap_anomaly_score(tx_list):
-    if len(tx_list) < 2:
-        return 0, []
-    try:
-        timestamps = [datetime.fromisoformat(tx['timestamp']) for tx in tx_list]
-    except Exception:
+    frame = as_frame(tx_list)
+    if len(frame) < 2 or not frame.all_valid:
         return 0, []
-    gaps = [
-        (t2 - t1).total_seconds()
-        for t1, t2 in zip(timestamps[:-1], timestamps[1:])
-    ]
-    abnormal = [g for g in gaps if g < 10 or g > 3600]
-    score = min(15, len(abnormal) * 5)
-    return score, abnormal
+    gaps = frame.intervals
+    abnormal = gaps[abnormal_gap_mask(gaps)].astype(float).tolist()
+    return score_time_gaps(len(abnormal), abnormal)
 
 # 5. 블랙리스트 로딩 및 탐지
-def load_blacklist():
-    try:
-        current_dir = os.path.dirname(__file__)
-        blacklist_path = os.path.join(current_dir, "..", "data", "blacklist.txt")
+# 주소 목록은 logic.labels 의 프로세스 전역 인덱스에서 가져옴 (파일이 바뀐 경우에만 다시 읽음)
+# 반환값은 읽기 전용 뷰이므로 호출하는 쪽에서 수정하지 말 것
+LABEL_FILE_ERRORS = {
+    "blacklist": "블랙리스트 파일 오류",
+    "mixer": "믹서 주소 파일 오류",
+    "bridge": "브릿지 주소 파일 오류",
+    "exchange": "거래소 주소 파일 오류",
+}
+
 
-        if not os.path.exists(blacklist_path):
-            st.error(f"❌ blacklist.txt not found at: {blacklist_path}")
-            return set()
+def _check_label_files(category):
+    """없거나 읽지 못한 라벨 파일 경고"""
+    index = get_label_index()
+    missing = index.missing(category)
+    if category == "blacklist":
+        for filename, path in missing:
+            emit("error", f"❌ {filename} not found at: {path}", source="detection")
+    elif category == "exchange":
+        # 폴백 파일까지 모두 없을 때만
+        if len(missing) == len(LABEL_FILES["exchange"]):
+            emit("warning", f"⚠️ 거래소 주소 파일을 찾을 수 없습니다: {missing[-1][1]}", source="detection")
+    else:
+        for filename, path in missing:
+            emit("warning", f"⚠️ {filename} not found at: {path}", source="detection")
+    for filename, error in index.errors(category):
+        emit("warning", f"⚠️ {LABEL_FILE_ERRORS[category]}: {filename}: {error}", source="detection")
+    return index
 
-        with open(blacklist_path, "r", encoding="utf-8") as f:
-            return set(line.strip() for line in f if line.strip())
-    except Exception as e:
-        st.markdown(f"⚠️ **블랙리스트 파일 오류: {e}**")
-        return set()
+
+def _labeled_receivers(frame, category):
+    """수신 주소 중 category 목록에 있는 것 {주소: 라벨} — 파싱 때의 주소 id 배열로 한 번에 조회"""
+    index = _check_label_files(category)
+    hits = index.match_ids(category, frame.receiver_ids, frame.table)
+    labels = index.category(category)
+    return {address: labels[address] for address, hit in zip(frame.receivers, hits.tolist()) if hit}
+
+
+def load_blacklist():
+    return _check_label_files("blacklist").category("blacklist").keys()
 
 def load_mixer_addresses():
-    """믹서 주소들을 여러 파일에서 로드합니다."""
-    try:
-        current_dir = os.path.dirname(__file__)
-        data_dir = os.path.join(current_dir, "..", "data")
-        
-        mixer_files = [
-            "mixer_addresses.txt",      # Wasabi
-            "samourai_mixer.txt",       # Samourai
-            "joinmarket_mixer.txt",     # JoinMarket
-            "other_mixers.txt"          # 기타 믹서들
-        ]
-        
-        mixer_addresses = {}
-        
-        for filename in mixer_files:
-            file_path = os.path.join(data_dir, filename)
-            if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            parts = line.split(',')
-                            if len(parts) >= 3:
-                                address = parts[0].strip()
-                                mixer_type = parts[1].strip()
-                                source = parts[3].strip() if len(parts) > 3 else "Unknown"
-                                mixer_addresses[address] = f"{mixer_type} ({source})"
-            else:
-                st.markdown(f"⚠️ **{filename} not found at: {file_path}**")
-        
-        return mixer_addresses
-    except Exception as e:
-        st.markdown(f"⚠️ **믹서 주소 파일 오류: {e}**")
-        return {}
+    """믹서 주소들 {주소: "타입 (출처)"}"""
+    return _check_label_files("mixer").category("mixer")
 
 def load_bridge_addresses():
-    """브릿지 주소들을 여러 파일에서 로드합니다."""
-    try:
-        current_dir = os.path.dirname(__file__)
-        data_dir = os.path.join(current_dir, "..", "data")
-        
-        bridge_files = [
-            "wbtc_bridge.txt",          # WBTC
-            "renvm_bridge.txt",         # RenVM
-            "multichain_bridge.txt",    # Multichain
-            "binance_bridge.txt",       # Binance
-            "coinbase_bridge.txt",      # Coinbase
-            "other_bridges.txt"         # 기타 브릿지들
-        ]
-        
-        bridge_addresses = {}
-        
-        for filename in bridge_files:
-            file_path = os.path.join(data_dir, filename)
-            if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            parts = line.split(',')
-                            if len(parts) >= 3:
-                                address = parts[0].strip()
-                                bridge_type = parts[1].strip()
-                                source = parts[3].strip() if len(parts) > 3 else "Unknown"
-                                bridge_addresses[address] = f"{bridge_type} ({source})"
-            else:
-                st.markdown(f"⚠️ **{filename} not found at: {file_path}**")
-        
-        return bridge_addresses
-    except Exception as e:
-        st.markdown(f"⚠️ **브릿지 주소 파일 오류: {e}**")
-        return {}
+    """브릿지 주소들 {주소: "타입 (출처)"}"""
+    return _check_label_files("bridge").category("bridge")
 
 def load_exchange_addresses():
-    """거래소 주소들을 파일에서 로드합니다."""
-    try:
-        current_dir = os.path.dirname(__file__)
-        # 실제 거래소 주소 파일 우선 사용
-        exchange_path = os.path.join(current_dir, "..", "data", "real_exchange_addresses.txt")
-        if not os.path.exists(exchange_path):
-            # 기존 파일로 폴백
-            exchange_path = os.path.join(current_dir, "..", "data", "exchange_addresses.txt")
-            if not os.path.exists(exchange_path):
-                st.markdown(f"⚠️ **거래소 주소 파일을 찾을 수 없습니다: {exchange_path}**")
-                return {}
-        
-        exchange_addresses = {}
-        with open(exchange_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    parts = line.split(',')
-                    if len(parts) >= 3:
-                        address = parts[0].strip()
-                        exch_name = parts[1].strip()
-                        address_type = parts[2].strip() if len(parts) > 2 else "Unknown"
-                        features = parts[3].strip() if len(parts) > 3 else "Unknown"
-                        source = parts[4].strip() if len(parts) > 4 else "Unknown"
-                        exchange_addresses[address] = f"{exch_name} ({address_type}, {features}, {source})"
-        return exchange_addresses
-    except Exception as e:
-        st.markdown(f"⚠️ **거래소 주소 파일 오류: {e}**")
-        return {}
+    """거래소 주소들 {주소: "거래소명 (유형, 특징, 출처)"} (real_exchange_addresses.txt 우선)"""
+    return _check_label_files("exchange").category("exchange")
 
 def exchange_detection_score(tx_list, address=None):
-    """거래소 주소와 연결된 입출금 여부 탐지 + 패턴 분석"""
+    """거래소 주소와 연결된 입출금 여부 탐지 + 패턴 분석 (단계별 결과는 exchange_steps 이벤트로 알림)"""
+    tx_list = as_frame(tx_list)
     exchange_addresses = load_exchange_addresses()
     exchange_hits = set()
     exchange_details = {}
     
     # 거래소 주소 로드 완료 (디버깅 메시지 제거)
     
-    for tx in tx_list:
-        to_address = tx.get('to', '')
-        from_address = tx.get('from', '')
-        amount = tx.get('amount', 0)
+    # 거래소 주소인지는 고유 주소마다 한 번만 보고, 걸린 행만 순서대로 (레코드 dict 는 읽지 않음)
+    # 끝에 붙인 False 는 주소 없음(-1) 자리
+    addresses = tx_list.addresses
+    is_exchange = np.array([address in exchange_addresses for address in addresses] + [False], dtype=bool)
+    hit_rows = np.flatnonzero(is_exchange[tx_list.to_ids] | is_exchange[tx_list.from_ids])
+    for row in hit_rows.tolist():
+        to_id, from_id = int(tx_list.to_ids[row]), int(tx_list.from_ids[row])
+        to_address = addresses[to_id] if to_id >= 0 else ''
+        from_address = addresses[from_id] if from_id >= 0 else ''
+        amount = float(tx_list.amounts[row])
         
         # 입금 (거래소로의 전송)
         if to_address in exchange_addresses:
@@ -264,115 +286,83 @@ def exchange_detection_score(tx_list, address=None):
                 ("클러스터", cluster_result.get('confidence', 'low') == 'high', "🔗"),
             ]
             
-            # 가로 행으로 표시
-            cols = st.columns(len(steps))
-            for i, (name, success, icon) in enumerate(steps):
-                with cols[i]:
-                    color = "#08BDBD" if success else "#ccc"
-                    status = "✅ 성공" if success else "❌ 실패"
-                    st.markdown(f"""
-                    <div style='text-align: center; padding: 12px; border: 2px solid {color}; border-radius: 8px; background: {color}22;'>
-                        <div style='font-size: 28px; color: {color}; margin-bottom: 8px;'>{icon}</div>
-                        <div style='font-size: 16px; color: {color}; font-weight: bold; margin-bottom: 4px;'>{name}</div>
-                        <div style='font-size: 14px; color: {color};'>{status}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            # 3. 교차 검증/세부 정보는 토글(expander)로
-            with st.expander("🔬 교차 검증 상세 보기", expanded=False):
-                st.markdown(f"""
-                <ul>
-                    <li>검증 점수: <b>{cross_validation.get('validation_score', 0)}/{cross_validation.get('total_methods', 0)}</b></li>
-                    <li>검증 비율: <b>{cross_validation.get('cross_validation_ratio', 0):.1%}</b></li>
-                    <li>최종 신뢰도: <b>{cross_validation.get('final_confidence', 'low')}</b></li>
-                </ul>
-                """, unsafe_allow_html=True)
-                if methods_used:
-                    st.markdown(f"**📋 사용된 식별 방법:**")
-                    for method in methods_used:
-                        method_names = {
-                            'public_database': '공개 데이터베이스 검색',
-                            'pattern_analysis': '거래 패턴 분석',
-                            'official_address': '공식 주소 확인',
-                            'cluster_analysis': '지갑 클러스터 분석'
-                        }
-                        st.caption(f"• {method_names.get(method, method)}")
-        
+            emit("info", "거래소 식별 단계별 결과", source="detection", kind="exchange_steps",
+                 steps=steps, cross_validation=cross_validation, methods_used=methods_used)
+
         except Exception as e:
-            st.markdown(f"⚠️ **패턴 분석 오류: {e}**")
+            emit("warning", f"⚠️ 패턴 분석 오류: {e}", source="detection")
     
     # 상세 정보와 패턴 분석을 함께 반환
     return list(exchange_hits), exchange_details, pattern_analysis
 
 def blacklist_score(tx_list):
-    blacklist = load_blacklist()
-    involved = [tx.get('to') for tx in tx_list if isinstance(tx, dict) and tx.get('to') in blacklist]
-    if involved:
-        return True, 100  # 블랙리스트 주소가 포함되면 100점
-    return False, 0
+    return score_blacklist(_labeled_receivers(as_frame(tx_list), "blacklist"))
+
+# 같은 금액의 출력이 이만큼 이상이고 입력도 그만큼 이상이면 CoinJoin 으로 봄 (Whirlpool 5×5, Wasabi 등)
+COINJOIN_MIN_EQUAL_OUTPUTS = 3
+
+
+def equal_output_count(io):
+    """tx 에서 가장 많이 반복된 출력 금액의 개수 (참여자마다 입력이 있어야 하므로 입력 수보다 많으면 0)"""
+    values = [v for v in io.get('output_values', []) if v > 0]
+    if not values:
+        return 0
+    count = Counter(values).most_common(1)[0][1]
+    return count if io.get('n_inputs', 0) >= count else 0
+
+
+def tx_io_counts(frame):
+    """
+    (다중 입력/출력 tx 수, 동일 금액 출력 CoinJoin tx 수)
+    행은 입력×출력으로 펼쳐져 있으므로 파서가 붙인 tx 별 io 요약을 tx 당 한 번만 봄
+    TxColumns 에서 만든 프레임은 레코드 없이 컬럼에서 바로 셈
+    """
+    if frame.columns is not None:
+        n_inputs, n_outputs, equal = frame.columns.io_counts(frame.column_txs)
+        return (int(np.count_nonzero((n_inputs > 3) & (n_outputs > 3))),
+                int(np.count_nonzero(equal >= COINJOIN_MIN_EQUAL_OUTPUTS)))
+    multi_io_count = 0
+    coinjoin_count = 0
+    for row in frame.tx_first_rows.tolist():
+        tx = frame.records[row]
+        io = tx.get('io')
+        if io:
+            n_inputs, n_outputs = io['n_inputs'], io['n_outputs']
+            if equal_output_count(io) >= COINJOIN_MIN_EQUAL_OUTPUTS:
+                coinjoin_count += 1
+        else:
+            n_inputs, n_outputs = len(tx.get('inputs', [])), len(tx.get('outputs', []))
+
+        if n_inputs > 3 and n_outputs > 3:
+            multi_io_count += 1
+    return multi_io_count, coinjoin_count
 
 # 6. Mixer 탐지 기능
 def mixer_detection_score(tx_list):
     """
     믹서(Mixer) 사용 여부를 탐지합니다.
     - Wasabi, Samourai, JoinMarket 등의 특징적인 패턴 탐지
-    - 다중 입력/출력, 동일 금액, 시간 간격 패턴 분석
+    - 다중 입력/출력, 동일 금액 출력(CoinJoin), 동일 금액, 시간 간격 패턴 분석
     """
-    mixer_indicators = []
-    mixer_score = 0
-    
-    if not tx_list:
-        return mixer_score, mixer_indicators
+    frame = as_frame(tx_list)
+    if not len(frame):
+        return 0, []
     
     # 1. 알려진 믹서 주소 매칭
-    known_mixer_addresses = load_mixer_addresses()
-    mixer_hits = set()
-    for tx in tx_list:
-        to_address = tx.get('to', '')
-        if to_address in known_mixer_addresses:
-            mixer_hits.add(known_mixer_addresses[to_address])
-    
-    if mixer_hits:
-        mixer_score += min(25, len(mixer_hits) * 10)
-        for mixer_type in mixer_hits:
-            mixer_indicators.append(f"알려진 믹서 주소: {mixer_type}")
-    
-    # 2. 다중 입력/출력 패턴 탐지
-    multi_io_count = 0
-    for tx in tx_list:
-        inputs = tx.get('inputs', [])
-        outputs = tx.get('outputs', [])
-        
-        if len(inputs) > 3 and len(outputs) > 3:
-            multi_io_count += 1
-    
-    if multi_io_count > 0:
-        mixer_score += min(20, multi_io_count * 5)
-        mixer_indicators.append(f"다중 I/O 패턴: {multi_io_count}개 트랜잭션")
+    mixer_hits = set(_labeled_receivers(frame, "mixer").values())
     
-    # 2. 동일 금액 패턴 탐지 (믹서의 특징)
-    amounts = [tx.get('amount', 0) for tx in tx_list]
-    amount_counter = Counter(amounts)
-    repeated_amounts = [amt for amt, count in amount_counter.items() if count >= 2 and amt > 0]
+    # 2. 다중 입력/출력 + 동일 금액 출력(CoinJoin) 패턴 탐지
+    multi_io_count, coinjoin_count = tx_io_counts(frame)
     
-    if repeated_amounts:
-        mixer_score += min(15, len(repeated_amounts) * 3)
-        mixer_indicators.append(f"동일 금액 패턴: {len(repeated_amounts)}개 중복 금액")
+    # 3. 동일 금액 패턴 탐지 (믹서의 특징)
+    amounts, counts = np.unique(frame.amounts, return_counts=True)
+    repeated_amounts = int(np.count_nonzero((counts >= 2) & (amounts > 0)))
     
-    # 3. 시간 간격 패턴 분석 (믹서는 보통 짧은 간격으로 연속 트랜잭션)
-    try:
-        timestamps = [datetime.fromisoformat(tx['timestamp']) for tx in tx_list if 'timestamp' in tx]
-        if len(timestamps) >= 2:
-            intervals = [(t2 - t1).total_seconds() for t1, t2 in zip(timestamps[:-1], timestamps[1:])]
-            short_intervals = [i for i in intervals if i < 30]  # 30초 이내 간격
-            
-            if len(short_intervals) > len(intervals) * 0.5:  # 50% 이상이 짧은 간격
-                mixer_score += 10
-                mixer_indicators.append("빠른 연속 트랜잭션 패턴")
-    except Exception:
-        pass
+    # 4. 시간 간격 패턴 분석 (믹서는 보통 짧은 간격으로 연속 트랜잭션)
+    intervals = frame.intervals
+    rapid_intervals = int(np.count_nonzero(intervals < RAPID_INTERVAL_SECONDS))
     
-    return mixer_score, mixer_indicators
+    return score_mixer(mixer_hits, multi_io_count, coinjoin_count, repeated_amounts, len(intervals), rapid_intervals)
 
 # 7. Cross-chain Bridge 탐지 기능
 def cross_chain_detection_score(tx_list):
@@ -382,73 +372,39 @@ def cross_chain_detection_score(tx_list):
     - 대용량 단일 트랜잭션 탐지
     - 특정 브릿지 서비스 주소 매칭
     """
-    bridge_indicators = []
-    bridge_score = 0
-    
-    if not tx_list:
-        return bridge_score, bridge_indicators
+    frame = as_frame(tx_list)
+    if not len(frame):
+        return 0, []
     
     # 1. 브릿지 주소 매칭
-    bridge_addresses = load_bridge_addresses()
-    bridge_hits = set()  # 중복 제거를 위해 set 사용
-    for tx in tx_list:
-        to_address = tx.get('to', '')
-        if to_address in bridge_addresses:
-            bridge_hits.add(bridge_addresses[to_address])
-    
-    if bridge_hits:
-        bridge_score += min(30, len(bridge_hits) * 10)
-        for bridge_type in bridge_hits:
-            bridge_indicators.append(f"브릿지 주소 감지: {bridge_type}")
+    bridge_hits = set(_labeled_receivers(frame, "bridge").values())  # 중복 제거를 위해 set 사용
     
     # 2. 대용량 단일 트랜잭션 탐지 (브릿지 특징)
-    large_txs = [tx for tx in tx_list if tx.get('amount', 0) > 1000000]  # 1 BTC 이상
-    if large_txs:
-        bridge_score += min(20, len(large_txs) * 5)
-        bridge_indicators.append(f"대용량 트랜잭션: {len(large_txs)}개")
+    amounts = frame.amounts
+    large_txs = int(np.count_nonzero(amounts > LARGE_TX_AMOUNT))  # 1 BTC 이상
     
     # 3. 특정 패턴 탐지 (브릿지 사용 시 특징적인 패턴)
     # - 큰 금액의 단일 트랜잭션 후 작은 금액의 분산
-    amounts = [tx.get('amount', 0) for tx in tx_list]
-    if amounts:
-        max_amount = max(amounts)
-        if max_amount > 500000:  # 0.5 BTC 이상
-            small_txs = [amt for amt in amounts if 0 < amt < max_amount * 0.1]
-            if len(small_txs) >= 2:
-                bridge_score += 15
-                bridge_indicators.append("브릿지 후 분산 패턴 감지")
+    max_amount = amounts.max()
+    small_txs = np.count_nonzero((amounts > 0) & (amounts < max_amount * BRIDGE_SPLIT_RATIO))
+    split_pattern = max_amount > BRIDGE_SPLIT_MIN_MAX and small_txs >= 2
     
-    return bridge_score, bridge_indicators
+    return score_cross_chain(bridge_hits, large_txs, split_pattern)
 
 # 8. 통합 세탁 의심도 분석
-def money_laundering_risk_score(tx_list):
+def money_laundering_risk_score(tx_list, mixer_result=None, bridge_result=None):
     """
     전체적인 세탁 의심도를 종합적으로 분석합니다.
+    mixer_result / bridge_result 에 이미 계산한 (점수, 지표) 를 넘기면 다시 계산하지 않습니다.
     """
-    risk_indicators = []
-    total_risk_score = 0
+    frame = as_frame(tx_list)
     
     # 각 탐지 기능 실행
-    mixer_score, mixer_indicators = mixer_detection_score(tx_list)
-    bridge_score, bridge_indicators = cross_chain_detection_score(tx_list)
-    
-    total_risk_score = mixer_score + bridge_score
-    
-    # 지표들 통합
-    risk_indicators.extend(mixer_indicators)
-    risk_indicators.extend(bridge_indicators)
-    
-    # 추가 위험 지표
-    if len(tx_list) > 10:
-        risk_indicators.append("높은 트랜잭션 볼륨")
-        total_risk_score += 10
+    mixer_result = mixer_result or mixer_detection_score(frame)
+    bridge_result = bridge_result or cross_chain_detection_score(frame)
     
     # 금액 분산 패턴
-    amounts = [tx.get('amount', 0) for tx in tx_list]
-    if amounts:
-        amount_variance = np.var(amounts) if len(amounts) > 1 else 0
-        if amount_variance > 1000000:  # 높은 분산
-            risk_indicators.append("불규칙한 금액 분산 패턴")
-            total_risk_score += 15
+    amounts = frame.amounts
+    amount_variance = float(np.var(amounts)) if len(amounts) > 1 else 0
     
-    return total_risk_score, risk_indicators
+    return score_laundering(mixer_result, bridge_result, len(frame), amount_variance)
@@ -0,0 +1,64 @@
+import contextvars
+from contextlib import contextmanager
+
+# 로직 계층 → 화면 알림 통로
+# logic/ 모듈은 streamlit 을 import 하지 않고 emit() 만 호출하고, 화면에 그리는 쪽(ui.events)이 listening() 으로 구독함
+# 구독자는 ContextVar 에 들어 있으므로 Streamlit 세션끼리 섞이지 않고, 워커 스레드에는
+# contextvars.copy_context() 로 넘겨 주면 됨 (logic.scoring 이 그렇게 함)
+# 구독자가 없으면 (배치 CLI, 워커 프로세스) 콘솔에 출력
+LEVELS = ("info", "success", "warning", "error")
+
+_sinks = contextvars.ContextVar("logic_event_sinks", default=())
+
+
+class Event:
+    """
+    level    LEVELS 중 하나
+    message  사람이 읽는 한 줄 (이모지 접두어 포함)
+    source   보낸 모듈 이름 (detection, exchange_identifier, ...)
+    kind     구조화된 이벤트 종류 (없으면 일반 메시지) — 구독자가 kind 별로 따로 그릴 수 있음
+    data     kind 에 딸린 값들
+    """
+
+    __slots__ = ("level", "message", "source", "kind", "data")
+
+    def __init__(self, level, message, source="logic", kind=None, data=None):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown event level: {level}")
+        self.level = level
+        self.message = message
+        self.source = source
+        self.kind = kind
+        self.data = data or {}
+
+    def __repr__(self):
+        return f"Event({self.level}, {self.source}, {self.message!r})"
+
+
+def _console(event):
+    print(f"[{event.source.upper()}] {event.message}")
+
+
+def emit(level, message, source="logic", kind=None, **data):
+    """현재 컨텍스트의 구독자에게 이벤트 전달 (구독자가 없으면 콘솔)"""
+    event = Event(level, message, source=source, kind=kind, data=data)
+    sinks = _sinks.get()
+    if not sinks:
+        _console(event)
+    for sink in sinks:
+        sink(event)
+    return event
+
+
+def has_listeners():
+    return bool(_sinks.get())
+
+
+@contextmanager
+def listening(sink):
+    """with 블록 안에서(그리고 그 컨텍스트를 넘겨받은 워커 스레드에서) 나온 이벤트를 sink(event) 로 받음"""
+    token = _sinks.set(_sinks.get() + (sink,))
+    try:
+        yield sink
+    finally:
+        _sinks.reset(token)
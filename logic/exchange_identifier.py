@@ -1,4 +1,3 @@
-import requests
 import json
 import time
 import os
@@ -6,15 +5,11 @@ from typing import Dict, List, Tuple, Optional
 from collections import defaultdict, Counter
 import numpy as np
 from datetime import datetime, timedelta
-import streamlit as st
 import re
 
-def safe_st_markdown(msg):
-    try:
-        import streamlit as st
-        st.markdown(msg)
-    except Exception:
-        pass
+from api.transport import http_get
+from logic.events import emit
+from logic.txframe import as_frame
 
 def is_genesis_address(address: str) -> bool:
     """Genesis 블록 주소인지 확인"""
@@ -147,12 +142,12 @@ class ExchangeIdentifier:
                                 source = parts[4].strip() if len(parts) > 4 else "Unknown"
                                 exchange_addresses[address] = f"{exchange_name} ({address_type}, {features}, {source})"
                 
-                safe_st_markdown(f"✅ **거래소 주소 데이터베이스 로드 완료: {len(exchange_addresses)}개 주소**")
+                emit("success", f"✅ 거래소 주소 데이터베이스 로드 완료: {len(exchange_addresses)}개 주소", source="exchange_identifier")
             else:
-                safe_st_markdown(f"⚠️ **거래소 주소 파일을 찾을 수 없습니다: {exchange_path}**")
+                emit("warning", f"⚠️ 거래소 주소 파일을 찾을 수 없습니다: {exchange_path}", source="exchange_identifier")
                 
         except Exception as e:
-            safe_st_markdown(f"⚠️ **거래소 주소 파일 로드 오류: {e}**")
+            emit("warning", f"⚠️ 거래소 주소 파일 로드 오류: {e}", source="exchange_identifier")
         
         return exchange_addresses
     
@@ -169,7 +164,7 @@ class ExchangeIdentifier:
         # 1. Blockchair API
         try:
             blockchair_url = f"https://api.blockchair.com/bitcoin/addresses/{address}"
-            response = requests.get(blockchair_url, timeout=10)
+            response = http_get(blockchair_url, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 if 'data' in data and address in data['data']:
@@ -182,7 +177,7 @@ class ExchangeIdentifier:
                                 results['sources'].append('Blockchair')
                                 results['confidence'] = 'medium'
         except Exception as e:
-            safe_st_markdown(f"⚠️ **Blockchair API 오류: {e}**")
+            emit("warning", f"⚠️ Blockchair API 오류: {e}", source="exchange_identifier")
         # 2. WalletExplorer.com API
         if not results['found']:
             try:
@@ -195,7 +190,7 @@ class ExchangeIdentifier:
                     'Connection': 'keep-alive',
                     'Upgrade-Insecure-Requests': '1',
                 }
-                response = requests.get(walletexplorer_url, headers=headers, timeout=15)
+                response = http_get(walletexplorer_url, headers=headers, timeout=15)
                 if response.status_code == 200:
                     content = response.text.lower()
                     exchange_keywords = [
@@ -214,7 +209,7 @@ class ExchangeIdentifier:
                         if any(ex in found_exchanges for ex in ['binance', 'coinbase', 'upbit', 'okx']):
                             results['confidence'] = 'high'
             except Exception as e:
-                safe_st_markdown(f"⚠️ **WalletExplorer.com API 오류: {e}**")
+                emit("warning", f"⚠️ WalletExplorer.com API 오류: {e}", source="exchange_identifier")
         # 3. OXT.me API (Bitcoin OXT)
         # if not results['found']:
         #     try:
@@ -252,57 +247,46 @@ class ExchangeIdentifier:
             'transaction_frequency': 0
         }
         
+        frame = as_frame(tx_list)
+        
         # 거래량 분석
-        amounts = [tx.get('amount', 0) for tx in tx_list]
-        if amounts:
+        amounts = frame.amounts
+        if len(amounts):
             avg_amount = np.mean(amounts)
-            large_txs = [amt for amt in amounts if amt > avg_amount * 2]
-            patterns['high_volume_deposits'] = len(large_txs)
-            patterns['amount_distribution'] = amounts
+            patterns['high_volume_deposits'] = int(np.count_nonzero(amounts > avg_amount * 2))
+            patterns['amount_distribution'] = amounts.tolist()
         
         # 시간 간격 분석
-        timestamps = []
-        for tx in tx_list:
-            try:
-                if 'timestamp' in tx:
-                    ts = datetime.fromisoformat(tx['timestamp'])
-                    timestamps.append(ts)
-            except:
-                continue
+        timestamps = frame.sorted_times
         
         if len(timestamps) >= 2:
-            sorted_times = sorted(timestamps)
-            intervals = [(t2 - t1).total_seconds() for t1, t2 in zip(sorted_times[:-1], sorted_times[1:])]
+            intervals = frame.sorted_intervals
             
             # 정규 간격 패턴 (30초-5분)
-            regular_count = sum(1 for interval in intervals if 30 <= interval <= 300)
-            patterns['regular_intervals'] = regular_count / len(intervals) if intervals else 0
+            regular_count = np.count_nonzero((intervals >= 30) & (intervals <= 300))
+            patterns['regular_intervals'] = regular_count / len(intervals)
             
             # 거래 빈도 분석
-            total_time = (sorted_times[-1] - sorted_times[0]).total_seconds() if len(sorted_times) > 1 else 1
-            patterns['transaction_frequency'] = len(tx_list) / (total_time / 3600) if total_time > 0 else 0  # 거래/시간
+            total_time = int(timestamps[-1] - timestamps[0])
+            patterns['transaction_frequency'] = len(frame) / (total_time / 3600) if total_time > 0 else 0  # 거래/시간
             
-            # 시간대 패턴
-            for ts in timestamps:
-                hour = ts.hour
-                if 9 <= hour <= 18:  # 한국 시간대
-                    patterns['timezone_patterns']['korean'] += 1
-                elif 14 <= hour <= 23:  # 미국 시간대
-                    patterns['timezone_patterns']['us'] += 1
-                elif 0 <= hour <= 8:  # 아시아 시간대
-                    patterns['timezone_patterns']['asian'] += 1
-                elif 19 <= hour <= 23:  # 유럽 시간대
-                    patterns['timezone_patterns']['european'] += 1
+            # 시간대 패턴 (UTC 시)
+            hours = frame.hours
+            korean = (hours >= 9) & (hours <= 18)  # 한국 시간대
+            us = ~korean & (hours >= 14) & (hours <= 23)  # 미국 시간대
+            asian = hours <= 8  # 아시아 시간대
+            patterns['timezone_patterns']['korean'] += int(np.count_nonzero(korean))
+            patterns['timezone_patterns']['us'] += int(np.count_nonzero(us))
+            patterns['timezone_patterns']['asian'] += int(np.count_nonzero(asian))
         
         # 반올림 금액 패턴
-        for amount in amounts:
-            if amount % 1000 == 0 or amount % 10000 == 0:
-                patterns['round_amounts'] += 1
+        patterns['round_amounts'] = int(np.count_nonzero((amounts % 1000 == 0) | (amounts % 10000 == 0)))
         
         # 주소 재사용 패턴
-        addresses = [tx.get('to', '') for tx in tx_list if tx.get('to')]
-        address_counter = Counter(addresses)
-        patterns['address_reuse'] = len([addr for addr, count in address_counter.items() if count > 1])
+        to_ids = frame.to_ids[frame.to_ids >= 0]
+        counts = np.bincount(to_ids, minlength=len(frame.addresses))
+        address_counter = Counter({frame.addresses[i]: int(counts[i]) for i in np.flatnonzero(counts).tolist()})
+        patterns['address_reuse'] = int(np.count_nonzero(counts > 1))
         
         # 거래소별 특징 패턴 분석
         self._analyze_exchange_specific_patterns(patterns, amounts, timestamps, address_counter)
@@ -474,52 +458,48 @@ class ExchangeIdentifier:
         if not tx_list:
             return {'clusters': [], 'confidence': 'low'}
         
-        # 주소 그룹화
-        address_groups = defaultdict(list)
-        for tx in tx_list:
-            to_addr = tx.get('to', '')
-            from_addr = tx.get('from', '')
-            amount = tx.get('amount', 0)
-            
-            if to_addr:
-                address_groups[to_addr].append({
-                    'type': 'incoming',
-                    'amount': amount,
-                    'timestamp': tx.get('timestamp', '')
-                })
-            
-            if from_addr:
-                address_groups[from_addr].append({
-                    'type': 'outgoing',
-                    'amount': amount,
-                    'timestamp': tx.get('timestamp', '')
-                })
+        # 주소 그룹화 (주소 번호별 입금/출금 횟수와 금액 합을 배열로)
+        frame = as_frame(tx_list)
+        n_addresses = len(frame.addresses)
+        to_rows = np.flatnonzero(frame.to_ids >= 0)
+        from_rows = np.flatnonzero(frame.from_ids >= 0)
+        to_ids, from_ids = frame.to_ids[to_rows], frame.from_ids[from_rows]
+        incoming = np.bincount(to_ids, minlength=n_addresses)
+        outgoing = np.bincount(from_ids, minlength=n_addresses)
+        volume = (np.bincount(to_ids, weights=frame.amounts[to_rows], minlength=n_addresses)
+                  + np.bincount(from_ids, weights=frame.amounts[from_rows], minlength=n_addresses))
+        counts = incoming + outgoing
+        # 주소가 처음 등장한 순서 (행마다 수신 → 송신 순)
+        first_seen = np.full(n_addresses, np.iinfo(np.int64).max)
+        np.minimum.at(first_seen, to_ids, 2 * to_rows)
+        np.minimum.at(first_seen, from_ids, 2 * from_rows + 1)
+        selected = np.flatnonzero(counts >= 3)  # 최소 3개 이상의 거래가 있는 주소만
+        selected = selected[np.argsort(first_seen[selected], kind='stable')]
         
         # 클러스터 특징 분석
         clusters = []
-        for addr, transactions in address_groups.items():
-            if len(transactions) >= 3:  # 최소 3개 이상의 거래가 있는 주소만
-                cluster_info = {
-                    'address': addr,
-                    'transaction_count': len(transactions),
-                    'total_volume': sum(tx['amount'] for tx in transactions),
-                    'incoming_count': len([tx for tx in transactions if tx['type'] == 'incoming']),
-                    'outgoing_count': len([tx for tx in transactions if tx['type'] == 'outgoing']),
-                    'avg_amount': np.mean([tx['amount'] for tx in transactions]) if transactions else 0
-                }
-                
-                # 거래소 패턴 매칭
-                if (cluster_info['incoming_count'] > 5 and 
-                    cluster_info['outgoing_count'] > 5 and 
-                    cluster_info['avg_amount'] > 100000):  # 0.001 BTC 이상
-                    cluster_info['exchange_likelihood'] = 'high'
-                elif (cluster_info['incoming_count'] > 3 and 
-                      cluster_info['outgoing_count'] > 3):
-                    cluster_info['exchange_likelihood'] = 'medium'
-                else:
-                    cluster_info['exchange_likelihood'] = 'low'
-                
-                clusters.append(cluster_info)
+        for i in selected.tolist():
+            cluster_info = {
+                'address': frame.addresses[i],
+                'transaction_count': int(counts[i]),
+                'total_volume': float(volume[i]),
+                'incoming_count': int(incoming[i]),
+                'outgoing_count': int(outgoing[i]),
+                'avg_amount': float(volume[i] / counts[i])
+            }
+            
+            # 거래소 패턴 매칭
+            if (cluster_info['incoming_count'] > 5 and 
+                cluster_info['outgoing_count'] > 5 and 
+                cluster_info['avg_amount'] > 100000):  # 0.001 BTC 이상
+                cluster_info['exchange_likelihood'] = 'high'
+            elif (cluster_info['incoming_count'] > 3 and 
+                  cluster_info['outgoing_count'] > 3):
+                cluster_info['exchange_likelihood'] = 'medium'
+            else:
+                cluster_info['exchange_likelihood'] = 'low'
+            
+            clusters.append(cluster_info)
         
         # 신뢰도 계산
         high_likelihood_clusters = [c for c in clusters if c['exchange_likelihood'] == 'high']
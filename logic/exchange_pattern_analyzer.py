@@ -1,11 +1,11 @@
 import numpy as np
-import pandas as pd
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 import math
 import re
 from typing import Dict, List, Tuple, Optional
-import streamlit as st
+
+from logic.txframe import as_frame
 
 class ExchangePatternAnalyzer:
     """거래소 주소 패턴 분석기 - 엔트로피, 규칙성, 특징 추출"""
@@ -58,136 +58,128 @@ class ExchangePatternAnalyzer:
     
     def analyze_amount_patterns(self, tx_list: List[Dict]) -> Dict:
         """금액 패턴 분석"""
-        amounts = [tx.get('amount', 0) for tx in tx_list if tx.get('amount', 0) > 0]
-        if not amounts:
+        amounts = as_frame(tx_list).amounts
+        amounts = amounts[amounts > 0]
+        if not len(amounts):
             return {}
         
         analysis = {
-            'total_volume': sum(amounts),
+            'total_volume': float(amounts.sum()),
             'avg_amount': np.mean(amounts),
             'std_amount': np.std(amounts),
-            'min_amount': min(amounts),
-            'max_amount': max(amounts),
-            'round_numbers': 0,
-            'high_volume': 0,
-            'krw_conversion': 0,
-            'usd_conversion': 0
-        }
-        
-        # 반올림 숫자 패턴 (1000, 10000, 100000 등)
-        for amount in amounts:
-            if amount % 1000 == 0:
-                analysis['round_numbers'] += 1
-            if amount > 1000000:  # 1 BTC 이상
-                analysis['high_volume'] += 1
+            'min_amount': float(amounts.min()),
+            'max_amount': float(amounts.max()),
+            # 반올림 숫자 패턴 (1000, 10000, 100000 등)
+            'round_numbers': int(np.count_nonzero(amounts % 1000 == 0)),
+            # 1 BTC 이상
+            'high_volume': int(np.count_nonzero(amounts > 1000000)),
             # KRW 환산 패턴 (약 50,000,000원 = 1 BTC 기준)
-            if 45000000 <= amount <= 55000000:
-                analysis['krw_conversion'] += 1
+            'krw_conversion': int(np.count_nonzero((amounts >= 45000000) & (amounts <= 55000000))),
             # USD 환산 패턴 (약 40,000 USD = 1 BTC 기준)
-            if 35000000 <= amount <= 45000000:
-                analysis['usd_conversion'] += 1
+            'usd_conversion': int(np.count_nonzero((amounts >= 35000000) & (amounts <= 45000000))),
+        }
         
         return analysis
     
     def analyze_time_patterns(self, tx_list: List[Dict]) -> Dict:
         """시간 패턴 분석"""
-        timestamps = []
-        for tx in tx_list:
-            try:
-                if 'timestamp' in tx:
-                    ts = datetime.fromisoformat(tx['timestamp'])
-                    timestamps.append(ts)
-            except:
-                continue
-        
-        if len(timestamps) < 2:
+        frame = as_frame(tx_list)
+        if len(frame.sorted_times) < 2:
             return {}
         
-        # 시간대별 분석
-        hours = [ts.hour for ts in timestamps]
-        hour_distribution = Counter(hours)
+        # 시간대별 분석 (UTC 시)
+        hours = frame.hours
         
         # 한국 시간대 (9-18시) vs 미국 시간대 (14-23시 UTC)
-        korean_hours = sum(1 for h in hours if 9 <= h <= 18)
-        us_hours = sum(1 for h in hours if 14 <= h <= 23)
+        korean_hours = np.count_nonzero((hours >= 9) & (hours <= 18))
+        us_hours = np.count_nonzero((hours >= 14) & (hours <= 23))
         
         # 간격 분석
-        sorted_times = sorted(timestamps)
-        intervals = [(t2 - t1).total_seconds() for t1, t2 in zip(sorted_times[:-1], sorted_times[1:])]
+        intervals = frame.sorted_intervals
         
         analysis = {
-            'total_transactions': len(timestamps),
-            'korean_timezone_ratio': korean_hours / len(hours) if hours else 0,
-            'us_timezone_ratio': us_hours / len(hours) if hours else 0,
-            'avg_interval': np.mean(intervals) if intervals else 0,
-            'std_interval': np.std(intervals) if intervals else 0,
-            'regular_intervals': 0,
-            'batch_processing': 0
+            'total_transactions': len(frame.sorted_times),
+            'korean_timezone_ratio': korean_hours / len(hours),
+            'us_timezone_ratio': us_hours / len(hours),
+            'avg_interval': np.mean(intervals),
+            'std_interval': np.std(intervals),
+            # 정규 간격 패턴 (30초-5분 간격)
+            'regular_intervals': np.count_nonzero((intervals >= 30) & (intervals <= 300)) / len(intervals),
+            # 배치 처리 패턴 (연속 트랜잭션)
+            'batch_processing': np.count_nonzero(intervals < 60) / len(intervals),
         }
         
-        # 정규 간격 패턴 (30초-5분 간격)
-        regular_count = sum(1 for interval in intervals if 30 <= interval <= 300)
-        analysis['regular_intervals'] = regular_count / len(intervals) if intervals else 0
-        
-        # 배치 처리 패턴 (연속 트랜잭션)
-        batch_count = sum(1 for interval in intervals if interval < 60)
-        analysis['batch_processing'] = batch_count / len(intervals) if intervals else 0
-        
         return analysis
     
     def analyze_address_patterns(self, tx_list: List[Dict]) -> Dict:
         """주소 패턴 분석"""
-        addresses = []
-        for tx in tx_list:
-            if tx.get('to'):
-                addresses.append(tx['to'])
-            if tx.get('from'):
-                addresses.append(tx['from'])
-        
-        if not addresses:
+        frame = as_frame(tx_list)
+        ids = np.concatenate([frame.to_ids, frame.from_ids])
+        ids = ids[ids >= 0]
+        if not len(ids):
             return {}
         
+        # 주소 문자열 검사는 고유 주소마다 한 번, 등장 횟수로 가중
+        counts = np.bincount(ids, minlength=len(frame.addresses))
         analysis = {
-            'total_addresses': len(addresses),
-            'unique_addresses': len(set(addresses)),
+            'total_addresses': len(ids),
+            'unique_addresses': int(np.count_nonzero(counts)),
             'bc1_prefix': 0,
             'legacy_format': 0,
             'multiple_outputs': 0,
             'single_output': 0
         }
         
-        for addr in addresses:
+        for addr, count in zip(frame.addresses, counts.tolist()):
             if addr.startswith('bc1'):
-                analysis['bc1_prefix'] += 1
+                analysis['bc1_prefix'] += count
             elif addr.startswith('1') or addr.startswith('3'):
-                analysis['legacy_format'] += 1
+                analysis['legacy_format'] += count
         
         # 출력 개수 패턴
-        for tx in tx_list:
-            outputs = tx.get('outputs', [])
-            if len(outputs) > 1:
-                analysis['multiple_outputs'] += 1
-            else:
-                analysis['single_output'] += 1
+        if frame.columns is not None:
+            # 파서 레코드에는 'outputs' 목록이 없으므로 (tx 별 출력 수는 'io' 요약) 레코드를 만들지 않고 같은 값
+            analysis['single_output'] = len(frame)
+        else:
+            for tx in frame:
+                outputs = tx.get('outputs', [])
+                if len(outputs) > 1:
+                    analysis['multiple_outputs'] += 1
+                else:
+                    analysis['single_output'] += 1
         
         return analysis
     
-    def calculate_exchange_similarity(self, tx_list: List[Dict], exchange_name: str) -> float:
-        """특정 거래소와의 유사도 계산"""
+    def summarize_patterns(self, tx_list: List[Dict]) -> Dict:
+        """거래소 유사도 계산에 쓰는 패턴 요약 (거래소마다 다시 계산하지 않도록 한 번만)"""
+        frame = as_frame(tx_list)
+        to_ids = frame.to_ids[frame.to_ids >= 0]
+        if len(to_ids):
+            # 수신 행 평균 엔트로피 = 고유 주소 엔트로피의 등장 횟수 가중 평균
+            counts = np.bincount(to_ids, minlength=len(frame.addresses))
+            used = np.flatnonzero(counts)
+            entropies = np.array([self.calculate_address_entropy(frame.addresses[i]) for i in used.tolist()])
+            avg_entropy = float(np.dot(entropies, counts[used]) / len(to_ids))
+        else:
+            avg_entropy = 0.0
+        return {
+            'amount_patterns': self.analyze_amount_patterns(frame),
+            'time_patterns': self.analyze_time_patterns(frame),
+            'address_patterns': self.analyze_address_patterns(frame),
+            'avg_entropy': avg_entropy,
+        }
+    
+    def calculate_exchange_similarity(self, tx_list: List[Dict], exchange_name: str, summary: Optional[Dict] = None) -> float:
+        """특정 거래소와의 유사도 계산 (summary 를 주면 패턴 분석을 다시 하지 않음)"""
         if not tx_list:
             return 0.0
         
         # 각 패턴 분석
-        amount_patterns = self.analyze_amount_patterns(tx_list)
-        time_patterns = self.analyze_time_patterns(tx_list)
-        address_patterns = self.analyze_address_patterns(tx_list)
-        
-        # 엔트로피 계산
-        addresses = [tx.get('to', '') for tx in tx_list if tx.get('to')]
-        if addresses:
-            avg_entropy = np.mean([self.calculate_address_entropy(addr) for addr in addresses])
-        else:
-            avg_entropy = 0.0
+        summary = summary or self.summarize_patterns(tx_list)
+        amount_patterns = summary['amount_patterns']
+        time_patterns = summary['time_patterns']
+        address_patterns = summary['address_patterns']
+        avg_entropy = summary['avg_entropy']
         
         # 거래소별 패턴 매칭
         exchange_pattern = self.exchange_patterns.get(exchange_name, {})
@@ -230,10 +222,12 @@ class ExchangePatternAnalyzer:
             return {}
         
         results = {}
+        frame = as_frame(tx_list)
+        summary = self.summarize_patterns(frame)
         
         # 주요 거래소들과의 유사도 계산
         for exchange_name in self.exchange_patterns.keys():
-            similarity = self.calculate_exchange_similarity(tx_list, exchange_name)
+            similarity = self.calculate_exchange_similarity(frame, exchange_name, summary)
             results[exchange_name] = {
                 'similarity': similarity,
                 'confidence': 'high' if similarity > 70 else 'medium' if similarity > 50 else 'low'
@@ -241,6 +235,7 @@ class ExchangePatternAnalyzer:
         
         # 가장 유사한 거래소 찾기
         best_match = max(results.items(), key=lambda x: x[1]['similarity'])
+        first_receiver = frame.addresses[frame.to_ids[0]] if len(frame) and frame.to_ids[0] >= 0 else ''
         
         return {
             'best_match': {
@@ -250,10 +245,10 @@ class ExchangePatternAnalyzer:
             },
             'all_matches': results,
             'analysis': {
-                'amount_patterns': self.analyze_amount_patterns(tx_list),
-                'time_patterns': self.analyze_time_patterns(tx_list),
-                'address_patterns': self.analyze_address_patterns(tx_list),
-                'entropy': self.calculate_address_entropy(tx_list[0].get('to', '')) if tx_list else 0.0
+                'amount_patterns': summary['amount_patterns'],
+                'time_patterns': summary['time_patterns'],
+                'address_patterns': summary['address_patterns'],
+                'entropy': self.calculate_address_entropy(first_receiver)
             }
         }
     
@@ -0,0 +1,212 @@
+import asyncio
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+
+from api.address_ids import UNKNOWN_ADDRESS
+from api.async_fetch import fetch_many
+from api.backends import get_backend
+from api.edge_store import EDGE_STORE_ENABLED, get_edge_store
+from api.fetch import MEMPOOL_MAX_TXS, get_transaction_data
+from api.parser import parse_mempool_transactions
+from logic.txframe import TxFrame
+from logic.txgraph import TxGraph
+
+load_dotenv()
+
+# 실시간 다중 hop 확장
+# 분석한 주소 하나의 거래 목록만으로는 hop 2 이상이 거의 비므로, hop 마다 다음 주소들의 거래를 실제로 조회해서 붙임
+# 한 hop 의 주소들은 api.async_fetch.fetch_many 로 동시에(상한 있음) 조회하고, hop 이 끝날 때마다 지금까지의 그래프를 돌려줌
+# 주소는 hop 을 넘나들며 한 번만 조회하고, 여러 주소의 히스토리에 같이 나오는 tx 는 한 번만 넣음
+# 예전에 확장한 주소는 api.edge_store 에서 바로 꺼내고(네트워크 조회 없음), 새로 조회한 히스토리는 저장소에 추가
+EXPANSION_CONCURRENCY = int(os.getenv("EXPANSION_CONCURRENCY", "8"))
+# 주소 하나에서 따라갈 최대 이웃 수 (거래량 상위)
+EXPANSION_FANOUT = int(os.getenv("EXPANSION_FANOUT", "10"))
+# hop 하나에서 새로 조회할 최대 주소 수
+EXPANSION_MAX_PER_HOP = int(os.getenv("EXPANSION_MAX_PER_HOP", "50"))
+# 확장 전체 예산: 조회할 주소 수 / 그래프에 넣을 레코드 수
+EXPANSION_MAX_ADDRESSES = int(os.getenv("EXPANSION_MAX_ADDRESSES", "200"))
+EXPANSION_MAX_TXS = int(os.getenv("EXPANSION_MAX_TXS", "20000"))
+# 이웃 주소마다 가져올 최대 트랜잭션 수 (분석 대상 주소는 MEMPOOL_MAX_TXS)
+EXPANSION_TXS_PER_ADDRESS = int(os.getenv("EXPANSION_TXS_PER_ADDRESS", "200"))
+
+DIRECTIONS = ("out", "in", "both")
+
+
+def log(msg):
+    print(f"[FRONTIER] {msg}")
+
+
+class HopResult:
+    """
+    hop 하나가 끝난 시점의 스냅샷
+        hop        방금 끝난 hop (0 = 시작 주소)
+        records    지금까지 모은 전체 레코드 (tx 중복 없음)
+        fetched    이번 hop 에 조회한 주소들, errors 는 그중 실패한 {주소: 메시지}
+        hop_of     지금까지 조회한 {주소: hop}
+        exhausted  예산/이웃이 떨어져 더 확장하지 않으면 그 이유 (아니면 None)
+    """
+
+    def __init__(self, hop, records, fetched, errors, hop_of, exhausted):
+        self.hop = hop
+        self.records = records
+        self.fetched = fetched
+        self.errors = errors
+        self.hop_of = hop_of
+        self.exhausted = exhausted
+
+    def graph(self):
+        """지금까지의 레코드로 만든 TxGraph (그릴 때마다 새로)"""
+        return TxGraph(self.records)
+
+
+class FrontierExpansion:
+    """
+    for result in FrontierExpansion(address, max_hops=3).run(): ...
+    tx_list 를 넘기면 시작 주소는 다시 조회하지 않음 (app 에서 이미 가져온 목록)
+    direction: out = 보낸 돈을 따라감 (받은 주소로), in = 보낸 주소 쪽으로, both = 양쪽
+    store: 엣지 저장소 (None 이면 EDGE_STORE_ENABLED 이고 백엔드가 캐시 가능할 때 전역 저장소, False 면 사용 안 함)
+    """
+
+    def __init__(self, source, max_hops, tx_list=None, direction="out", fanout=EXPANSION_FANOUT,
+                 max_per_hop=EXPANSION_MAX_PER_HOP, max_addresses=EXPANSION_MAX_ADDRESSES,
+                 max_txs=EXPANSION_MAX_TXS, txs_per_address=EXPANSION_TXS_PER_ADDRESS,
+                 concurrency=EXPANSION_CONCURRENCY, store=None):
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown expansion direction: {direction}")
+        self.source = source
+        self.max_hops = max_hops
+        self.tx_list = tx_list
+        self.direction = direction
+        self.fanout = fanout
+        self.max_per_hop = max_per_hop
+        self.max_addresses = max_addresses
+        self.max_txs = max_txs
+        self.txs_per_address = txs_per_address
+        self.concurrency = concurrency
+        if store is None:
+            store = get_edge_store() if EDGE_STORE_ENABLED and get_backend().cacheable else False
+        self.store = store or None
+        self.store_hits = 0
+
+        self.records = []
+        self.hop_of = {}
+        self._tx_seen = set()
+
+    def _add(self, tx_list):
+        """처음 보는 tx 의 레코드만 추가 (레코드 예산을 넘기면 그 앞까지) — 예산이 찼으면 False"""
+        # tx 하나의 레코드는 어느 주소 히스토리에서 왔든 같으므로 tx 단위로 한 번만
+        seen = self._tx_seen
+        fresh = [tx for tx in tx_list if tx.get('tx_hash') not in seen]
+        seen.update(tx.get('tx_hash') for tx in fresh)
+        room = self.max_txs - len(self.records)
+        self.records.extend(fresh[:max(room, 0)])
+        return len(fresh) <= room
+
+    def _neighbors(self, records, frontier):
+        """frontier 주소들의 이웃 후보를 거래량 순으로 (주소당 fanout 개, 이미 조회한 주소 제외)"""
+        frame = TxFrame(records)
+        local = {a: i for i, a in enumerate(frame.addresses)}
+        frontier_ids = np.array([local[a] for a in frontier if a in local], dtype=np.int64)
+        pairs = []
+        if self.direction in ("out", "both"):
+            pairs.append((frame.from_ids, frame.to_ids))
+        if self.direction in ("in", "both"):
+            pairs.append((frame.to_ids, frame.from_ids))
+
+        src = np.concatenate([p[0] for p in pairs]).astype(np.int64)
+        dst = np.concatenate([p[1] for p in pairs]).astype(np.int64)
+        amounts = np.concatenate([frame.amounts] * len(pairs))
+        mask = np.isin(src, frontier_ids) & (dst >= 0) & (src != dst)
+        if not mask.any():
+            return []
+        keys, inverse = np.unique(src[mask] * len(frame.addresses) + dst[mask], return_inverse=True)
+        volume = np.bincount(inverse, weights=amounts[mask])
+        key_src, key_dst = keys // len(frame.addresses), keys % len(frame.addresses)
+
+        # 주소마다 거래량 상위 fanout 개
+        order = np.lexsort((-volume, key_src))
+        rank = np.arange(len(order)) - np.searchsorted(key_src[order], key_src[order])
+        chosen = order[rank < self.fanout]
+        best = {}
+        for i in chosen[np.argsort(-volume[chosen], kind="stable")].tolist():
+            address = frame.addresses[key_dst[i]]
+            if address != UNKNOWN_ADDRESS and address not in self.hop_of:
+                best.setdefault(address, volume[i])
+        return list(best)
+
+    def _stored(self, address, min_txs):
+        """저장소에 유효한 히스토리가 min_txs 개 상한 이상으로 있으면 그 레코드 (없으면 None)"""
+        if self.store is None:
+            return None
+        records = self.store.neighborhood(address, min_txs=min_txs)
+        if records is not None:
+            self.store_hits += 1
+        return records
+
+    async def _fetch_hop(self, addresses, hop):
+        errors = {}
+        remote = []
+        for address in addresses:
+            records = self._stored(address, self.txs_per_address)
+            if records is None:
+                remote.append(address)
+                continue
+            self.hop_of[address] = hop
+            if not self._add(records):
+                return errors, "max_txs"
+
+        async for address, tx_list, error in fetch_many(remote, self.concurrency, max_txs=self.txs_per_address):
+            self.hop_of[address] = hop
+            if error:
+                errors[address] = error
+            elif self.store is not None:
+                self.store.append(address, tx_list, max_txs=self.txs_per_address)
+            if not self._add(tx_list):
+                # 레코드 예산이 참 — 남은 조회는 fetch_many 를 닫으면서 취소
+                return errors, "max_txs"
+        return errors, None
+
+    def run(self):
+        """hop 이 끝날 때마다 HopResult 를 내보내는 제너레이터"""
+        tx_list = self.tx_list
+        errors = {}
+        if tx_list is None:
+            # 시작 주소는 분석과 같은 상한(MEMPOOL_MAX_TXS)만큼 필요 — 이웃으로 잘려 저장된 히스토리로는 부족
+            tx_list = self._stored(self.source, MEMPOOL_MAX_TXS)
+        if tx_list is None:
+            raw = get_transaction_data(self.source, mode="premium")
+            if isinstance(raw, dict) and raw.get("error"):
+                errors[self.source] = raw["error"]
+                tx_list = []
+            else:
+                tx_list = parse_mempool_transactions(raw)
+                if self.store is not None:
+                    self.store.append(self.source, tx_list, max_txs=MEMPOOL_MAX_TXS)
+        elif self.store is not None and self.tx_list is not None:
+            # 앱에서 이미 가져온 시작 주소 목록도 다음 분석을 위해 저장
+            self.store.append(self.source, tx_list, max_txs=MEMPOOL_MAX_TXS)
+        self.hop_of[self.source] = 0
+        exhausted = None if self._add(tx_list) else "max_txs"
+        hop, frontier = 0, [self.source]
+
+        while True:
+            # 다음 hop 주소를 미리 정해 두고 이번 hop 결과에 멈춘 이유를 같이 실어 보냄
+            following = []
+            if not exhausted and hop < self.max_hops:
+                room = self.max_addresses - (len(self.hop_of) - 1)
+                if room <= 0:
+                    exhausted = "max_addresses"
+                else:
+                    following = self._neighbors(self.records, frontier)[:min(self.max_per_hop, room)]
+                    exhausted = None if following else "no_neighbors"
+            yield HopResult(hop, list(self.records), frontier, errors, dict(self.hop_of), exhausted)
+            if not following:
+                return
+
+            hop, frontier = hop + 1, following
+            before, hits = len(self.records), self.store_hits
+            errors, exhausted = asyncio.run(self._fetch_hop(frontier, hop))
+            log(f"🌐 hop {hop}: {len(frontier)} addresses ({len(errors)} errors, {self.store_hits - hits} from store), "
+                f"+{len(self.records) - before} records, total {len(self.records)}")
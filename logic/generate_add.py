@@ -1,7 +1,9 @@
-import requests
-import time
 import pandas as pd
 import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from api.transport import http_get
 
 # 파일 경로 설정
 input_path = "/Users/yujin/Desktop/BitcoinTrace/lens/btc-anomaly-lens/data/selected_addresses.csv"  # 너가 사용 중인 파일
@@ -32,7 +34,7 @@ for i, row in df.iterrows():
 
     try:
         url = f"https://mempool.space/api/address/{addr}/txs"
-        res = requests.get(url)
+        res = http_get(url)
         if res.status_code != 200:
             print(f"❌ Failed to fetch: {res.status_code}")
             continue
@@ -72,6 +74,4 @@ for i, row in df.iterrows():
     except Exception as e:
         print(f"Error: {addr} → {e}")
 
-    time.sleep(1.0)  # 요청 간격 (필요시 조정)
-
 print(f"\n✅ 작업 완료. 결과 저장: {output_path}")
@@ -1,3 +1,6 @@
+import os
+
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
@@ -5,196 +8,278 @@ from io import BytesIO
 import base64
 from collections import deque
 
-def generate_transaction_network(tx_list, max_hops=3, top_n=15, source_address=None):
+from dotenv import load_dotenv
+
+from logic.layout import get_layout_cache
+from logic.txgraph import as_graph
+
+load_dotenv()
+
+# 노드 수 슬라이더 상한 — 앱 화면은 WebGL(ui.network)이라 수천 개도 그림
+NETWORK_MAX_NODES = int(os.getenv("NETWORK_MAX_NODES", "2000"))
+# 노드 역할별 색 (빨강 = 소스, 청록 = 수신, 파랑 = 중간) — PNG 와 ui.network 가 같이 씀
+NODE_COLORS = {'source': '#FF6B6B', 'recipient': '#4ECDC4', 'intermediate': '#45B7D1'}
+
+
+def resolve_source(graph, source_address=None):
     """
-    트랜잭션 네트워크를 생성하고 시각화합니다.
-    Args:
-        tx_list: 트랜잭션 리스트
-        max_hops: 최대 hop 수 (1-10 범위)
-        top_n: 표시할 최대 노드 수
-        source_address: 소스 주소 (None이면 tx_list[0]['from'] 사용)
+    시작 주소 결정 (지정한 주소에서 나가는 거래가 없으면 그 주소로 들어온 첫 거래의 보낸 주소,
+    그것도 없으면 첫 트랜잭션의 보낸 주소)
     """
-    if not tx_list:
-        return None
-
-    # 사용자가 지정한 주소가 있으면 그걸 source로, 없으면 tx_list[0]['from']
+    frame = graph.frame
     if source_address is None:
-        source_address = tx_list[0].get('from', 'source')
+        print(f"⚠️ Source address is None, using first transaction's from")
+        source_address = frame.sender(0) or 'source'
 
-    print(f"🔍 Source address: {source_address}")
-    print(f"🔍 Max hops: {max_hops}")
-
-    # 트랜잭션 인덱싱: from_addr -> [tx, ...]
-    from_index = {}
-    for tx in tx_list:
-        from_addr = tx.get('from')
-        if from_addr:
-            from_index.setdefault(from_addr, []).append(tx)
-
-    print(f"🔍 Available from addresses: {len(from_index)}")
-    print(f"🔍 Source in from_index: {source_address in from_index}")
-
-    # source_address가 None이거나 from_index에 없으면, 해당 주소로 들어오는 트랜잭션을 찾아서 시작점으로 사용
-    if source_address is None or source_address not in from_index:
-        if source_address is None:
-            print(f"⚠️ Source address is None, using first transaction's from")
-            source_address = tx_list[0].get('from', 'source')
+    node = graph.node_id(source_address)
+    print(f"🔍 Available from addresses: {np.count_nonzero(np.diff(graph.out_offsets))}")
+    print(f"🔍 Source in from_index: {node >= 0 and graph.out_degree(node) > 0}")
+    if node < 0 or graph.out_degree(node) == 0:
+        print(f"⚠️ Source address '{source_address}' not found in from_index")
+        row = graph.first_incoming_row(node) if node >= 0 else -1
+        if row >= 0 and frame.sender(row) is not None:
+            source_address = frame.sender(row)
+            print(f"🔍 Using new source: {source_address} (from incoming transaction)")
         else:
-            print(f"⚠️ Source address '{source_address}' not found in from_index")
-            # 해당 주소로 들어오는 트랜잭션 찾기
-            incoming_txs = [tx for tx in tx_list if tx.get('to') == source_address]
-            if incoming_txs:
-                # 첫 번째 incoming 트랜잭션의 from을 새로운 source로 사용
-                new_source = incoming_txs[0].get('from')
-                print(f"🔍 Using new source: {new_source} (from incoming transaction)")
-                if new_source is not None:
-                    source_address = new_source
-                else:
-                    print(f"⚠️ New source is None, using first transaction's from")
-                    source_address = tx_list[0].get('from', 'source')
-            else:
-                print(f"⚠️ No incoming transactions found for '{source_address}', using first transaction's from")
-                source_address = tx_list[0].get('from', 'source')
-    
+            print(f"⚠️ No outgoing/incoming transactions for '{source_address}', using first transaction's from")
+            source_address = frame.sender(0) or 'source'
+
     # 최종적으로 source_address가 None이면 안전한 기본값 사용
     if source_address is None:
         print(f"⚠️ Final source_address is None, using 'source' as default")
         source_address = 'source'
+    return source_address
 
-    G = nx.DiGraph()
-    G.add_node(source_address)
 
-    # BFS로 hop만큼만 따라가며 그래프 확장
-    queue = deque([(source_address, 0)])
-    visited = set([source_address])
-    edge_set = set()
-    
-    nodes_at_hop = {0: [source_address]}  # hop별 노드 추적
+def _add_extra_connections(graph, current, visited, edges, limit):
+    """
+    첫 hop 에서 더 많은 연결을 보여주기 위해, 시작 노드와 무관한 다른 거래들을 레코드 순서대로 추가
+    (새 노드가 limit 개가 될 때까지 — 전체 레코드를 한 번에 배열로 판정)
+    """
+    from_ids, to_ids = graph.frame.from_ids, graph.frame.to_ids
+    rows = np.flatnonzero((from_ids >= 0) & (to_ids >= 0) & (from_ids != current) & (to_ids != current))
+    if not len(rows):
+        return 0
+    # 레코드마다 (보낸, 받은) 순서로 처음 나오고 아직 방문하지 않은 노드가 새 노드
+    seq = np.stack([from_ids[rows], to_ids[rows]], axis=1).ravel()
+    first = np.zeros(len(seq), dtype=bool)
+    first[np.unique(seq, return_index=True)[1]] = True
+    new = first & ~np.isin(seq, np.fromiter(visited, dtype=np.int64, count=len(visited)))
+    per_row = new.reshape(-1, 2).sum(axis=1)
+    # 새 노드 수가 limit 에 닿기 전에 시작한 레코드까지만
+    taken = np.count_nonzero(np.cumsum(per_row) - per_row < limit)
+    for node in seq[:2 * taken][new[:2 * taken]].tolist():
+        visited[node] = 1
+
+    pair_keys = from_ids[rows[:taken]].astype(np.int64) * graph.n_nodes + to_ids[rows[:taken]]
+    _, first_pairs = np.unique(pair_keys, return_index=True)
+    for i in np.sort(first_pairs).tolist():
+        row = int(rows[i])
+        edges.setdefault((int(from_ids[row]), int(to_ids[row])), row)
+    return int(new[:2 * taken].sum())
+
+
+def expand_network(graph, source, max_hops):
+    """
+    source 노드에서 hop 만큼 BFS. 노드마다 금액 상위 min(max_hops * 5, 20) 개 거래만 따라감
+    반환: ({노드: hop} 방문 순서, {(보낸, 받은): 첫 레코드 위치} 추가 순서)
+    """
+    visited = {source: 0}
+    edges = {}
+    queue = deque([(source, 0)])
+    # hop 수에 따라 더 많은 연결을 보여주기
+    max_connections_per_hop = min(max_hops * 5, 20)
 
     while queue:
         current, depth = queue.popleft()
-        print(f"🔍 Processing {current} at depth {depth}")
-        
         if depth >= max_hops:
             continue
-            
-        # 현재 노드에서 출발하는 트랜잭션들 찾기
-        outgoing_txs = from_index.get(current, [])
-        print(f"🔍 Found {len(outgoing_txs)} outgoing transactions from {current}")
-        
-        # hop 수에 따라 더 많은 연결을 보여주기
-        max_connections_per_hop = min(max_hops * 5, 20)  # hop 수에 비례하여 연결 수 증가
-        if len(outgoing_txs) > max_connections_per_hop:
-            # 거래량 기준으로 정렬하여 중요한 트랜잭션 우선
-            outgoing_txs = sorted(outgoing_txs, key=lambda x: x.get('amount', 0), reverse=True)[:max_connections_per_hop]
-            print(f"🔍 Selected top {max_connections_per_hop} transactions for hop {depth + 1}")
-        
-        for tx in outgoing_txs:
-            to_addr = tx.get('to')
-            if to_addr:
-                G.add_node(to_addr)
-                # 중복 엣지 방지
-                if (current, to_addr) not in edge_set:
-                    G.add_edge(current, to_addr, weight=tx.get('amount', 0),
-                               tx_hash=tx.get('tx_hash', ''),
-                               timestamp=tx.get('timestamp', ''))
-                    edge_set.add((current, to_addr))
-                    
-                if to_addr not in visited:
-                    visited.add(to_addr)
-                    queue.append((to_addr, depth + 1))
-                    
-                    # hop별 노드 추적
-                    if depth + 1 not in nodes_at_hop:
-                        nodes_at_hop[depth + 1] = []
-                    nodes_at_hop[depth + 1].append(to_addr)
-        
+
+        targets, weights, rows = graph.out_edges(current)
+        if len(rows) > max_connections_per_hop:
+            # 거래량 기준으로 정렬하여 중요한 트랜잭션 우선 (같은 금액이면 레코드 순서)
+            top = np.argsort(-weights, kind='stable')[:max_connections_per_hop]
+            targets, rows = targets[top], rows[top]
+
+        for to_node, row in zip(targets.tolist(), rows.tolist()):
+            if to_node < 0:
+                continue
+            # 중복 엣지 방지
+            edges.setdefault((current, to_node), row)
+            if to_node not in visited:
+                visited[to_node] = depth + 1
+                queue.append((to_node, depth + 1))
+
         # 더 많은 hop 확장을 위해 추가 연결 찾기
-        if depth == 0 and len(outgoing_txs) > 0:
-            # 첫 번째 hop에서 더 많은 연결을 찾기 위해 다른 주소들도 추가
-            print(f"🔍 Expanding network with additional connections...")
-            additional_connections = 0
-            
-            # 전체 트랜잭션에서 다른 주소들 찾기
-            for tx in tx_list:
-                if additional_connections >= max_hops * 3:  # 최대 추가 연결 수 제한
-                    break
-                    
-                from_addr = tx.get('from')
-                to_addr = tx.get('to')
-                
-                if from_addr and to_addr and from_addr != current and to_addr != current:
-                    # 새로운 연결 추가
-                    if from_addr not in visited:
-                        G.add_node(from_addr)
-                        visited.add(from_addr)
-                        additional_connections += 1
-                        
-                        if 1 not in nodes_at_hop:
-                            nodes_at_hop[1] = []
-                        nodes_at_hop[1].append(from_addr)
-                    
-                    if to_addr not in visited:
-                        G.add_node(to_addr)
-                        visited.add(to_addr)
-                        additional_connections += 1
-                        
-                        if 1 not in nodes_at_hop:
-                            nodes_at_hop[1] = []
-                        nodes_at_hop[1].append(to_addr)
-                    
-                    # 엣지 추가
-                    if (from_addr, to_addr) not in edge_set:
-                        G.add_edge(from_addr, to_addr, weight=tx.get('amount', 0),
-                                   tx_hash=tx.get('tx_hash', ''),
-                                   timestamp=tx.get('timestamp', ''))
-                        edge_set.add((from_addr, to_addr))
-            
-            print(f"🔍 Added {additional_connections} additional connections")
-
-    print(f"🔍 Final network: {len(G.nodes())} nodes, {len(G.edges())} edges")
-    for hop, nodes in nodes_at_hop.items():
-        print(f"🔍 Hop {hop}: {len(nodes)} nodes")
+        if depth == 0 and len(rows) > 0:
+            added = _add_extra_connections(graph, current, visited, edges, max_hops * 3)
+            print(f"🔍 Added {added} additional connections")
+    return visited, edges
+
+
+def _select_subgraph(graph, visited, edges, source, top_n):
+    """
+    중요도(연결 수, 유입 거래량) 상위 top_n 노드만 고른 서브그래프 배열
+        nodes(주소) / hop          노드별
+        src / dst(nodes 번호) / weight / tx_hash / timestamp   엣지별 (같은 주소 쌍은 첫 레코드 하나)
+    """
+    nodes = np.fromiter(visited, dtype=np.int64, count=len(visited))
+    local = np.full(graph.n_nodes, -1, dtype=np.int64)
+    local[nodes] = np.arange(len(nodes))
+    pairs = np.array(list(edges), dtype=np.int64).reshape(-1, 2)
+    edge_rows = np.fromiter(edges.values(), dtype=np.int64, count=len(edges))
+    weights = graph.frame.amounts[edge_rows]
+    src, dst = local[pairs[:, 0]], local[pairs[:, 1]]
+
+    # 노드 중요도 계산 (연결 수, 거래량 기준)
+    degree = np.bincount(src, minlength=len(nodes)) + np.bincount(dst, minlength=len(nodes))
+    volume = np.bincount(dst, weights=weights, minlength=len(nodes))
+    importance = degree * 0.5 + volume * 0.01
+    importance[local[source]] = np.inf  # 소스 노드는 최우선
+    keep = np.zeros(len(nodes), dtype=bool)
+    keep[np.argsort(-importance, kind='stable')[:top_n]] = True
+
+    # 남은 노드를 방문 순서대로 다시 번호 매김
+    kept = np.cumsum(keep) - 1
+    hop_of = np.fromiter(visited.values(), dtype=np.int64, count=len(visited))
+    edge_keep = np.flatnonzero(keep[src] & keep[dst])
+    addresses = graph.addresses
+    frame = graph.frame
+    rows = edge_rows[edge_keep]
+    return {
+        'nodes': [addresses[n] for n in nodes[keep].tolist()],
+        'hop': hop_of[keep],
+        'src': kept[src[edge_keep]],
+        'dst': kept[dst[edge_keep]],
+        'weight': weights[edge_keep],
+        'tx_hash': [frame.tx_hashes[t] for t in frame.tx_ids[rows].tolist()],
+        'timestamp': frame.timestamps(rows),
+    }
+
+
+def _single_node(address):
+    empty = np.zeros(0, dtype=np.int64)
+    return {'nodes': [address], 'hop': np.zeros(1, dtype=np.int64), 'src': empty, 'dst': empty,
+            'weight': np.zeros(0, dtype=np.float64), 'tx_hash': [], 'timestamp': []}
+
+
+def _node_roles(sub, source_address):
+    """source / recipient (들어온 연결이 더 많음) / intermediate — 노드별 리스트"""
+    n = len(sub['nodes'])
+    incoming = np.bincount(sub['dst'], minlength=n)
+    outgoing = np.bincount(sub['src'], minlength=n)
+    roles = np.where(incoming > outgoing, 'recipient', 'intermediate').astype(object)
+    roles[[i for i, node in enumerate(sub['nodes']) if node == source_address]] = 'source'
+    return roles.tolist(), incoming + outgoing
+
+
+def _network_subgraph(tx_list, max_hops, top_n, source_address):
+    """그릴 서브그래프 배열과 배치 — (source_address, 전체 노드 수, 서브그래프, {노드: (x, y)}), 거래가 없으면 None"""
+    graph = as_graph(tx_list) if tx_list is not None else None
+    if graph is None or not len(graph.frame):
+        return None
+
+    source_address = resolve_source(graph, source_address)
+    print(f"🔍 Source address: {source_address}")
+    print(f"🔍 Max hops: {max_hops}")
+
+    source = graph.node_id(source_address)
+    if source >= 0:
+        visited, edges = expand_network(graph, source, max_hops)
+    else:
+        visited, edges = {}, {}
+    total_nodes = max(len(visited), 1)
+
+    print(f"🔍 Final network: {total_nodes} nodes, {len(edges)} edges")
+    hops = np.bincount(np.fromiter(visited.values(), dtype=np.int64, count=len(visited)))
+    for hop, count in enumerate(hops.tolist()):
+        print(f"🔍 Hop {hop}: {count} nodes")
 
     # hop 수에 따라 동적으로 노드 수 조절
-    dynamic_top_n = min(top_n, len(G.nodes()))
+    dynamic_top_n = min(top_n, total_nodes)
     if max_hops > 3:
-        dynamic_top_n = min(dynamic_top_n + max_hops * 2, len(G.nodes()))
-    
-    print(f"🔍 Selected {dynamic_top_n} nodes for visualization (dynamic top_n: {dynamic_top_n})")
+        dynamic_top_n = min(dynamic_top_n + max_hops * 2, total_nodes)
 
-    # 노드 중요도 계산 (연결 수, 거래량 기준)
-    node_importance = {}
-    for node in G.nodes():
-        if node == source_address:
-            node_importance[node] = float('inf')  # 소스 노드는 최우선
-        else:
-            in_degree = len(list(G.predecessors(node)))
-            out_degree = len(list(G.successors(node)))
-            total_volume = sum(G[u][node]['weight'] for u in G.predecessors(node)) if list(G.predecessors(node)) else 0
-            node_importance[node] = (in_degree + out_degree) * 0.5 + total_volume * 0.01
+    print(f"🔍 Selected {dynamic_top_n} nodes for visualization (dynamic top_n: {dynamic_top_n})")
 
-    # 중요도 순으로 노드 선택
-    sorted_nodes = sorted(node_importance.items(), key=lambda x: x[1], reverse=True)
-    selected_nodes = [node for node, _ in sorted_nodes[:dynamic_top_n]]
+    # 서브그래프 선택 (배열 연산만 — networkx 는 PNG 를 그릴 때만)
+    if visited:
+        subgraph = _select_subgraph(graph, visited, edges, source, dynamic_top_n)
+    else:
+        subgraph = _single_node(source_address)
+    nodes = subgraph['nodes']
 
-    # 서브그래프 생성
-    subgraph = G.subgraph(selected_nodes).copy()
-    
-    print(f"🔍 Subgraph: {len(subgraph.nodes())} nodes, {len(subgraph.edges())} edges")
+    print(f"🔍 Subgraph: {len(nodes)} nodes, {len(subgraph['src'])} edges")
 
-    # 시각화
-    plt.figure(figsize=(14, 10))
-    
     # 노드가 1개인 경우 특별 처리
-    if len(subgraph.nodes()) == 1:
-        pos = {list(subgraph.nodes())[0]: (0.5, 0.5)}
-    elif len(subgraph.nodes()) == 2:
+    if len(nodes) == 1:
+        pos = {nodes[0]: (0.5, 0.5)}
+    elif len(nodes) == 2:
         # 2개 노드인 경우 좌우로 배치
-        nodes_list = list(subgraph.nodes())
-        pos = {nodes_list[0]: (0.2, 0.5), nodes_list[1]: (0.8, 0.5)}
+        pos = {nodes[0]: (0.2, 0.5), nodes[1]: (0.8, 0.5)}
     else:
-        pos = nx.spring_layout(subgraph, k=3.0, iterations=150, seed=42)
+        # 노드/엣지 집합별 캐시 + 이전 위치에서 이어서 배치 (슬라이더를 바꿔도 남은 노드는 제자리)
+        edge_list = [(nodes[u], nodes[v]) for u, v in zip(subgraph['src'].tolist(), subgraph['dst'].tolist())]
+        pos = get_layout_cache().layout(nodes, edge_list, scope=source_address, k=3.0, iterations=150)
+    return source_address, total_nodes, subgraph, pos
+
+
+def build_network_view(tx_list, max_hops=3, top_n=15, source_address=None):
+    """
+    브라우저 쪽 렌더러(ui.network)에 넘길 네트워크 배열 — 서버는 선택/배치까지만, 그리기는 클라이언트(WebGL)에서
+        nodes / x / y / role / hop / degree     노드별 (같은 순서)
+        src / dst                               엣지 끝점의 nodes 번호
+        weight / tx_hash / timestamp            엣지별 속성
+    거래가 없으면 None
+    """
+    network = _network_subgraph(tx_list, max_hops, top_n, source_address)
+    if network is None:
+        return None
+    source_address, total_nodes, subgraph, pos = network
+
+    nodes = subgraph['nodes']
+    roles, degree = _node_roles(subgraph, source_address)
+    return {
+        'source': source_address,
+        'max_hops': max_hops,
+        'total_nodes': total_nodes,
+        'nodes': nodes,
+        'x': [float(pos[node][0]) for node in nodes],
+        'y': [float(pos[node][1]) for node in nodes],
+        'role': roles,
+        'hop': subgraph['hop'].tolist(),
+        'degree': degree.tolist(),
+        'src': subgraph['src'].tolist(),
+        'dst': subgraph['dst'].tolist(),
+        'weight': subgraph['weight'].astype(float).tolist(),
+        'tx_hash': subgraph['tx_hash'],
+        'timestamp': subgraph['timestamp'],
+    }
+
+
+def generate_transaction_network(tx_list, max_hops=3, top_n=15, source_address=None):
+    """
+    트랜잭션 네트워크를 생성하고 시각화합니다. (matplotlib PNG base64 — 앱 화면은 build_network_view + ui.network)
+    Args:
+        tx_list: 트랜잭션 리스트 (또는 분석마다 한 번 만든 TxFrame / TxGraph)
+        max_hops: 최대 hop 수 (1-10 범위)
+        top_n: 표시할 최대 노드 수
+        source_address: 소스 주소 (None이면 tx_list[0]['from'] 사용)
+    """
+    network = _network_subgraph(tx_list, max_hops, top_n, source_address)
+    if network is None:
+        return None
+    source_address, total_nodes, selected, pos = network
+    nodes = selected['nodes']
+    roles = dict(zip(nodes, _node_roles(selected, source_address)[0]))
+    # nx.draw 용 그래프는 PNG 에서만 (그릴 노드 수만큼 작음)
+    subgraph = nx.DiGraph()
+    subgraph.add_nodes_from(nodes)
+    subgraph.add_edges_from((nodes[u], nodes[v], {'weight': float(w)}) for u, v, w in
+                            zip(selected['src'].tolist(), selected['dst'].tolist(), selected['weight'].tolist()))
+
+    # 시각화
+    plt.figure(figsize=(14, 10))
 
     node_colors = []
     node_sizes = []
@@ -205,18 +290,9 @@ def generate_transaction_network(tx_list, max_hops=3, top_n=15, source_address=N
         short_label = node[:8] + "..." if len(node) > 8 else node
         node_labels[node] = short_label
         
-        if node == source_address:
-            node_colors.append('#FF6B6B')  # 빨간색 (소스)
-            node_sizes.append(2000)
-        else:
-            pred_count = len(list(subgraph.predecessors(node)))
-            succ_count = len(list(subgraph.successors(node)))
-            if pred_count > succ_count:
-                node_colors.append('#4ECDC4')  # 청록색 (수신)
-                node_sizes.append(1200)
-            else:
-                node_colors.append('#45B7D1')  # 파란색 (중간)
-                node_sizes.append(1000)
+        role = roles[node]
+        node_colors.append(NODE_COLORS[role])
+        node_sizes.append({'source': 2000, 'recipient': 1200, 'intermediate': 1000}[role])
 
     edge_colors = []
     edge_widths = []
@@ -264,7 +340,7 @@ def generate_transaction_network(tx_list, max_hops=3, top_n=15, source_address=N
                markersize=10, label='Intermediate Addresses')
     ]
     plt.legend(handles=legend_elements, loc='upper right', fontsize=12)
-    plt.title(f"Transaction Network Visualization\n(Max Hops: {max_hops}, Total Nodes: {len(G.nodes())}, Displayed: {len(subgraph.nodes())}, Edges: {len(subgraph.edges())})", 
+    plt.title(f"Transaction Network Visualization\n(Max Hops: {max_hops}, Total Nodes: {total_nodes}, Displayed: {len(subgraph.nodes())}, Edges: {len(subgraph.edges())})", 
               fontsize=14, fontweight='bold', pad=20)
     plt.tight_layout()
 
@@ -275,63 +351,25 @@ def generate_transaction_network(tx_list, max_hops=3, top_n=15, source_address=N
     plt.close()
     return encoded_img
 
+
 def get_network_stats(tx_list, max_hops=3):
     """
-    네트워크 통계를 계산합니다.
+    네트워크 통계를 계산합니다. (tx_list 대신 분석마다 한 번 만든 TxGraph 를 넘기면 재사용)
     """
-    if not tx_list:
+    graph = as_graph(tx_list) if tx_list is not None else None
+    if graph is None or not len(graph.frame):
         return None
-    
-    # 트랜잭션 인덱싱
-    from_index = {}
-    for tx in tx_list:
-        from_addr = tx.get('from')
-        if from_addr:
-            from_index.setdefault(from_addr, []).append(tx)
-    
-    # 실제 네트워크 노드 수 계산
-    all_nodes = set()
-    for tx in tx_list:
-        if tx.get('from'):
-            all_nodes.add(tx.get('from'))
-        if tx.get('to'):
-            all_nodes.add(tx.get('to'))
-    
-    actual_node_count = len(all_nodes)
-    
-    return {
-        'total_nodes': actual_node_count,
-        'total_edges': len(tx_list),
-        'unique_recipients': len(set(tx.get('to') for tx in tx_list if tx.get('to'))),
-        'total_volume': sum(tx.get('amount', 0) for tx in tx_list),
-        'max_available_nodes': actual_node_count
-    }
+    return graph.stats()
 
 def get_max_available_nodes(tx_list, max_hops=3):
     """
     현재 설정에서 사용 가능한 최대 노드 수를 계산합니다.
     """
-    if not tx_list:
+    graph = as_graph(tx_list) if tx_list is not None else None
+    if graph is None or not len(graph.frame):
         return 15  # 기본값
-    
-    # 트랜잭션 인덱싱
-    from_index = {}
-    for tx in tx_list:
-        from_addr = tx.get('from')
-        if from_addr:
-            from_index.setdefault(from_addr, []).append(tx)
-    
-    # 실제 네트워크 노드 수 계산
-    all_nodes = set()
-    for tx in tx_list:
-        if tx.get('from'):
-            all_nodes.add(tx.get('from'))
-        if tx.get('to'):
-            all_nodes.add(tx.get('to'))
-    
-    actual_node_count = len(all_nodes)
-    
+
     # hop 수에 따라 동적으로 조정
-    max_available = min(actual_node_count, 50)  # 최대 50개로 제한
-    
+    max_available = min(len(graph), NETWORK_MAX_NODES)
+
     return max_available
@@ -0,0 +1,478 @@
+import base64
+import heapq
+import json
+import zlib
+
+import numpy as np
+
+from api.address_ids import get_address_table
+from api.cache import get_cache
+from logic.detection import (
+    BRIDGE_SPLIT_MIN_MAX,
+    BRIDGE_SPLIT_RATIO,
+    LARGE_TX_AMOUNT,
+    RAPID_INTERVAL_SECONDS,
+    REPEATED_RECEIVER_MIN,
+    abnormal_gap_mask,
+    amount_anomaly_score,
+    blacklist_score,
+    cross_chain_detection_score,
+    interval_anomaly_score,
+    money_laundering_risk_score,
+    mixer_detection_score,
+    outlier_threshold,
+    repeated_address_score,
+    score_blacklist,
+    score_cross_chain,
+    score_intervals,
+    score_laundering,
+    score_mixer,
+    score_outliers,
+    score_repeated_receivers,
+    score_time_gaps,
+    short_interval_mask,
+    time_gap_anomaly_score,
+    tx_io_counts,
+)
+from logic.labels import get_label_index
+from logic.scoring import AnomalyScores
+from logic.sketch import HeavyHitters, KLLSketch
+from logic.txframe import TxFrame, as_frame
+
+# 증분 재채점
+# 감시 주소는 블록마다 다시 확인하는데, 매번 전체 히스토리로 탐지 8개를 다시 돌리지 않도록
+# 탐지에 필요한 요약(간격 개수, 빈도 요약, 금액 스케치, 분산 누적값 등)만 상태로 들고 있다가
+# 새 블록의 tx 만 update() 로 더함 — 비용은 새 tx 수에 비례 (O(new))
+# 기준값과 점수 규칙은 logic.detection 의 것을 그대로 씀 (여기서는 상태에서 지표 개수만 뽑음)
+# 상태 크기는 히스토리 길이와 무관하게 상한이 있음 (주소 캐시에 저장/복원하는 비용도 일정)
+# 결과는 "기존 tx + 새 tx" 를 이어 붙인 리스트로 전체 재계산한 것과 같음. 단, 요약이 가득 찬 뒤에는
+#   - 금액 이상치의 Q1/Q3 는 KLL 스케치 추정값 (값이 DEFAULT_K 개 이하인 동안은 정확히 같음)
+#   - 반복 수신 주소/반복 금액은 HeavyHitters 하한 횟수 (키 종류가 HEAVY_HITTERS_K 개 이하인 동안은 정확히 같음)
+#   - 짧은 간격/이상 간격 목록은 최근 INTERVAL_KEEP 개만 (점수는 전체 개수로 계산)
+
+# 금액 이상치 목록용으로 들고 있는 상위 금액 수 (점수는 이상치 5개에서 포화되므로 충분)
+OUTLIER_KEEP = 64
+# 짧은 간격/이상 간격 목록에 남겨 두는 최근 값 수
+INTERVAL_KEEP = 128
+# 주소 캐시(api.cache address_state)에 저장할 때의 이름과 형식 버전
+STATE_NAME = "detector_state"
+STATE_VERSION = 3
+
+
+def _merge_smallest(a, b, k=2):
+    return sorted(a + b)[:k]
+
+
+class DetectorState:
+    """
+    탐지 8개의 병합 가능한 상태
+        update(tx_list)   새 tx(행) 를 시간순으로 뒤에 추가
+        unseen(tx_list)   tx_list 중 아직 넣지 않은 confirmed 행 (블록 높이 기준, update 전에 거르는 용도)
+        merge(other)      other 가 self 다음 구간인 상태를 합침 (샤드별로 만든 상태 결합)
+        results()         scoring.AnomalyScores.results() 와 같은 키의 결과
+        to_bytes() / from_bytes()  주소 캐시 저장용 직렬화 (크기는 히스토리 길이와 무관하게 상한이 있음)
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        # 시간 간격 (유효한 block_time 끼리, 입력 순서)
+        self.first_time = None
+        self.last_time = None
+        # 이미 넣은 행의 기준 (block_time 은 MTP 규칙상 블록 순서대로 증가하지 않으므로 높이로 판단)
+        self.last_height = None
+        self.tail_hashes = set()       # last_height 블록에 있던 tx (같은 블록의 tx 를 두 번 넣지 않도록)
+        self.all_valid = True
+        self.n_intervals = 0
+        self.n_short = 0               # 짧은 간격 (interval)
+        self.n_abnormal = 0            # 이상 간격 (time gap)
+        self.short_intervals = []      # 최근 INTERVAL_KEEP 개
+        self.abnormal_gaps = []
+        self.rapid_intervals = 0       # 빠른 연속 간격 (mixer)
+        # 금액 ('amount' 가 있는 행 — IQR 이상치)
+        self.amount_sketch = KLLSketch()
+        self.top_amounts = []          # (금액, 행 번호) 최소 힙, 상위 OUTLIER_KEEP 개
+        # 금액 (모든 행, 없으면 0 — mixer/bridge/세탁 위험도)
+        self.amount_counts = HeavyHitters()
+        self.amount_mean = 0.0
+        self.amount_m2 = 0.0
+        self.max_amount = None
+        self.smallest_positive = []    # 가장 작은 양수 금액 2개
+        self.large_txs = 0             # 대용량 tx
+        # 수신 주소 빈도 요약 (순서 값 = 처음 나온 행 번호)
+        self.receivers = HeavyHitters()
+        # tx 단위
+        self.multi_io_count = 0
+        self.coinjoin_count = 0
+        # 라벨 매칭 {주소: 라벨} — 수신 주소가 처음 들어올 때 확인 (빈도 요약에서 빠져도 남음)
+        # 라벨 목록이 다시 로드되면 요약에 있는 수신 주소와 기존 매칭 주소를 다시 확인
+        self.label_hits = {"blacklist": {}, "mixer": {}, "bridge": {}}
+        self._label_version = None
+
+    @classmethod
+    def from_transactions(cls, tx_list):
+        return cls().update(tx_list)
+
+    # ---- 갱신 ----
+
+    def _add_intervals(self, intervals):
+        if not len(intervals):
+            return
+        self.n_intervals += len(intervals)
+        short = intervals[short_interval_mask(intervals)]
+        abnormal = intervals[abnormal_gap_mask(intervals)]
+        self.n_short += len(short)
+        self.n_abnormal += len(abnormal)
+        self.short_intervals = (self.short_intervals + short[-INTERVAL_KEEP:].astype(float).tolist())[-INTERVAL_KEEP:]
+        self.abnormal_gaps = (self.abnormal_gaps + abnormal[-INTERVAL_KEEP:].astype(float).tolist())[-INTERVAL_KEEP:]
+        self.rapid_intervals += int(np.count_nonzero(intervals < RAPID_INTERVAL_SECONDS))
+
+    def _add_amount_moments(self, count, mean, m2):
+        # 분산 누적값 병합 (Chan et al.) — self.n_rows 는 아직 더하기 전 행 수
+        if not count:
+            return
+        total = self.n_rows + count
+        delta = mean - self.amount_mean
+        self.amount_mean += delta * count / total
+        self.amount_m2 += m2 + delta * delta * self.n_rows * count / total
+
+    @property
+    def repeated_amounts(self):
+        """두 번 이상 나온 양수 금액 종류 수"""
+        return sum(1 for amount, count, _ in self.amount_counts.items() if amount > 0 and count >= 2)
+
+    def _match_labels(self, addresses):
+        if not addresses:
+            return
+        index = get_label_index()
+        table = get_address_table()
+        ids = table.intern_many(addresses)
+        for category, hits in self.label_hits.items():
+            labels = index.category(category)
+            for address, hit in zip(addresses, index.match_ids(category, ids, table).tolist()):
+                if hit:
+                    hits[address] = labels[address]
+
+    def _refresh_labels(self):
+        index = get_label_index()
+        if self._label_version != index.loads:
+            addresses = {address for address, _, _ in self.receivers.items()}
+            for hits in self.label_hits.values():
+                addresses.update(hits)
+            self._label_version = index.loads
+            for hits in self.label_hits.values():
+                hits.clear()
+            self._match_labels(sorted(addresses))
+
+    def update(self, tx_list):
+        """새 tx 행을 추가 (이전에 넣은 행보다 뒤 — 보통 새 블록의 tx)"""
+        frame = as_frame(tx_list)
+        if not len(frame):
+            return self
+        self._refresh_labels()
+        offset = self.n_rows
+
+        # 간격: 이전 마지막 시각과 새 첫 시각 사이 간격도 포함
+        valid_times = frame.times[frame.valid]
+        self.all_valid = self.all_valid and frame.all_valid
+        if len(valid_times):
+            if self.last_time is not None:
+                self._add_intervals(np.asarray([valid_times[0] - self.last_time]))
+            else:
+                self.first_time = int(valid_times[0])
+            self._add_intervals(frame.intervals)
+            self.last_time = int(valid_times[-1])
+        self._advance_height(frame.records)
+
+        # IQR 이상치용 금액
+        rows = np.flatnonzero(frame.has_amount)
+        values = frame.amounts[rows]
+        self.amount_sketch.update(values)
+        for value, row in zip(values.tolist(), (rows + offset).tolist()):
+            if len(self.top_amounts) < OUTLIER_KEEP:
+                heapq.heappush(self.top_amounts, (value, row))
+            elif value > self.top_amounts[0][0]:
+                heapq.heapreplace(self.top_amounts, (value, row))
+
+        # 모든 행 금액
+        amounts = frame.amounts
+        self._add_amount_moments(len(amounts), float(amounts.mean()), float(((amounts - amounts.mean()) ** 2).sum()))
+        unique, counts = np.unique(amounts, return_counts=True)
+        self.amount_counts.update(unique.tolist(), counts.tolist())
+        batch_max = float(amounts.max())
+        self.max_amount = batch_max if self.max_amount is None else max(self.max_amount, batch_max)
+        self.smallest_positive = _merge_smallest(self.smallest_positive, np.sort(amounts[amounts > 0])[:2].tolist())
+        self.large_txs += int(np.count_nonzero(amounts > LARGE_TX_AMOUNT))
+
+        # 수신 주소 (처음 나온 순서 유지)
+        to_ids = frame.to_ids
+        present = np.flatnonzero(to_ids >= 0)
+        ids, first, counts = np.unique(to_ids[present], return_index=True, return_counts=True)
+        new_receivers = []
+        for local, first_row, count in zip(ids.tolist(), present[first].tolist(), counts.tolist()):
+            address = frame.addresses[local]
+            if self.receivers.add(address, count, first_row + offset):
+                new_receivers.append(address)
+        # 요약에서 곧 빠질 주소도 라벨은 확인해 둠
+        self._match_labels(new_receivers)
+        self.receivers.prune()
+
+        multi_io, coinjoin = tx_io_counts(frame)
+        self.multi_io_count += multi_io
+        self.coinjoin_count += coinjoin
+        self.n_rows += len(frame)
+        return self
+
+    def _advance_height(self, records):
+        heights = [tx.get('block_height') or 0 for tx in records]
+        last_height = max(heights, default=0)
+        if not last_height or (self.last_height is not None and last_height < self.last_height):
+            return
+        tail = {tx.get('tx_hash') for tx, height in zip(records, heights) if height == last_height}
+        self.tail_hashes = (self.tail_hashes | tail) if last_height == self.last_height else tail
+        self.last_height = last_height
+
+    def unseen(self, tx_list):
+        """
+        아직 update 하지 않은 행 — 블록 높이가 마지막보다 높거나 같은 블록의 새 tx
+        block_height 가 없는 행(미확인 tx)은 제외. block_time 은 블록 순서와 어긋날 수 있어 비교하지 않음
+        """
+        records = tx_list.records if isinstance(tx_list, TxFrame) else tx_list
+        last = self.last_height
+        rows = []
+        for tx in records:
+            if not isinstance(tx, dict):
+                continue
+            height = tx.get('block_height') or 0
+            if height and (last is None or height > last
+                           or (height == last and tx.get('tx_hash') not in self.tail_hashes)):
+                rows.append(tx)
+        return rows
+
+    def merge(self, other):
+        """other(self 바로 다음 구간) 를 합친 새 상태"""
+        merged = DetectorState()
+
+        # 간격 목록: self 목록 → 두 구간 사이 경계 간격 → other 목록
+        merged.all_valid = self.all_valid and other.all_valid
+        merged.first_time = self.first_time if self.first_time is not None else other.first_time
+        merged.last_time = other.last_time if other.last_time is not None else self.last_time
+        if other.last_height is None or (self.last_height is not None and other.last_height < self.last_height):
+            merged.last_height, merged.tail_hashes = self.last_height, set(self.tail_hashes)
+        elif other.last_height == self.last_height:
+            merged.last_height, merged.tail_hashes = self.last_height, self.tail_hashes | other.tail_hashes
+        else:
+            merged.last_height, merged.tail_hashes = other.last_height, set(other.tail_hashes)
+        merged.n_intervals = self.n_intervals
+        merged.n_short, merged.n_abnormal = self.n_short, self.n_abnormal
+        merged.short_intervals = list(self.short_intervals)
+        merged.abnormal_gaps = list(self.abnormal_gaps)
+        merged.rapid_intervals = self.rapid_intervals
+        if self.last_time is not None and other.first_time is not None:
+            merged._add_intervals(np.asarray([other.first_time - self.last_time]))
+        merged.n_intervals += other.n_intervals
+        merged.n_short += other.n_short
+        merged.n_abnormal += other.n_abnormal
+        merged.short_intervals = (merged.short_intervals + other.short_intervals)[-INTERVAL_KEEP:]
+        merged.abnormal_gaps = (merged.abnormal_gaps + other.abnormal_gaps)[-INTERVAL_KEEP:]
+        merged.rapid_intervals += other.rapid_intervals
+
+        merged.amount_sketch = KLLSketch(self.amount_sketch.k).merge(self.amount_sketch).merge(other.amount_sketch)
+        shifted = [(value, row + self.n_rows) for value, row in other.top_amounts]
+        merged.top_amounts = heapq.nlargest(OUTLIER_KEEP, self.top_amounts + shifted)
+        heapq.heapify(merged.top_amounts)
+
+        merged.n_rows, merged.amount_mean, merged.amount_m2 = self.n_rows, self.amount_mean, self.amount_m2
+        merged._add_amount_moments(other.n_rows, other.amount_mean, other.amount_m2)
+        merged.amount_counts = HeavyHitters.from_list(self.amount_counts.to_list()).merge(other.amount_counts)
+        maxima = [m for m in (self.max_amount, other.max_amount) if m is not None]
+        merged.max_amount = max(maxima) if maxima else None
+        merged.smallest_positive = _merge_smallest(self.smallest_positive, other.smallest_positive)
+        merged.large_txs = self.large_txs + other.large_txs
+
+        merged.receivers = HeavyHitters.from_list(self.receivers.to_list()).merge(other.receivers, self.n_rows)
+        merged.multi_io_count = self.multi_io_count + other.multi_io_count
+        merged.coinjoin_count = self.coinjoin_count + other.coinjoin_count
+        merged.n_rows = self.n_rows + other.n_rows
+        for category, hits in merged.label_hits.items():
+            hits.update(self.label_hits[category])
+            hits.update(other.label_hits[category])
+        merged._refresh_labels()
+        return merged
+
+    # ---- 직렬화 ----
+
+    def to_bytes(self):
+        body = {
+            "v": STATE_VERSION,
+            "n_rows": self.n_rows,
+            "first_time": self.first_time,
+            "last_time": self.last_time,
+            "last_height": self.last_height,
+            "tail_hashes": sorted(h for h in self.tail_hashes if h is not None),
+            "all_valid": self.all_valid,
+            "n_intervals": self.n_intervals,
+            "n_short": self.n_short,
+            "n_abnormal": self.n_abnormal,
+            "short_intervals": self.short_intervals,
+            "abnormal_gaps": self.abnormal_gaps,
+            "rapid_intervals": self.rapid_intervals,
+            "amount_sketch": base64.b64encode(self.amount_sketch.to_bytes()).decode("ascii"),
+            "top_amounts": self.top_amounts,
+            "amount_counts": self.amount_counts.to_list(),
+            "amount_mean": self.amount_mean,
+            "amount_m2": self.amount_m2,
+            "max_amount": self.max_amount,
+            "smallest_positive": self.smallest_positive,
+            "large_txs": self.large_txs,
+            "receivers": self.receivers.to_list(),
+            "label_hits": self.label_hits,
+            "multi_io_count": self.multi_io_count,
+            "coinjoin_count": self.coinjoin_count,
+        }
+        return zlib.compress(json.dumps(body, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, data):
+        body = json.loads(zlib.decompress(data).decode("utf-8"))
+        if body.get("v") != STATE_VERSION:
+            raise ValueError(f"unsupported detector state version: {body.get('v')}")
+        state = cls()
+        for key in ("n_rows", "first_time", "last_time", "last_height", "all_valid", "n_intervals", "n_short", "n_abnormal",
+                    "short_intervals", "abnormal_gaps", "rapid_intervals", "amount_mean", "amount_m2",
+                    "max_amount", "smallest_positive", "large_txs", "multi_io_count", "coinjoin_count"):
+            setattr(state, key, body[key])
+        state.tail_hashes = set(body["tail_hashes"])
+        state.amount_sketch = KLLSketch.from_bytes(base64.b64decode(body["amount_sketch"]))
+        state.top_amounts = [tuple(pair) for pair in body["top_amounts"]]
+        heapq.heapify(state.top_amounts)
+        state.amount_counts = HeavyHitters.from_list(body["amount_counts"])
+        state.receivers = HeavyHitters.from_list(body["receivers"])
+        # 저장된 매칭은 다음 _refresh_labels 때 지금 라벨 목록으로 다시 확인됨
+        state.label_hits = {category: dict(hits) for category, hits in body["label_hits"].items()}
+        return state
+
+    # ---- 점수 ----
+    # 메서드 이름/인자는 registry 의 기본 탐지와 같음 (StateScores 가 기본 탐지 대신 호출)
+
+    def interval(self):
+        return score_intervals(self.n_short, list(self.short_intervals))
+
+    def amount(self, sketch=None):
+        sketch = self.amount_sketch if sketch is None else sketch
+        if not len(sketch):
+            return 0, []
+        threshold = outlier_threshold(*sketch.quantile([0.25, 0.75]))
+        outliers = sorted((row, value) for value, row in self.top_amounts if value > threshold)
+        return score_outliers([value for _, value in outliers])
+
+    def address(self):
+        flagged = sorted((first_row, address) for address, count, first_row in self.receivers.items()
+                         if count >= REPEATED_RECEIVER_MIN)
+        return score_repeated_receivers([address for _, address in flagged])
+
+    def time_gap(self):
+        if self.n_rows < 2 or not self.all_valid:
+            return 0, []
+        return score_time_gaps(self.n_abnormal, list(self.abnormal_gaps))
+
+    def blacklist(self):
+        self._refresh_labels()
+        return score_blacklist(self.label_hits["blacklist"])
+
+    def mixer(self):
+        if not self.n_rows:
+            return 0, []
+        self._refresh_labels()
+        return score_mixer(set(self.label_hits["mixer"].values()), self.multi_io_count, self.coinjoin_count,
+                           self.repeated_amounts, self.n_intervals, self.rapid_intervals)
+
+    def cross_chain(self):
+        if not self.n_rows:
+            return 0, []
+        self._refresh_labels()
+        # 최대 금액의 일정 비율 미만인 양수 금액이 2개 이상 = 두 번째로 작은 양수 금액이 그보다 작음
+        smallest = self.smallest_positive
+        split_pattern = (self.max_amount > BRIDGE_SPLIT_MIN_MAX and len(smallest) >= 2
+                         and smallest[1] < self.max_amount * BRIDGE_SPLIT_RATIO)
+        return score_cross_chain(set(self.label_hits["bridge"].values()), self.large_txs, split_pattern)
+
+    def money_laundering(self, mixer_result=None, bridge_result=None):
+        variance = self.amount_m2 / self.n_rows if self.n_rows > 1 else 0
+        return score_laundering(mixer_result or self.mixer(), bridge_result or self.cross_chain(), self.n_rows,
+                                variance)
+
+    def results(self, tx_list=(), registry=None):
+        """
+        scoring.AnomalyScores.results() 와 같은 키의 결과 dict (registry 의 플러그인 탐지 포함)
+        tx_list 는 state_func 가 없는 플러그인에만 쓰임 (그런 플러그인이 있을 때만 TxFrame 을 만듦)
+        """
+        results = StateScores(self, tx_list, registry=registry).results()
+        results.pop('detector_timings', None)
+        return results
+
+
+# 기본 탐지 함수 → 상태에서 같은 결과를 내는 메서드
+STATE_METHODS = {
+    interval_anomaly_score: DetectorState.interval,
+    amount_anomaly_score: DetectorState.amount,
+    repeated_address_score: DetectorState.address,
+    time_gap_anomaly_score: DetectorState.time_gap,
+    blacklist_score: DetectorState.blacklist,
+    mixer_detection_score: DetectorState.mixer,
+    cross_chain_detection_score: DetectorState.cross_chain,
+    money_laundering_risk_score: DetectorState.money_laundering,
+}
+
+
+class StateScores(AnomalyScores):
+    """
+    레지스트리 탐지를 DetectorState 로 실행 (결과 형식, 순서, 의존성 처리는 AnomalyScores 와 같음)
+    기본 탐지는 STATE_METHODS, 플러그인은 Detector.state_func(state, ...) 가 있으면 그것으로,
+    없으면 넘겨받은 tx_list 의 TxFrame 으로 원래 func 를 실행 (frame 은 그런 플러그인이 처음 쓸 때 만듦)
+    """
+
+    def __init__(self, state, tx_list=(), registry=None):
+        super().__init__(tx_list, registry=registry, workers=0)
+        self.state = state
+
+    @property
+    def n_rows(self):
+        return self.state.n_rows
+
+    def _call(self, detector, kwargs):
+        method = STATE_METHODS.get(detector.func)
+        if method is not None:
+            return method(self.state, **kwargs)
+        if detector.state_func is not None:
+            return detector.state_func(self.state, **kwargs)
+        return detector.func(self.frame, **kwargs)
+
+
+def load_state(address, cache=None):
+    """주소 캐시에 저장된 탐지 상태 (없거나 형식이 다르면 None)"""
+    blob = (cache or get_cache()).get_state(address, STATE_NAME)
+    if blob is None:
+        return None
+    try:
+        return DetectorState.from_bytes(blob)
+    except (ValueError, KeyError, zlib.error):
+        return None
+
+
+def save_state(address, state, cache=None):
+    (cache or get_cache()).put_state(address, STATE_NAME, state.to_bytes())
+
+
+def rescore_address(address, tx_list, cache=None):
+    """
+    감시 주소 재채점: 저장된 상태에 tx_list 중 새 행만 더하고 저장한 뒤 결과 반환
+    tx_list 는 전체 히스토리여도 되고 최근 블록 분만이어도 됨 (이미 넣은 행은 unseen 으로 걸러짐)
+    비용은 새 행 수에 비례 — state_func 가 없는 플러그인 탐지도 이번에 새로 넣은 행만 받음
+    (전체 히스토리가 필요한 플러그인은 state_func 를 두거나 AnomalyScores 로 따로 실행)
+    """
+    state = load_state(address, cache) or DetectorState()
+    new_rows = state.unseen(tx_list)
+    if new_rows:
+        state.update(new_rows)
+        save_state(address, state, cache)
+    return state.results(new_rows)
@@ -0,0 +1,237 @@
+import os
+import threading
+from types import MappingProxyType
+import numpy as np
+from dotenv import load_dotenv
+
+from api.address_ids import get_address_table
+from logic.bloom import LabelFilter
+
+load_dotenv()
+
+# 주소 라벨 인덱스
+# 블랙리스트/믹서/브릿지/거래소 목록(data/*.txt 약 12개)을 프로세스에서 한 번만 읽어 dict 로 들고 있고,
+# 파일의 mtime 이 바뀐 경우에만 다시 읽음. 분석마다 파일을 열고 파싱하던 비용을 stat 몇 번으로 줄임
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+# {카테고리}.lbf 필터 파일(logic.bloom)을 둘 디렉터리. 필터가 있는 카테고리는 txt 대신 필터로 조회
+# (수천만 주소 피드를 파이썬 dict 로 올리지 않고 mmap 으로 공유)
+LABEL_FILTER_DIR = os.getenv("LABEL_FILTER_DIR", os.path.join(DATA_DIR, "filters"))
+
+# 카테고리별 파일 (exchange 는 앞의 파일이 있으면 그것만 사용, 없으면 다음 파일로 폴백)
+LABEL_FILES = {
+    "blacklist": ["blacklist.txt"],
+    "mixer": [
+        "mixer_addresses.txt",      # Wasabi
+        "samourai_mixer.txt",       # Samourai
+        "joinmarket_mixer.txt",     # JoinMarket
+        "other_mixers.txt",         # 기타 믹서들
+    ],
+    "bridge": [
+        "wbtc_bridge.txt",          # WBTC
+        "renvm_bridge.txt",         # RenVM
+        "multichain_bridge.txt",    # Multichain
+        "binance_bridge.txt",       # Binance
+        "coinbase_bridge.txt",      # Coinbase
+        "other_bridges.txt",        # 기타 브릿지들
+    ],
+    "exchange": [
+        "real_exchange_addresses.txt",  # 실제 거래소 주소 우선
+        "exchange_addresses.txt",       # 기존 파일로 폴백
+    ],
+}
+FALLBACK_CATEGORIES = {"exchange"}
+
+
+def log(msg):
+    print(f"[LABELS] {msg}")
+
+
+def _parse_blacklist(line):
+    # 블랙리스트는 한 줄에 주소 하나 (주석 없음)
+    return line, "blacklist"
+
+
+def _parse_tagged(line):
+    # 주소,타입,설명,출처
+    if line.startswith('#'):
+        return None
+    parts = line.split(',')
+    if len(parts) < 3:
+        return None
+    source = parts[3].strip() if len(parts) > 3 else "Unknown"
+    return parts[0].strip(), f"{parts[1].strip()} ({source})"
+
+
+def _parse_exchange(line):
+    # 주소,거래소명,주소유형,특징,출처
+    if line.startswith('#'):
+        return None
+    parts = line.split(',')
+    if len(parts) < 3:
+        return None
+    address_type = parts[2].strip()
+    features = parts[3].strip() if len(parts) > 3 else "Unknown"
+    source = parts[4].strip() if len(parts) > 4 else "Unknown"
+    return parts[0].strip(), f"{parts[1].strip()} ({address_type}, {features}, {source})"
+
+
+PARSERS = {
+    "blacklist": _parse_blacklist,
+    "mixer": _parse_tagged,
+    "bridge": _parse_tagged,
+    "exchange": _parse_exchange,
+}
+
+
+class LabelIndex:
+    """
+    주소 → 라벨 인덱스
+        category(name)   카테고리별 {주소: 라벨} (읽기 전용 뷰)
+        labels(address)  해당 주소가 가진 (카테고리, 라벨) 튜플들, O(1)
+        match_ids(name, ids, table)  주소 사전(table) id 배열 중 목록에 있는 것 (bool 배열)
+        missing(name)    마지막 로드 때 없던 파일 [(파일명, 경로)]
+        errors(name)     마지막 로드 때 읽기 실패한 파일 [(파일명, 오류)]
+    조회 전에 refresh() 가 파일 mtime 을 확인하고 바뀐 경우에만 다시 읽음
+    filter_dir 에 {카테고리}.lbf 가 있으면 그 카테고리는 LabelFilter(mmap) 가 그대로 category() 결과가 됨
+    """
+
+    def __init__(self, data_dir=None, filter_dir=None):
+        self.data_dir = data_dir or DATA_DIR
+        self.filter_dir = filter_dir or LABEL_FILTER_DIR
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._categories = {}
+        self._by_address = {}
+        self._filters = {}
+        self._missing = {}
+        self._errors = {}
+        self.loads = 0
+
+    def _paths(self):
+        paths = [(category, filename, os.path.join(self.data_dir, filename))
+                 for category, filenames in LABEL_FILES.items() for filename in filenames]
+        paths += [(category, f"{category}.lbf", self._filter_path(category)) for category in LABEL_FILES]
+        return paths
+
+    def _filter_path(self, category):
+        return os.path.join(self.filter_dir, f"{category}.lbf")
+
+    def _current_stamp(self):
+        stamp = []
+        for _, _, path in self._paths():
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def refresh(self):
+        """파일이 바뀌었으면 다시 로드. 자기 자신 반환"""
+        stamp = self._current_stamp()
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._load()
+                    self._stamp = stamp
+        return self
+
+    def _load(self):
+        categories, missing, errors = {}, {}, {}
+        by_address = {}
+        filters = {}
+        for category, filenames in LABEL_FILES.items():
+            parse = PARSERS[category]
+            entries = {}
+            missing[category], errors[category] = [], []
+            filter_path = self._filter_path(category)
+            if os.path.exists(filter_path):
+                try:
+                    filters[category] = LabelFilter(filter_path)
+                    continue
+                except (OSError, ValueError) as e:
+                    errors[category].append((f"{category}.lbf", e))
+            for filename in filenames:
+                path = os.path.join(self.data_dir, filename)
+                if not os.path.exists(path):
+                    missing[category].append((filename, path))
+                    continue
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        for line in f:
+                            line = line.strip()
+                            parsed = parse(line) if line else None
+                            if parsed:
+                                entries[parsed[0]] = parsed[1]
+                except (OSError, UnicodeDecodeError) as e:
+                    errors[category].append((filename, e))
+                if category in FALLBACK_CATEGORIES:
+                    break
+            categories[category] = entries
+            for address, label in entries.items():
+                by_address[address] = by_address.get(address, ()) + ((category, label),)
+
+        # 조회 쪽이 보는 참조를 한 번에 바꿔서 로드 중에도 이전 인덱스를 그대로 읽을 수 있게 함
+        self._categories = {name: MappingProxyType(entries) for name, entries in categories.items()}
+        self._categories.update(filters)
+        self._by_address = by_address
+        # 이전 필터의 mmap 은 닫지 않음 — 아직 참조 중인 조회가 있을 수 있고 참조가 사라지면 함께 해제됨
+        self._filters = filters
+        self._missing, self._errors = missing, errors
+        self.loads += 1
+        log(f"🏷️ labels loaded: {len(by_address)} addresses "
+            f"({', '.join(f'{name} {len(entries)}' for name, entries in self._categories.items())})")
+
+    def category(self, name):
+        self.refresh()
+        return self._categories.get(name, MappingProxyType({}))
+
+    def labels(self, address):
+        self.refresh()
+        found = self._by_address.get(address, ())
+        for category, label_filter in self._filters.items():
+            label = label_filter.get(address)
+            if label is not None:
+                found += ((category, label),)
+        return found
+
+    def match_ids(self, name, ids, table=None):
+        """
+        ids(table 의 주소 id, 기본은 현재 범위 사전) 중 name 목록에 있는 것
+        라벨 목록은 주소 사전에 넣지 않음 — 조회할 주소 쪽 문자열로 확인하므로 사전이 라벨 수만큼 커지지 않음
+        """
+        self.refresh()
+        table = get_address_table() if table is None else table
+        ids = np.asarray(ids, dtype=np.int32)
+        hits = np.zeros(len(ids), dtype=bool)
+        valid = ids >= 0
+        if not valid.any():
+            return hits
+        addresses = table.addresses(ids[valid])
+        label_filter = self._filters.get(name)
+        if label_filter is not None:
+            hits[valid] = label_filter.contains_many(addresses)
+            return hits
+        entries = self._categories.get(name, {})
+        hits[valid] = np.fromiter((address in entries for address in addresses), dtype=bool, count=len(addresses))
+        return hits
+
+    def missing(self, name):
+        return self._missing.get(name, [])
+
+    def errors(self, name):
+        return self._errors.get(name, [])
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_label_index():
+    """프로세스 전역 라벨 인덱스 (처음 호출할 때 생성, 이후 mtime 이 바뀐 파일만 반영)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LabelIndex()
+    return _index.refresh()
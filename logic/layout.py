@@ -0,0 +1,198 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 네트워크 시각화용 force 레이아웃 + 레이아웃 캐시
+# 배치 계산은 networkx spring_layout 과 같은 Fruchterman-Reingold 규칙을 numpy 배열 연산으로 한 번에
+# (노드가 적으면 모든 쌍, 수천 개면 격자 근사 척력)
+# 슬라이더를 움직여 노드 집합이 바뀌면:
+#   - 이전과 같은 노드/엣지 집합이면 캐시된 배치를 그대로
+#   - 모두 전에 배치한 노드면 (노드 수를 줄인 경우) 기억한 위치 그대로 — 계산 없음
+#   - 새 노드가 있으면 기존 노드는 고정하고 새 노드만 이웃 근처에서 시작해 짧게 계산 (기존 노드가 튀지 않음)
+LAYOUT_CACHE_SIZE = int(os.getenv("LAYOUT_CACHE_SIZE", "128"))
+# 이 노드 수까지는 모든 쌍 척력을 정확히, 넘으면 격자 근사 (Barnes-Hut 처럼 먼 노드들은 묶어서)
+LAYOUT_EXACT_MAX_NODES = int(os.getenv("LAYOUT_EXACT_MAX_NODES", "200"))
+# 격자 근사에서 한 변의 칸 수
+LAYOUT_GRID_CELLS = 12
+# 한 범위(scope, 보통 분석한 주소)에서 위치를 기억할 최대 노드 수
+LAYOUT_MEMORY_NODES = 10000
+
+
+def _pull(delta_x, delta_y, weight):
+    """방향 벡터 (delta_x, delta_y) 에 weight 를 곱해 행마다 더한 (n, 2) 변위"""
+    return np.stack([(delta_x * weight).sum(axis=1), (delta_y * weight).sum(axis=1)], axis=1)
+
+
+def _repulsion_exact(pos, k):
+    """모든 노드 쌍 척력 k²/d (방향 벡터 합) — O(n²)"""
+    delta_x = pos[:, 0, None] - pos[None, :, 0]
+    delta_y = pos[:, 1, None] - pos[None, :, 1]
+    # 거리는 0.01 아래로 내려가지 않게 (겹친 노드)
+    return _pull(delta_x, delta_y, k * k / np.maximum(delta_x ** 2 + delta_y ** 2, 1e-4))
+
+
+def _repulsion_grid(pos, k, cells):
+    """
+    격자 근사 척력 (Barnes-Hut 의 한 단계짜리 버전)
+    다른 칸의 노드들은 칸의 무게중심에 모인 질량으로, 같은 칸의 다른 노드들은 그 무게중심 하나로 계산 — O(n · cells²)
+    """
+    n = len(pos)
+    low = pos.min(axis=0)
+    span = np.maximum(pos.max(axis=0) - low, 1e-9)
+    cell_xy = np.minimum(((pos - low) / span * cells).astype(np.int64), cells - 1)
+    cell = cell_xy[:, 0] * cells + cell_xy[:, 1]
+    mass = np.bincount(cell, minlength=cells * cells).astype(np.float64)
+    total = np.stack([np.bincount(cell, weights=pos[:, d], minlength=cells * cells) for d in (0, 1)], axis=1)
+    occupied = np.flatnonzero(mass)
+    centroid = total[occupied] / mass[occupied, None]
+
+    delta_x = pos[:, 0, None] - centroid[None, :, 0]
+    delta_y = pos[:, 1, None] - centroid[None, :, 1]
+    weight = mass[occupied][None, :] * k * k / np.maximum(delta_x ** 2 + delta_y ** 2, 1e-4)
+    weight[np.arange(n), np.searchsorted(occupied, cell)] = 0.0
+    displacement = _pull(delta_x, delta_y, weight)
+
+    # 같은 칸의 나머지 노드들
+    others = mass[cell] - 1
+    shared = others > 0
+    delta = pos[shared] - (total[cell[shared]] - pos[shared]) / others[shared, None]
+    weight = others[shared] * k * k / np.maximum((delta ** 2).sum(axis=1), 1e-4)
+    displacement[shared] += delta * weight[:, None]
+    return displacement
+
+
+def force_layout(n, src, dst, k=None, iterations=50, pos=None, fixed=None, seed=42, threshold=1e-4):
+    """
+    Fruchterman-Reingold 배치 (n, 2) 배열
+    src/dst 는 엣지 끝점 번호 배열 (방향 무시), pos 는 시작 위치 (없으면 seed 로 [0, 1) 균등),
+    fixed 는 움직이지 않을 노드의 bool 마스크
+    LAYOUT_EXACT_MAX_NODES 개까지는 모든 쌍 척력, 그보다 많으면 격자 근사 척력 (수천 노드도 1초 안쪽)
+    """
+    if pos is None:
+        pos = np.random.default_rng(seed).random((n, 2))
+    pos = np.asarray(pos, dtype=np.float64).copy()
+    if n <= 1:
+        return pos
+    # 중복/자기 엣지를 뺀 무방향 엣지 목록 (인력은 엣지마다 양 끝에)
+    src, dst = np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+    pairs = np.unique(np.sort(np.stack([src, dst], axis=1), axis=1), axis=0)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    a, b = pairs[:, 0], pairs[:, 1]
+    movable = np.ones(n, dtype=bool) if fixed is None else ~np.asarray(fixed, dtype=bool)
+    exact = n <= LAYOUT_EXACT_MAX_NODES
+    cells = LAYOUT_GRID_CELLS
+
+    k = np.sqrt(1.0 / n) if k is None else k
+    # 처음 온도는 배치 폭의 10%, 반복마다 선형으로 식힘
+    t = max(float(np.ptp(pos, axis=0).max()), 1e-3) * 0.1
+    dt = t / (iterations + 1)
+    for _ in range(iterations):
+        displacement = _repulsion_exact(pos, k) if exact else _repulsion_grid(pos, k, cells)
+        # 인력 d²/k 를 방향 벡터(delta/d)에 곱한 것 = delta · d/k
+        delta = pos[a] - pos[b]
+        pull = delta * (np.maximum(np.linalg.norm(delta, axis=-1), 0.01) / k)[:, None]
+        for d in (0, 1):
+            displacement[:, d] += np.bincount(b, weights=pull[:, d], minlength=n)
+            displacement[:, d] -= np.bincount(a, weights=pull[:, d], minlength=n)
+
+        length = np.linalg.norm(displacement, axis=-1)
+        length = np.where(length < 0.01, 0.1, length)
+        step = displacement * (t / length)[:, None]
+        step[~movable] = 0.0
+        pos += step
+        t -= dt
+        if np.linalg.norm(step) / n < threshold:
+            break
+    return pos
+
+
+class LayoutCache:
+    """노드/엣지 집합별 배치 LRU + 범위(scope)별 노드 위치 기억 (warm start)"""
+
+    def __init__(self, size=None):
+        self.size = LAYOUT_CACHE_SIZE if size is None else size
+        self.stats = {"hits": 0, "reused": 0, "warm": 0, "cold": 0}
+        self._layouts = OrderedDict()
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def _remember(self, scope, positions):
+        memory = self._positions.setdefault(scope, {})
+        memory.update(positions)
+        if len(memory) > LAYOUT_MEMORY_NODES:
+            memory.clear()
+            memory.update(positions)
+
+    def layout(self, nodes, edges, scope=None, k=3.0, iterations=150, warm_iterations=40, seed=42):
+        """{노드: (x, y)} — nodes 는 그릴 노드 목록, edges 는 (u, v) 목록"""
+        nodes = list(nodes)
+        edges = [(u, v) for u, v in edges]
+        key = (scope, frozenset(nodes), frozenset(edges))
+        with self._lock:
+            cached = self._layouts.get(key)
+            if cached is not None:
+                self._layouts.move_to_end(key)
+                self.stats["hits"] += 1
+                return dict(cached)
+            memory = dict(self._positions.get(scope, {}))
+
+        index = {node: i for i, node in enumerate(nodes)}
+        src = np.array([index[u] for u, v in edges], dtype=np.int64)
+        dst = np.array([index[v] for u, v in edges], dtype=np.int64)
+        known = np.array([node in memory for node in nodes], dtype=bool)
+
+        if known.all() and len(nodes):
+            pos = np.array([memory[node] for node in nodes], dtype=np.float64)
+            self.stats["reused"] += 1
+        elif known.any():
+            pos = self._warm_start(nodes, known, memory, src, dst, seed)
+            pos = force_layout(len(nodes), src, dst, k=k, iterations=warm_iterations, pos=pos, fixed=known)
+            self.stats["warm"] += 1
+        else:
+            pos = force_layout(len(nodes), src, dst, k=k, iterations=iterations, seed=seed)
+            self.stats["cold"] += 1
+
+        positions = {node: (float(x), float(y)) for node, (x, y) in zip(nodes, pos)}
+        with self._lock:
+            self._remember(scope, positions)
+            self._layouts[key] = positions
+            while len(self._layouts) > self.size:
+                self._layouts.popitem(last=False)
+        return dict(positions)
+
+    @staticmethod
+    def _warm_start(nodes, known, memory, src, dst, seed):
+        """기억한 노드는 그 위치, 새 노드는 이미 배치된 이웃들의 평균 근처 (이웃이 없으면 배치 범위 안 임의 위치)"""
+        rng = np.random.default_rng(seed)
+        pos = np.zeros((len(nodes), 2), dtype=np.float64)
+        pos[known] = [memory[node] for node, is_known in zip(nodes, known) if is_known]
+        low, high = pos[known].min(axis=0), pos[known].max(axis=0)
+        spread = np.maximum(high - low, 1e-2)
+        both = np.concatenate([src, dst])
+        other = np.concatenate([dst, src])
+        for i in np.flatnonzero(~known).tolist():
+            neighbors = other[(both == i) & known[other]]
+            if len(neighbors):
+                pos[i] = pos[neighbors].mean(axis=0) + rng.normal(scale=0.05, size=2) * spread
+            else:
+                pos[i] = low + rng.random(2) * spread
+        return pos
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_layout_cache():
+    """프로세스 전역 레이아웃 캐시"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LayoutCache()
+    return _cache
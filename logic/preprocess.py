@@ -1,26 +1,63 @@
 # logic/preprocess.py
 
-import pandas as pd
-from dateutil.parser import parse  # 🔥 이걸로 바꿔줌
+import numpy as np
 
-def preprocess(tx_list):
+from api.columnar import TxRecords
+
+
+def block_times(tx_list):
     """
-    Convert transaction list to pandas DataFrame, clean and sort timestamps.
+    레코드별 epoch 초 배열. 파서가 붙인 block_time(int)을 그대로 쓰고,
+    block_time 이 없는 레코드만 timestamp 문자열을 한 번에(벡터) 파싱합니다. 실패하면 0
     """
-    df = pd.DataFrame(tx_list)
-    print(f"📦 Before timestamp parse: {len(df)} rows")
+    times = np.zeros(len(tx_list), dtype=np.int64)
+    missing = []
+    for i, tx in enumerate(tx_list):
+        block_time = tx.get('block_time')
+        if block_time:
+            times[i] = block_time
+        else:
+            missing.append(i)
 
-    # ✅ 날짜 파싱 함수
-    def safe_parse(ts):
+    if missing:
+        # 파서가 만든 레코드는 모두 block_time 이 있으므로 pandas 는 이 경로에서만 (워커 import 비용 절감)
+        import pandas as pd
+
+        raw = pd.Series([tx_list[i].get('timestamp') for i in missing], dtype=object)
         try:
-            return parse(ts)
-        except:
-            return pd.NaT
+            parsed = pd.to_datetime(raw, errors='coerce', utc=True, format='mixed')
+        except (TypeError, ValueError):
+            parsed = pd.to_datetime(raw, errors='coerce', utc=True)
+        valid = parsed.notna().to_numpy()
+        seconds = np.zeros(len(missing), dtype=np.int64)
+        epoch = pd.Timestamp(0, tz='UTC')
+        seconds[valid] = ((parsed[valid] - epoch) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+        times[missing] = seconds
+    return times
+
+
+def preprocess(tx_list):
+    """
+    Validate and sort transactions by time.
+    Every record keeps its ISO 'timestamp' string and carries an integer 'block_time' (epoch seconds).
+    """
+    print(f"📦 Before timestamp parse: {len(tx_list)} rows")
+    if not tx_list:
+        return []
 
-    # ✅ datetime 변환 (수동 적용)
-    df['timestamp'] = df['timestamp'].apply(safe_parse)
-    df = df[df['timestamp'].notna()]
-    print(f"✅ After timestamp parse: {len(df)} rows")
+    times = block_times(tx_list)
+    valid = np.flatnonzero(times > 0)
+    # 같은 시각이면 원래 순서 유지 (stable)
+    order = valid[np.argsort(times[valid], kind='stable')]
+    print(f"✅ After timestamp parse: {len(order)} rows")
 
-    df = df.sort_values(by='timestamp').reset_index(drop=True)
-    return df.to_dict(orient='records')  # 분석 함수가 dict list를 받는 경우
+    result = []
+    for i in order.tolist():
+        tx = tx_list[i]
+        if tx.get('block_time') != times[i]:
+            tx = dict(tx, block_time=int(times[i]))
+        result.append(tx)
+    if isinstance(tx_list, TxRecords) and tx_list.has_ids():
+        # 파서가 발급한 주소 id 도 같은 순서로 (TxFrame 이 주소 문자열을 다시 사전에 넣지 않도록)
+        return tx_list.take(order, result)
+    return result
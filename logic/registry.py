@@ -0,0 +1,145 @@
+import importlib
+import os
+from dotenv import load_dotenv
+
+from logic.detection import (
+    interval_anomaly_score,
+    amount_anomaly_score,
+    repeated_address_score,
+    time_gap_anomaly_score,
+    blacklist_score,
+    mixer_detection_score,
+    cross_chain_detection_score,
+    money_laundering_risk_score,
+)
+
+load_dotenv()
+
+# 탐지 레지스트리
+# 탐지 함수마다 입력, 최대 점수, 비용 등급을 선언해 두고 scoring 엔진이 이 목록대로 실행/합산함
+# 새 휴리스틱은 register(Detector(...)) 한 번이면 app.py 수정 없이 scores_dict 와 총점에 들어감
+# DETECTOR_PLUGINS=모듈1,모듈2 로 지정한 모듈은 엔진이 처음 쓰일 때 import 되어 스스로 register 하면 됨
+DETECTOR_PLUGINS = [m.strip() for m in os.getenv("DETECTOR_PLUGINS", "").split(",") if m.strip()]
+
+# 비용 등급: cheap 은 호출한 스레드에서 바로 실행, io/heavy 는 워커 풀에서 동시에 실행
+COST_CLASSES = ("cheap", "io", "heavy")
+
+
+class Detector:
+    """
+    key         레지스트리 키 (의존성 이름으로도 씀)
+    func        func(frame, **params) → 결과 (보통 (점수, 상세))
+    label       scores_dict 에 나오는 이름
+    max_score   점수 상한 (표시/검증용)
+    params      {인자 이름: 다른 탐지 key 또는 컨텍스트 이름} — 탐지 key 면 그 결과를 넘기고 먼저 실행됨
+    cost        COST_CLASSES 중 하나
+    fields      결과 튜플 각 원소를 results() 에 풀어 넣을 키 (기존 세션 키 호환)
+    score_index 결과 튜플에서 점수 위치
+    state_func  state_func(incremental.DetectorState, **params) → func 와 같은 결과 (선택)
+                감시 주소 증분 재채점 때 쓰임 — 없으면 그때 받은 tx 로 func 를 실행
+    """
+
+    def __init__(self, key, func, label, max_score, params=None, cost="cheap", fields=(), score_index=0,
+                 state_func=None):
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Unknown cost class for {key}: {cost}")
+        self.key = key
+        self.func = func
+        self.label = label
+        self.max_score = max_score
+        self.params = dict(params or {})
+        self.cost = cost
+        self.fields = tuple(fields)
+        self.score_index = score_index
+        self.state_func = state_func
+
+    def depends(self, registry):
+        return [name for name in self.params.values() if name in registry]
+
+    def score(self, result):
+        return result[self.score_index]
+
+
+class DetectorRegistry:
+    """등록 순서를 유지하는 탐지 목록 (scores_dict 순서 = 등록 순서)"""
+
+    def __init__(self, detectors=()):
+        self._detectors = {}
+        for detector in detectors:
+            self.register(detector)
+
+    def register(self, detector):
+        self._detectors[detector.key] = detector
+        return detector
+
+    def unregister(self, key):
+        return self._detectors.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._detectors
+
+    def __iter__(self):
+        return iter(list(self._detectors.values()))
+
+    def __len__(self):
+        return len(self._detectors)
+
+    def __getitem__(self, key):
+        return self._detectors[key]
+
+    def labels(self):
+        return [detector.label for detector in self]
+
+    def max_total(self):
+        return sum(detector.max_score for detector in self)
+
+    def waves(self):
+        """의존성이 모두 끝난 탐지끼리 묶은 실행 단계 리스트"""
+        done, pending, waves = set(), list(self), []
+        while pending:
+            ready = [d for d in pending if all(dep in done for dep in d.depends(self))]
+            if not ready:
+                raise ValueError(f"Detector dependency cycle: {[d.key for d in pending]}")
+            waves.append(ready)
+            done.update(d.key for d in ready)
+            pending = [d for d in pending if d.key not in done]
+        return waves
+
+
+BUILTIN_DETECTORS = [
+    Detector("interval", interval_anomaly_score, "Short Interval Score", 25,
+             fields=("interval_score", "short_intervals")),
+    Detector("amount", amount_anomaly_score, "Amount Outlier Score", 25, params={"sketch": "amount_sketch"},
+             fields=("amount_score", "outliers")),
+    Detector("address", repeated_address_score, "Repeated Address Score", 25,
+             fields=("address_score", "flagged_addresses")),
+    Detector("time_gap", time_gap_anomaly_score, "Time Gap Score", 15,
+             fields=("time_score", "abnormal_gaps")),
+    Detector("blacklist", blacklist_score, "Blacklist Score", 100, cost="io",
+             fields=("blacklist_flag", "blacklist_score_val"), score_index=1),
+    Detector("mixer", mixer_detection_score, "Mixer Score", 95, cost="io",
+             fields=("mixer_score_val", "mixer_indicators")),
+    Detector("cross_chain", cross_chain_detection_score, "Cross-chain Score", 65, cost="io",
+             fields=("cross_chain_score_val", "cross_chain_indicators")),
+    Detector("money_laundering", money_laundering_risk_score, "Money Laundering Risk Score", 185,
+             params={"mixer_result": "mixer", "bridge_result": "cross_chain"},
+             fields=("money_laundering_score_val", "laundering_indicators")),
+]
+
+_registry = DetectorRegistry(BUILTIN_DETECTORS)
+_plugins_loaded = False
+
+
+def register(detector):
+    """프로세스 전역 레지스트리에 탐지 추가 (같은 key 면 교체)"""
+    return _registry.register(detector)
+
+
+def get_registry():
+    """프로세스 전역 레지스트리 (DETECTOR_PLUGINS 모듈은 처음 호출할 때 import)"""
+    global _plugins_loaded
+    if not _plugins_loaded:
+        _plugins_loaded = True
+        for module in DETECTOR_PLUGINS:
+            importlib.import_module(module)
+    return _registry
@@ -2,6 +2,8 @@ import json
 import os
 import math
 
+from logic.txframe import as_frame
+
 def load_scenarios(path="data/100_scenario_db_from_blacklist.json"):
     if not os.path.exists(path):
         return []
@@ -12,6 +14,16 @@ def load_scenarios(path="data/100_scenario_db_from_blacklist.json"):
         print(f"[ERROR] Failed to load scenario DB: {e}")
         return []
 
+def compute_tx_stats(tx_list, short_intervals, flagged_addresses):
+    """시나리오 매칭에 쓰는 주소 요약 통계 (앱/배치 CLI 공용)"""
+    frame = as_frame(tx_list)
+    return {
+        "tx_count": len(frame),
+        "avg_interval": sum(short_intervals)/len(short_intervals) if short_intervals else 9999,
+        "reused_address_ratio": len(flagged_addresses) / len(frame) if len(frame) else 0,
+        "high_fee_flag": bool((frame.fees > 500).any())
+    }
+
 def sigmoid_score(x, center, scale=1.0):
     """거리 기반 sigmoid 점수 함수. center에 가까울수록 점수 1, 멀수록 감쇠."""
     try:
@@ -0,0 +1,136 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+from logic.registry import BUILTIN_DETECTORS, get_registry
+from logic.txframe import as_frame
+
+load_dotenv()
+
+# 통합 점수 엔진
+# 레코드는 TxFrame 을 만들 때 한 번만 훑고, 각 탐지는 그 배열 위에서 계산
+# 어떤 탐지를 어떤 순서로 돌릴지는 logic.registry 가 정함 — 탐지 결과는 한 번만 계산해서 공유
+# (세탁 위험도는 믹서/브릿지 결과를 재사용), 서로 독립인 io/heavy 탐지는 워커 풀에서 동시에 실행
+# 동시 실행할 워커 수 (0 = 모두 호출한 스레드에서 순서대로)
+DETECTOR_WORKERS = int(os.getenv("DETECTOR_WORKERS", "4"))
+
+# 기본 탐지의 scores_dict 키 순서 (app, PDF 리포트, 배치 출력이 같은 순서를 씀)
+SCORE_KEYS = [detector.label for detector in BUILTIN_DETECTORS]
+
+# 워커 수별 풀 (AnomalyScores(workers=N) 마다 그 크기의 풀을 한 번 만들어 재사용)
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def log(msg):
+    print(f"[SCORING] {msg}")
+
+
+def _get_pool(workers):
+    pool = _pools.get(workers)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(workers)
+            if pool is None:
+                pool = _pools[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detector")
+    return pool
+
+
+class AnomalyScores:
+    """
+    tx_list(또는 TxFrame) 하나에 대한 모든 탐지 결과
+    amount_sketch 를 넘기면 금액 이상치의 Q1/Q3 를 그 스케치(전체 히스토리 요약)에서 구함
+    timings 에 탐지별 실행 시간(초)이 남음
+    frame(TxFrame) 은 처음 쓰는 탐지가 있을 때 한 번만 만듦
+    """
+
+    def __init__(self, tx_list, amount_sketch=None, registry=None, workers=None):
+        self._tx_list = tx_list
+        self._frame = None
+        self._frame_lock = threading.Lock()
+        self.registry = registry or get_registry()
+        self.context = {"amount_sketch": amount_sketch}
+        self.workers = DETECTOR_WORKERS if workers is None else workers
+        self.timings = {}
+        self._results = None
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            with self._frame_lock:
+                if self._frame is None:
+                    self._frame = as_frame(self._tx_list)
+                    self._tx_list = None
+        return self._frame
+
+    @property
+    def n_rows(self):
+        return len(self.frame)
+
+    def _run_one(self, detector, results):
+        kwargs = {name: results[source] if source in self.registry else self.context.get(source)
+                  for name, source in detector.params.items()}
+        start = time.perf_counter()
+        result = self._call(detector, kwargs)
+        self.timings[detector.key] = time.perf_counter() - start
+        return result
+
+    def _call(self, detector, kwargs):
+        return detector.func(self.frame, **kwargs)
+
+    def _submit(self, detector, results):
+        # 워커 스레드에서 emit() 한 경고도 호출한 쪽 구독자(logic.events)에게 가도록 컨텍스트를 넘김
+        context = contextvars.copy_context()
+        return _get_pool(self.workers).submit(context.run, self._run_one, detector, results)
+
+    def run(self):
+        """모든 탐지를 한 번씩 실행 {key: 결과} (두 번째 호출부터는 저장된 결과)"""
+        if self._results is not None:
+            return self._results
+        results = {}
+        for wave in self.registry.waves():
+            pooled = [d for d in wave if d.cost != "cheap"] if self.workers > 0 and len(wave) > 1 else []
+            futures = {d.key: self._submit(d, results) for d in pooled}
+            for detector in wave:
+                if detector.key not in futures:
+                    results[detector.key] = self._run_one(detector, results)
+            for key, future in futures.items():
+                results[key] = future.result()
+        self._results = results
+        slowest = sorted(self.timings.items(), key=lambda item: item[1], reverse=True)[:3]
+        log(f"⏱️ {self.n_rows} rows, {len(results)} detectors: "
+            + ", ".join(f"{key} {seconds * 1000:.1f}ms" for key, seconds in slowest))
+        return results
+
+    def result(self, key):
+        return self.run()[key]
+
+    @property
+    def scores_dict(self):
+        results = self.run()
+        return {detector.label: detector.score(results[detector.key]) for detector in self.registry}
+
+    @property
+    def total_score(self):
+        return sum(self.scores_dict.values())
+
+    def results(self):
+        """app.py 세션 상태(analysis_results)와 같은 키의 결과 dict (+ detector_timings)"""
+        results = self.run()
+        scores_dict = self.scores_dict
+        out = {
+            'total_score': sum(scores_dict.values()),
+            'scores_dict': scores_dict,
+            'detector_timings': dict(self.timings),
+        }
+        for detector in self.registry:
+            out.update(zip(detector.fields, results[detector.key]))
+        return out
+
+
+def score_transactions(tx_list, amount_sketch=None):
+    """모든 탐지를 한 번씩만 계산한 결과 dict (scores_dict, total_score 포함)"""
+    return AnomalyScores(tx_list, amount_sketch=amount_sketch).results()
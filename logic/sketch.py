@@ -0,0 +1,205 @@
+import os
+import struct
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 병합 가능한 스트리밍 분위수 스케치 (KLL)
+# 레벨 h 의 원소는 가중치 2^h 를 가지며, 레벨이 용량을 넘으면 정렬 후 하나 걸러 하나만 위 레벨로 올림
+# 원소 수 n 과 무관하게 약 3k 개만 저장하고, 순위 오차는 대략 n / k 수준
+# 압축이 한 번도 일어나지 않은 동안(n <= k)은 원본 값을 그대로 들고 있어 np.quantile 과 같은 결과를 냄
+DEFAULT_K = int(os.getenv("AMOUNT_SKETCH_K", "200"))
+# 빈도 요약(Misra-Gries) 이 들고 있는 최대 키 수 — 반복 수신 주소/반복 금액 카운터
+HEAVY_HITTERS_K = int(os.getenv("HEAVY_HITTERS_K", "128"))
+# 직렬화 형식: magic | k, n, parity, 레벨 수 (u32, u64, u8, u16) | 레벨별 길이(u32) | float64 값들
+SKETCH_MAGIC = b"KLL1"
+
+
+class KLLSketch:
+    """
+    update(values) 로 값을 넣고 quantile(q) / rank(x) 로 조회, merge(other) 로 샤드끼리 합침
+    압축 시 홀/짝 선택은 번갈아 하므로 같은 입력이면 항상 같은 결과 (재현 가능)
+    """
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._parity = 0
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def exact(self):
+        """아직 압축되지 않아 모든 값을 그대로 들고 있는지"""
+        return len(self.levels) == 1
+
+    def _capacity(self, h):
+        depth = len(self.levels) - 1 - h
+        return max(2, int(self.k * (2 / 3) ** depth))
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                # 홀수 개면 하나는 이 레벨에 남김
+                keep = items[:len(items) % 2]
+                paired = items[len(items) % 2:]
+                promoted = paired[self._parity::2]
+                self._parity ^= 1
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return self
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += len(values)
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """other 를 합침 (self 를 갱신하고 반환)"""
+        if other.k != self.k:
+            raise ValueError(f"cannot merge sketches with different k ({self.k} != {other.k})")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def to_bytes(self):
+        """주소 캐시/샤드 간 전달용 직렬화 (저장 크기는 n 과 무관하게 약 3k 개 float)"""
+        header = struct.pack("<IQBH", self.k, self.n, self._parity, len(self.levels))
+        lengths = struct.pack(f"<{len(self.levels)}I", *(len(level) for level in self.levels))
+        return SKETCH_MAGIC + header + lengths + np.concatenate(self.levels).astype("<f8").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(SKETCH_MAGIC)] != SKETCH_MAGIC:
+            raise ValueError("not a serialized KLL sketch")
+        offset = len(SKETCH_MAGIC)
+        k, n, parity, n_levels = struct.unpack_from("<IQBH", data, offset)
+        offset += struct.calcsize("<IQBH")
+        lengths = struct.unpack_from(f"<{n_levels}I", data, offset)
+        offset += 4 * n_levels
+        values = np.frombuffer(data, dtype="<f8", offset=offset, count=sum(lengths)).astype(np.float64)
+        sketch = cls(k)
+        sketch.n = n
+        sketch._parity = parity
+        bounds = np.cumsum((0,) + lengths)
+        sketch.levels = [values[bounds[h]:bounds[h + 1]].copy() for h in range(n_levels)]
+        return sketch
+
+    def _weighted(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 1 << h, dtype=np.int64) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, qs):
+        """np.quantile(linear) 와 같은 규칙의 분위수 추정 (qs 는 스칼라 또는 배열)"""
+        if not self.n:
+            raise ValueError("quantile of an empty sketch")
+        if self.exact:
+            return np.quantile(self.levels[0], qs)
+        items, cumulative = self._weighted()
+        total = int(cumulative[-1])
+        positions = np.asarray(qs, dtype=np.float64) * (total - 1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, total - 1)
+        low_values = items[np.searchsorted(cumulative, lower, side="right")]
+        high_values = items[np.searchsorted(cumulative, upper, side="right")]
+        return low_values + (positions - lower) * (high_values - low_values)
+
+    def rank(self, x):
+        """x 이하인 값 개수 추정"""
+        if self.exact:
+            return int(np.count_nonzero(self.levels[0] <= x))
+        items, cumulative = self._weighted()
+        index = np.searchsorted(items, x, side="right")
+        return int(cumulative[index - 1]) if index else 0
+
+
+class HeavyHitters:
+    """
+    병합 가능한 빈도 요약 (Misra-Gries) — 최대 k 개 키의 [횟수, 순서 값]
+    키 종류가 k 개 이하인 동안은 정확한 횟수, 넘으면 (k+1) 번째로 큰 횟수만큼 모두 깎고 0 이 된 키를 버림
+    남은 횟수는 실제 횟수의 하한이고 오차는 (전체 횟수) / (k + 1) 이하 — 자주 나온 키만 살아남음
+    순서 값은 키가 처음 들어올 때 값을 유지함 (처음 나온 행 번호 등)
+    """
+
+    def __init__(self, k=HEAVY_HITTERS_K):
+        self.k = k
+        self.entries = {}
+        # 지금까지 깎은 횟수 합 (횟수 하한의 최대 오차)
+        self.error = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def count(self, key):
+        entry = self.entries.get(key)
+        return entry[0] if entry else 0
+
+    def items(self):
+        """(키, 횟수, 순서 값) 목록"""
+        return [(key, count, order) for key, (count, order) in self.entries.items()]
+
+    def add(self, key, count=1, order=None):
+        """키 횟수를 더함 — 새로 들어온 키면 True (깎기는 prune() 에서 한 번에)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.entries[key] = [count, order]
+            return True
+        entry[0] += count
+        return False
+
+    def prune(self):
+        if len(self.entries) <= self.k:
+            return self
+        cut = sorted((entry[0] for entry in self.entries.values()), reverse=True)[self.k]
+        self.entries = {key: [count - cut, order] for key, (count, order) in self.entries.items() if count > cut}
+        self.error += cut
+        return self
+
+    def update(self, keys, counts=None, orders=None):
+        """배치로 더함 (counts/orders 는 keys 와 같은 길이, 없으면 1/None)"""
+        keys = list(keys)
+        counts = [1] * len(keys) if counts is None else counts
+        orders = [None] * len(keys) if orders is None else orders
+        for key, count, order in zip(keys, counts, orders):
+            self.add(key, count, order)
+        return self.prune()
+
+    def merge(self, other, order_offset=0):
+        """other 를 합침 (self 를 갱신하고 반환) — other 의 순서 값에는 order_offset 을 더함"""
+        for key, count, order in other.items():
+            self.add(key, count, order + order_offset if order is not None else None)
+        self.error += other.error
+        return self.prune()
+
+    def to_list(self):
+        return [self.k, self.error, self.items()]
+
+    @classmethod
+    def from_list(cls, data):
+        k, error, items = data
+        summary = cls(k)
+        summary.error = error
+        summary.entries = {key: [count, order] for key, count, order in items}
+        return summary
@@ -0,0 +1,218 @@
+from functools import cached_property
+
+import numpy as np
+
+from api.address_ids import get_address_table
+from api.columnar import TxRecords
+from logic.preprocess import block_times
+
+# 분석 한 번에 한 번만 만드는 배열 기반 트랜잭션 뷰
+# 탐지 함수들이 각자 dict 리스트에서 금액/시간/주소를 다시 뽑고 간격을 다시 계산하던 것을 여기로 모음
+# 탐지 함수는 TxFrame 과 기존 tx_list 를 모두 받음 (as_frame)
+# 파서의 TxColumns 에서 바로 만들 수도 있음 (from_columns) — 이때 레코드 dict 는 records 를 처음 읽을 때만 만듦
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+class TxFrame:
+    """
+    불변 배열 뷰. 레코드 순서는 입력 그대로 (보통 preprocess 로 시간순 정렬된 리스트).
+        records        원본 레코드 튜플 (반복/인덱싱은 리스트처럼 동작, from_columns 면 처음 읽을 때 만듦)
+        columns        from_columns 로 만들었으면 그 TxColumns (아니면 None), column_txs 는 tx 번호별 그 TxColumns 의 tx 인덱스
+        times          레코드별 epoch 초 (파싱 실패 0), valid = times > 0
+        intervals      유효한 레코드끼리 입력 순서대로의 간격(초)
+        sorted_times   유효한 시각 정렬본, sorted_intervals 는 그 간격
+        hours          유효한 레코드의 UTC 시(0~23)
+        amounts        레코드별 금액 (없으면 0), has_amount 는 'amount' 키가 있는지
+        from_ids/to_ids  addresses 인덱스 (없으면 -1) — 프레임 안에서만 쓰는 촘촘한 번호라 bincount 에 바로 씀
+        table          주소 사전, address_ids 는 addresses 의 그 사전 id (파서가 만든 TxRecords 면 파싱 때 id 를 그대로 씀)
+        receiver_ids   receivers 의 주소 사전 id (라벨 인덱스 등 프레임 밖과 조인할 때)
+        tx_ids         레코드별 tx 번호, tx_first_rows 는 tx 마다 첫 레코드 위치
+        tx_hashes      tx 번호별 tx_hash, fees 는 레코드별 수수료(BTC) — 레코드를 만들지 않고 읽을 수 있는 값
+    """
+
+    def __init__(self, tx_list):
+        records = tuple(tx for tx in tx_list if isinstance(tx, dict))
+        self._records = records
+        self.columns = None
+        self.column_txs = None
+
+        self._set_times(block_times(records) if records else np.zeros(0, dtype=np.int64))
+        self.has_amount = _readonly(np.fromiter(('amount' in tx for tx in records), dtype=bool, count=len(records)))
+        self.amounts = _readonly(np.fromiter((tx.get('amount', 0) or 0 for tx in records),
+                                             dtype=np.float64, count=len(records)))
+
+        if isinstance(tx_list, TxRecords) and tx_list.has_ids() and len(records) == len(tx_list):
+            self.table = tx_list.table
+            from_ids, to_ids = self._local_ids(tx_list.from_ids, tx_list.to_ids)
+        else:
+            self.table = get_address_table()
+            from_ids, to_ids = self._intern_local(records)
+        self.from_ids = _readonly(from_ids)
+        self.to_ids = _readonly(to_ids)
+
+        tx_key_id = {}
+        tx_ids = np.empty(len(records), dtype=np.int32)
+        for i, tx in enumerate(records):
+            key = tx.get('tx_hash') or ('row', i)
+            tx_ids[i] = tx_key_id.setdefault(key, len(tx_key_id))
+        self._set_tx_ids(tx_ids)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        TxColumns 에서 바로 만든 프레임 — TxFrame(preprocess(columns.to_records())) 와 같은 배열
+        엣지(columns.edges) 를 block_time 순으로 (같은 시각은 파서 순서) 정렬한 것이 행
+        """
+        frame = cls.__new__(cls)
+        edges = columns.edges()
+        times = columns.block_time[edges["tx"]]
+        valid = np.flatnonzero(times > 0)
+        order = valid[np.argsort(times[valid], kind='stable')]
+        frame._records = None
+        frame._order = order
+        frame.columns = columns
+
+        frame._set_times(times[order])
+        frame.has_amount = _readonly(np.ones(len(order), dtype=bool))
+        # to_records 의 round(value / 1e8, 8) 과 같은 값 (sat 정수를 나눈 값은 이미 가장 가까운 double)
+        frame.amounts = _readonly(edges["value"][order] / 1e8)
+        frame.table = columns.table
+        from_ids, to_ids = frame._local_ids(edges["src"][order], edges["dst"][order])
+        frame.from_ids = _readonly(from_ids)
+        frame.to_ids = _readonly(to_ids)
+
+        # tx 번호는 행에서 처음 나온 순서대로 (레코드 경로의 tx_hash 별 번호와 같음)
+        unique, first, inverse = np.unique(edges["tx"][order], return_index=True, return_inverse=True)
+        rank = np.empty(len(unique), dtype=np.int32)
+        order_first = np.argsort(first, kind='stable')
+        rank[order_first] = np.arange(len(unique), dtype=np.int32)
+        frame._set_tx_ids(rank[inverse])
+        frame.column_txs = _readonly(unique[order_first])
+        return frame
+
+    @property
+    def records(self):
+        if self._records is None:
+            records = self.columns.to_records()
+            self._records = tuple(records[i] for i in self._order.tolist())
+        return self._records
+
+    def _set_times(self, times):
+        valid = times > 0
+        valid_times = times[valid]
+        sorted_times = np.sort(valid_times)
+        self.times = _readonly(times)
+        self.valid = _readonly(valid)
+        self.all_valid = bool(valid.all())
+        self.intervals = _readonly(np.diff(valid_times))
+        self.sorted_times = _readonly(sorted_times)
+        self.sorted_intervals = _readonly(np.diff(sorted_times))
+        self.hours = _readonly((valid_times % 86400) // 3600)
+
+    def _set_tx_ids(self, tx_ids):
+        self.tx_ids = _readonly(tx_ids)
+        self.tx_first_rows = _readonly(np.unique(tx_ids, return_index=True)[1])
+
+    def _local_ids(self, from_global, to_global):
+        """
+        파싱 때의 주소 id → 프레임 안 번호 (보낸/받은 순서로 처음 나온 순서, _intern_local 과 같은 번호)
+        문자열을 다시 해시하지 않고 id 배열로만 계산
+        """
+        seq = np.stack([from_global, to_global], axis=1).ravel()
+        present = seq >= 0
+        unique, first, inverse = np.unique(seq[present], return_index=True, return_inverse=True)
+        order = np.argsort(first, kind='stable')
+        rank = np.empty(len(unique), dtype=np.int32)
+        rank[order] = np.arange(len(unique), dtype=np.int32)
+        local = np.full(len(seq), -1, dtype=np.int32)
+        local[present] = rank[inverse]
+        self.address_ids = _readonly(unique[order].astype(np.int32))
+        self.addresses = self.table.addresses(self.address_ids)
+        return local[0::2].copy(), local[1::2].copy()
+
+    def _intern_local(self, records):
+        """id 가 없는 dict 리스트: 주소 문자열로 프레임 안 번호를 매김 (사전 id 는 필요할 때 address_ids 에서)"""
+        address_id = {}
+        from_ids = np.full(len(records), -1, dtype=np.int32)
+        to_ids = np.full(len(records), -1, dtype=np.int32)
+        for i, tx in enumerate(records):
+            sender, receiver = tx.get('from'), tx.get('to')
+            if sender:
+                from_ids[i] = address_id.setdefault(sender, len(address_id))
+            if receiver:
+                to_ids[i] = address_id.setdefault(receiver, len(address_id))
+        self.address_ids = None
+        self.addresses = list(address_id)
+        return from_ids, to_ids
+
+    def __len__(self):
+        return len(self.times)
+
+    @cached_property
+    def tx_hashes(self):
+        """tx 번호별 tx_hash (tx_ids 로 인덱싱)"""
+        if self.columns is not None:
+            txids = self.columns.txids
+            return tuple(txids[t] for t in self.column_txs.tolist())
+        return tuple(self.records[row].get('tx_hash', '') for row in self.tx_first_rows.tolist())
+
+    @cached_property
+    def fees(self):
+        """레코드별 tx 수수료(BTC, 없으면 0)"""
+        if self.columns is not None:
+            return _readonly(self.columns.fee[self.column_txs[self.tx_ids]] / 1e8)
+        return _readonly(np.fromiter((tx.get('fee', 0) or 0 for tx in self.records),
+                                     dtype=np.float64, count=len(self)))
+
+    def timestamps(self, rows):
+        """rows 레코드의 ISO timestamp 문자열 (컬럼 프레임은 block_time 에서 — to_records 와 같은 형식)"""
+        if self.columns is not None:
+            return np.datetime_as_string(self.times[rows].astype("datetime64[s]"), unit="s").tolist()
+        return [self.records[row].get('timestamp', '') for row in np.asarray(rows).tolist()]
+
+    def sender(self, row):
+        """row 레코드의 보낸 주소 (없으면 None)"""
+        local = int(self.from_ids[row])
+        return self.addresses[local] if local >= 0 else None
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    @cached_property
+    def receiver_ids(self):
+        """수신 주소의 주소 사전(table) id, receivers 와 같은 순서"""
+        if self.address_ids is not None:
+            return _readonly(self.address_ids[self._receiver_rows(1)])
+        return _readonly(self.table.intern_many(self.receivers))
+
+    @cached_property
+    def receivers(self):
+        """수신 주소를 처음 등장한 순서대로 (중복 없이, 한 번만 계산)"""
+        return tuple(self.repeated_receivers(1))
+
+    def unique_to_addresses(self):
+        return list(self.receivers)
+
+    def _receiver_rows(self, min_count):
+        """min_count 번 이상 등장한 수신 주소의 프레임 안 번호를 처음 등장한 순서대로"""
+        ids = self.to_ids[self.to_ids >= 0]
+        unique, first, counts = np.unique(ids, return_index=True, return_counts=True)
+        keep = counts >= min_count
+        order = np.argsort(first[keep], kind='stable')
+        return unique[keep][order]
+
+    def repeated_receivers(self, min_count):
+        """min_count 번 이상 등장한 수신 주소를 처음 등장한 순서대로"""
+        return [self.addresses[i] for i in self._receiver_rows(min_count).tolist()]
+
+
+def as_frame(tx_list):
+    """TxFrame 이면 그대로, dict 리스트면 TxFrame 으로 감쌈"""
+    return tx_list if isinstance(tx_list, TxFrame) else TxFrame(tx_list)
@@ -0,0 +1,84 @@
+import numpy as np
+
+from logic.txframe import as_frame
+
+# 분석 한 번에 한 번만 만드는 CSR(압축 행) 트랜잭션 그래프
+# 노드 = 프레임 안 주소 번호(frame.addresses 순서), 엣지 = 레코드 하나 (보낸 주소 → 받은 주소, 가중치 = 금액)
+# 네트워크 BFS, 네트워크 통계, 노드 수 상한 계산이 모두 이 배열을 공유하고,
+# networkx 는 화면에 그릴 작은 서브그래프에만 씀 (logic.graph)
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+def _csr(keys, rows, n_nodes):
+    """keys[rows] 기준으로 rows 를 묶은 (offsets, 정렬된 rows) — 같은 노드 안에서는 레코드 순서 유지"""
+    order = rows[np.argsort(keys[rows], kind="stable")]
+    offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys[rows], minlength=n_nodes), out=offsets[1:])
+    return _readonly(offsets), _readonly(order.astype(np.int32))
+
+
+class TxGraph:
+    """
+    불변 CSR 인접 배열
+        out_offsets[v]:out_offsets[v + 1]   v 에서 나가는 엣지 구간
+        out_targets / out_weights / out_rows  받는 노드(없으면 -1), 금액, 원본 레코드 위치
+        in_offsets / in_sources / in_rows     들어오는 엣지 (보낸 노드 없으면 -1)
+    같은 주소 쌍의 여러 레코드는 엣지 여러 개로 남음 (금액 상위 선택 등은 레코드 단위)
+    """
+
+    def __init__(self, tx_list):
+        frame = as_frame(tx_list)
+        self.frame = frame
+        self.addresses = frame.addresses
+        self.n_nodes = len(self.addresses)
+        self._node_ids = None
+
+        from_ids, to_ids = frame.from_ids, frame.to_ids
+        rows = np.arange(len(frame), dtype=np.int64)
+        self.out_offsets, self.out_rows = _csr(from_ids, rows[from_ids >= 0], self.n_nodes)
+        self.out_targets = _readonly(to_ids[self.out_rows])
+        self.out_weights = _readonly(frame.amounts[self.out_rows])
+        self.in_offsets, self.in_rows = _csr(to_ids, rows[to_ids >= 0], self.n_nodes)
+        self.in_sources = _readonly(from_ids[self.in_rows])
+
+    def __len__(self):
+        return self.n_nodes
+
+    def node_id(self, address):
+        """주소의 노드 번호 (그래프에 없으면 -1)"""
+        if self._node_ids is None:
+            self._node_ids = {a: i for i, a in enumerate(self.addresses)}
+        return self._node_ids.get(address, -1)
+
+    def out_degree(self, node):
+        return int(self.out_offsets[node + 1] - self.out_offsets[node])
+
+    def out_edges(self, node):
+        """(받는 노드, 금액, 레코드 위치) 배열 — 레코드 순서"""
+        start, end = self.out_offsets[node], self.out_offsets[node + 1]
+        return self.out_targets[start:end], self.out_weights[start:end], self.out_rows[start:end]
+
+    def first_incoming_row(self, node):
+        """node 로 들어오는 첫 레코드 위치 (없으면 -1)"""
+        start, end = self.in_offsets[node], self.in_offsets[node + 1]
+        return int(self.in_rows[start]) if end > start else -1
+
+    def stats(self):
+        """네트워크 전체 요약 (get_network_stats)"""
+        receivers = np.count_nonzero(np.diff(self.in_offsets))
+        return {
+            'total_nodes': self.n_nodes,
+            'total_edges': len(self.frame),
+            'unique_recipients': int(receivers),
+            'total_volume': float(self.frame.amounts.sum()),
+            'max_available_nodes': self.n_nodes
+        }
+
+
+def as_graph(tx_list):
+    """TxGraph 면 그대로, TxFrame/dict 리스트면 새로 만듦"""
+    return tx_list if isinstance(tx_list, TxGraph) else TxGraph(tx_list)
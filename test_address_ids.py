@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+주소 사전 테스트 (TxFrame 이 파싱 때의 정수 id 를 이어받는지, 사전 범위/세대 교체, 라벨 조인)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import api.address_ids as address_ids
+from api.address_ids import NO_ADDRESS, address_scope, get_address_table
+from api.columnar import TxColumns
+from api.parser import parse_mempool_transactions
+from logic.preprocess import preprocess
+from logic.labels import LabelIndex
+from logic.txframe import TxFrame
+from logic.exchange_identifier import ExchangeIdentifier
+
+
+def make_tx(txid, ins, outs):
+    return {
+        "txid": txid,
+        "vin": [{"prevout": {"scriptpubkey_address": a, "value": 1}} for a in ins],
+        "vout": [{"scriptpubkey_address": a, "value": 1} for a in outs],
+        "status": {"block_time": 1700000000},
+    }
+
+
+def test_ids_shared_across_parses():
+    table = get_address_table()
+    first = TxColumns.from_esplora([make_tx("x1", ["idsA"], ["idsB"])])
+    second = TxColumns.from_esplora([make_tx("x2", ["idsB"], ["idsC"])])
+    assert first.out_addr[0] == second.in_addr[0] == table.lookup("idsB")
+    assert second.addresses[second.out_addr[0]] == "idsC"
+    assert table.lookup("never-seen") == NO_ADDRESS
+    assert table.intern_many(["idsA", "", None]).tolist() == [table.lookup("idsA"), NO_ADDRESS, NO_ADDRESS]
+    assert table.address(0) == "unknown"
+
+
+def test_frame_reuses_parse_ids():
+    with address_scope() as table:
+        tx_list = preprocess(parse_mempool_transactions([
+            dict(make_tx("y2", ["fA", "fB"], ["fC", "fA"]), status={"block_time": 1700000600}),
+            make_tx("y1", ["fC"], ["fD"]),
+        ]))
+    size = len(table)
+    frame = TxFrame(tx_list)
+    plain = TxFrame([dict(tx) for tx in tx_list])
+    # id 배열에서 만든 프레임 번호가 문자열로 만든 것과 같음
+    assert frame.addresses == plain.addresses
+    assert frame.from_ids.tolist() == plain.from_ids.tolist() and frame.to_ids.tolist() == plain.to_ids.tolist()
+    assert frame.receivers == plain.receivers == ("fD", "fC", "fA")
+    # 파싱 때의 id 를 그대로 — 사전에 다시 넣지 않음
+    assert frame.table is table
+    assert frame.receiver_ids.tolist() == [table.lookup(a) for a in frame.receivers]
+    assert len(table) == size
+
+
+def test_scoped_and_generational_tables():
+    outer = get_address_table()
+    with address_scope() as scoped:
+        columns = TxColumns.from_esplora([make_tx("z1", ["scopeA"], ["scopeB"])])
+        assert get_address_table() is scoped
+    assert get_address_table() is outer and outer.lookup("scopeA") == NO_ADDRESS
+    # 범위가 끝나도 파싱 결과는 자기 사전으로 그대로 읽힘
+    assert columns.to_records()[0]["to"] == "scopeB"
+
+    previous = address_ids.ADDRESS_TABLE_MAX_SIZE
+    address_ids.ADDRESS_TABLE_MAX_SIZE = len(outer)
+    try:
+        outer.intern("one-more-address")
+        assert get_address_table() is not outer
+    finally:
+        address_ids.ADDRESS_TABLE_MAX_SIZE = previous
+
+
+def test_label_join_on_ids():
+    data_dir = tempfile.mkdtemp()
+    with open(os.path.join(data_dir, "blacklist.txt"), "w", encoding="utf-8") as f:
+        f.write("idsBad\n")
+    index = LabelIndex(data_dir, tempfile.mkdtemp())
+    index.refresh()
+    # 라벨 목록은 주소 사전에 들어가지 않음
+    assert get_address_table().lookup("idsBad") == NO_ADDRESS
+
+    frame = TxFrame([{"from": "s", "to": "idsOk", "block_time": 1}, {"from": "s", "to": "idsBad", "block_time": 2}])
+    assert frame.receivers == ("idsOk", "idsBad")
+    assert index.match_ids("blacklist", frame.receiver_ids, frame.table).tolist() == [False, True]
+    assert index.match_ids("mixer", frame.receiver_ids, frame.table).tolist() == [False, False]
+
+
+def test_wallet_clustering_counts():
+    records = [{"from": "hub", "to": f"c{i % 2}", "amount": 2.0} for i in range(4)]
+    records += [{"from": "c0", "to": "hub", "amount": 1.0}]
+    clusters = ExchangeIdentifier.analyze_wallet_clustering(None, records)['clusters']
+    # 첫 행의 수신 주소가 송신 주소보다 먼저 (기존 그룹화 순서)
+    assert [c['address'] for c in clusters] == ["c0", "hub"]
+    assert clusters[0]['transaction_count'] == 3
+    assert clusters[1]['outgoing_count'] == 4 and clusters[1]['incoming_count'] == 1
+    assert clusters[1]['total_volume'] == 9.0
+
+
+if __name__ == "__main__":
+    test_ids_shared_across_parses()
+    test_frame_reuses_parse_ids()
+    test_scoped_and_generational_tables()
+    test_label_join_on_ids()
+    test_wallet_clustering_counts()
+    print("✅ Address id tests passed!")
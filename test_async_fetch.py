@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+비동기 다중 주소 조회 테스트 (get_transaction_data 를 가짜 함수로 교체)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import threading
+import time
+
+import api.async_fetch as async_fetch
+
+_real_get_transaction_data = async_fetch.get_transaction_data
+
+
+def install_fake(delays):
+    state = {"active": 0, "peak": 0, "started": []}
+    lock = threading.Lock()
+
+    def fake(address, max_txs=None):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["started"].append(address)
+        time.sleep(delays.get(address, 0.01))
+        with lock:
+            state["active"] -= 1
+        if address == "bad":
+            return {"error": "Status 500"}
+        return [{"txid": f"{address}-tx", "status": {"block_time": 1700000000},
+                 "vin": [], "vout": [{"scriptpubkey_address": address, "value": 1000}]}]
+
+    async_fetch.get_transaction_data = fake
+    return state
+
+
+def test_results_arrive_as_completed_with_bounded_concurrency():
+    state = install_fake({"slow": 0.3})
+    addresses = ["slow"] + [f"a{i}" for i in range(6)] + ["bad", "a0"]
+
+    async def collect():
+        return [item async for item in async_fetch.fetch_many(addresses, concurrency=3)]
+
+    results = asyncio.run(collect())
+    order = [address for address, _, _ in results]
+
+    assert len(results) == 8  # 중복 a0 제거
+    assert order[-1] == "slow"
+    assert state["peak"] <= 3
+    errors = {address: error for address, _, error in results}
+    assert errors["bad"] == "Status 500"
+    assert results[0][1][0]["to"] in order
+
+
+def test_closing_early_cancels_pending_fetches():
+    state = install_fake({})
+    addresses = [f"a{i}" for i in range(50)]
+
+    async def first_only():
+        async for item in async_fetch.fetch_many(addresses, concurrency=2):
+            return item
+
+    asyncio.run(first_only())
+    time.sleep(0.1)
+    assert len(state["started"]) < len(addresses)
+
+
+def teardown_module(module):
+    async_fetch.get_transaction_data = _real_get_transaction_data
+
+
+if __name__ == "__main__":
+    test_results_arrive_as_completed_with_bounded_concurrency()
+    test_closing_early_cancels_pending_fetches()
+    print("✅ Async fetch tests passed!")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+체인 백엔드 테스트 (녹화 코퍼스를 FixtureBackend / 로컬 Esplora 대역 서버로 서빙)
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import api.fetch as fetch
+from api.backends import ChainBackend, FixtureBackend, EsploraBackend, create_backend, set_backend
+from api.parser import parse_mempool_transactions
+
+ADDRESS = "bc1qfixtureaddress"
+
+
+def esplora_tx(i, confirmed=True):
+    """Esplora 형식의 최소 트랜잭션"""
+    return {
+        "txid": f"{i:064x}",
+        "fee": 1000,
+        "vin": [{"prevout": {"scriptpubkey_address": f"bc1qsender{i}", "value": 60000}}],
+        "vout": [{"scriptpubkey_address": ADDRESS, "value": 50000 + i}],
+        "status": {"confirmed": confirmed, "block_height": 800000 - i if confirmed else None,
+                   "block_time": 1700000000 - i * 600 if confirmed else None},
+    }
+
+
+def make_corpus(n_confirmed=60, n_mempool=2):
+    corpus = tempfile.mkdtemp()
+    os.makedirs(os.path.join(corpus, "address"))
+    history = [esplora_tx(1000 + i, confirmed=False) for i in range(n_mempool)]
+    history += [esplora_tx(i) for i in range(n_confirmed)]
+    with open(os.path.join(corpus, "address", f"{ADDRESS}.json"), "w") as f:
+        json.dump(history, f)
+    return corpus, history
+
+
+def test_fixture_backend_paginates_like_esplora():
+    corpus, history = make_corpus()
+    previous = set_backend(FixtureBackend(corpus))
+    try:
+        txs, stats = fetch.fetch_all_from_mempool(ADDRESS, max_txs=0)
+        assert [tx["txid"] for tx in txs] == [tx["txid"] for tx in history]
+        assert stats["complete"] is True
+        assert stats["pages"] == 3
+        assert fetch.fetch_tip_height() == 800000
+        assert len(fetch.fetch_mempool_txs(ADDRESS)) == 2
+        assert fetch.fetch_all_from_mempool("unknown", max_txs=0)[1]["error"]
+
+        parsed = parse_mempool_transactions(txs)
+        assert len(parsed) == 60  # 미확인 tx 는 block_time 이 없어 제외
+        assert parsed[0]["from"] == "bc1qsender0" and parsed[0]["to"] == ADDRESS
+    finally:
+        set_backend(previous)
+
+
+def test_stub_server_serves_same_shapes():
+    from http.server import ThreadingHTTPServer
+    from api.esplora_stub import make_handler
+
+    corpus, history = make_corpus(n_confirmed=30, n_mempool=0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(FixtureBackend(corpus)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    previous = set_backend(EsploraBackend(f"http://127.0.0.1:{server.server_address[1]}"))
+    try:
+        txs, stats = fetch.fetch_all_from_mempool(ADDRESS, max_txs=0)
+        assert txs == history
+        assert stats["complete"] is True
+    finally:
+        set_backend(previous)
+        server.shutdown()
+        server.server_close()
+
+
+def test_incomplete_backend_fails_on_creation():
+    class NoGetJson(ChainBackend):
+        name = "broken"
+
+    try:
+        NoGetJson()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("backend without get_json was created")
+
+
+def test_backend_host_for_rate_limit_metrics():
+    # 앱 사이드바의 속도 제한 대기는 지금 쓰는 백엔드의 호스트 버킷을 봄
+    assert create_backend("mempool").host == "mempool.space"
+    assert EsploraBackend("http://10.0.0.5:3002/").host == "10.0.0.5:3002"
+    assert FixtureBackend(tempfile.mkdtemp()).host is None
+
+
+if __name__ == "__main__":
+    test_fixture_backend_paginates_like_esplora()
+    test_stub_server_serves_same_shapes()
+    test_incomplete_backend_fails_on_creation()
+    test_backend_host_for_rate_limit_metrics()
+    print("✅ Backend tests passed!")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+헤드리스 배치 CLI 테스트 (녹화 코퍼스로 점수 계산, 체크포인트 이어하기, streamlit 미사용)
+"""
+
+import sys
+import os
+import json
+import tempfile
+import subprocess
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from api.backends import FixtureBackend, set_backend
+from logic.batch import run_batch, read_checkpoint
+from logic.scoring import SCORE_KEYS
+from test_backends import ADDRESS, make_corpus
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_scores_and_resumes():
+    corpus, history = make_corpus(n_confirmed=30, n_mempool=0)
+    out = os.path.join(tempfile.mkdtemp(), "results.jsonl")
+    previous = set_backend(FixtureBackend(corpus))
+    try:
+        counts = run_batch([ADDRESS, "bc1qmissing", ADDRESS], out, workers=0)
+        assert counts == {"ok": 1, "error": 1}
+        records = read_checkpoint(out)
+        record = records[ADDRESS]
+        assert record["tx_count"] == 30
+        assert list(record["scores"]) == SCORE_KEYS
+        assert record["total_score"] == sum(record["scores"].values())
+        assert record["tx_stats"]["tx_count"] == 30
+        assert records["bc1qmissing"]["status"] == "error"
+
+        # 다시 실행하면 끝난 주소는 건너뛰고 error 만 다시 시도 (주소당 한 줄로 정리)
+        counts = run_batch([ADDRESS, "bc1qmissing"], out, workers=0)
+        assert counts == {"error": 1}
+        with open(out, encoding="utf-8") as f:
+            assert sorted(json.loads(line)["address"] for line in f) == sorted([ADDRESS, "bc1qmissing"])
+    finally:
+        set_backend(previous)
+
+
+def test_process_pool_without_streamlit():
+    corpus, _ = make_corpus(n_confirmed=30, n_mempool=0)
+    workdir = tempfile.mkdtemp()
+    addresses = os.path.join(workdir, "addresses.txt")
+    with open(addresses, "w") as f:
+        f.write(f"# case file\n{ADDRESS}\n")
+    out = os.path.join(workdir, "results.jsonl")
+    env = dict(os.environ, CHAIN_BACKEND="fixture", FIXTURE_DIR=corpus, TX_CACHE_ENABLED="0")
+    code = ("import sys; from logic.batch import main; "
+            f"main([{addresses!r}, '--out', {out!r}, '--workers', '2']); "
+            "print('STREAMLIT', 'streamlit' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True,
+                            timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert "STREAMLIT False" in result.stdout
+    assert read_checkpoint(out)[ADDRESS]["status"] == "ok"
+
+
+def test_parquet_without_engine_fails_before_scoring():
+    import logic.batch as batch
+    out = os.path.join(tempfile.mkdtemp(), "results.parquet")
+    original = batch.parquet_engine
+    batch.parquet_engine = lambda: None
+    try:
+        try:
+            run_batch([ADDRESS], out, workers=0)
+        except RuntimeError as e:
+            assert "pyarrow" in str(e)
+        else:
+            raise AssertionError("parquet output without an engine did not fail")
+        assert not os.path.exists(batch.checkpoint_path(out))
+    finally:
+        batch.parquet_engine = original
+
+
+if __name__ == "__main__":
+    test_scores_and_resumes()
+    test_process_pool_without_streamlit()
+    test_parquet_without_engine_fails_before_scoring()
+    print("✅ batch tests passed")
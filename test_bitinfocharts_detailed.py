@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import requests
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
 from bs4 import BeautifulSoup
 import time
+from api.transport import http_get
 
 def analyze_bitinfocharts_page(address):
     """BitInfoCharts 페이지 상세 분석"""
@@ -21,7 +25,7 @@ def analyze_bitinfocharts_page(address):
     
     try:
         print(f"🔍 {address} 분석 중...")
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_get(url, headers=headers, timeout=15)
         
         if response.status_code == 200:
             soup = BeautifulSoup(response.content, 'html.parser')
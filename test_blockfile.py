@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+blk*.dat 직접 읽기 테스트 (합성 블록 파일 사용)
+"""
+
+import sys
+import os
+import struct
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from api.blockfile import (BlockFileIndex, MAINNET, address_to_script, iter_blocks, parse_tx,
+                           script_to_address, segwit_encode, sha256d)
+from api.backends import FixtureBackend
+
+ADDR_A = segwit_encode("bc", 0, bytes(range(20)))            # P2WPKH
+ADDR_B = "1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2"                 # P2PKH
+ADDR_C = segwit_encode("bc", 1, bytes(range(32)))            # P2TR
+
+
+def varint(n):
+    return bytes([n]) if n < 0xFD else b"\xfd" + struct.pack("<H", n)
+
+
+def make_tx(inputs, outputs, witness=False):
+    """inputs: [(prev_txid_hex | None, vout)], outputs: [(value, address)]"""
+    body = varint(len(inputs))
+    for prev, vout in inputs:
+        prev_bytes = bytes.fromhex(prev)[::-1] if prev else bytes(32)
+        body += prev_bytes + struct.pack("<I", vout) + varint(1) + b"\x51" + b"\xff\xff\xff\xff"
+    body += varint(len(outputs))
+    for value, address in outputs:
+        script = address_to_script(address)
+        body += struct.pack("<Q", value) + varint(len(script)) + script
+    version, locktime = struct.pack("<i", 2), bytes(4)
+    txid = sha256d(version + body + locktime)[::-1].hex()
+    if witness:
+        wit = b"".join(varint(1) + varint(3) + b"sig" for _ in inputs)
+        raw = version + b"\x00\x01" + body + wit + locktime
+    else:
+        raw = version + body + locktime
+    return txid, raw
+
+
+def make_block(prev_hash, time, txs):
+    header = struct.pack("<i", 1) + bytes.fromhex(prev_hash)[::-1] + bytes(32) + struct.pack("<III", time, 0, 0)
+    payload = header + varint(len(txs)) + b"".join(raw for _, raw in txs)
+    return sha256d(header)[::-1].hex(), MAINNET + struct.pack("<I", len(payload)) + payload
+
+
+def build_chain(blocks_dir, xor_key=None):
+    cb0 = make_tx([(None, 0xFFFFFFFF)], [(50_0000_0000, ADDR_A)])
+    h0, b0 = make_block("00" * 32, 1700000000, [cb0])
+
+    cb1 = make_tx([(None, 0xFFFFFFFF)], [(50_0000_0000, ADDR_A)])
+    pay = make_tx([(cb0[0], 0)], [(1_0000_0000, ADDR_B), (48_9999_0000, ADDR_A)], witness=True)
+    h1, b1 = make_block(h0, 1700000600, [cb1, pay])
+
+    cb2 = make_tx([(None, 0xFFFFFFFF)], [(50_0000_0000, ADDR_C)])
+    spend = make_tx([(pay[0], 0)], [(9999_0000, ADDR_C)])
+    h2, b2 = make_block(h1, 1700001200, [cb2, spend])
+
+    # 같은 높이 1 의 stale 블록: 여기 있는 B 입금은 최장 체인이 아니므로 빠져야 함
+    stale = make_tx([(cb0[0], 0)], [(7, ADDR_B)])
+    _, b1s = make_block(h0, 1700000650, [make_tx([(None, 0xFFFFFFFF)], [(1, ADDR_C)]), stale])
+
+    # 블록 2 가 블록 1 보다 먼저 저장된 (headers-first 다운로드) 상황
+    data = b0 + b2 + b1 + b1s + bytes(64)
+    if xor_key:
+        with open(os.path.join(blocks_dir, "xor.dat"), "wb") as f:
+            f.write(xor_key)
+        data = bytes(byte ^ xor_key[i % len(xor_key)] for i, byte in enumerate(data))
+    with open(os.path.join(blocks_dir, "blk00000.dat"), "wb") as f:
+        f.write(data)
+    return pay[0], spend[0], stale[0]
+
+
+def test_address_round_trip():
+    for address in (ADDR_A, ADDR_B, ADDR_C, "3JSYBfTap5aCo3iHyUunp8hWZcyCp5V2MJ"):
+        assert script_to_address(address_to_script(address))[0] == address
+    assert segwit_encode("bc", 0, bytes.fromhex("751e76e8199196d454941c45d1b3a323f1433bd6")) == \
+        "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4"
+
+
+def test_segwit_txid_ignores_witness():
+    txid, raw = make_tx([("11" * 32, 0)], [(1000, ADDR_A)], witness=True)
+    parsed_txid, inputs, outputs, vsize, end = parse_tx(raw, 0)
+    assert parsed_txid == txid
+    assert end == len(raw)
+    assert outputs == [(1000, address_to_script(ADDR_A))]
+
+
+def check_index(blocks_dir):
+    pay, spend, stale = build_chain(blocks_dir)
+    index = BlockFileIndex(blocks_dir, watch=[ADDR_B]).scan()
+
+    history = index.history(ADDR_B)
+    assert [tx["txid"] for tx in history] == [spend, pay]
+    assert stale not in index.txs
+    assert index.tip_height == 2
+    assert history[0]["status"]["block_height"] == 2
+    assert history[1]["vin"][0]["prevout"] == {"scriptpubkey_type": "v0_p2wpkh", "value": 50_0000_0000,
+                                               "scriptpubkey_address": ADDR_A}
+    assert history[1]["fee"] == 10000
+    assert history[0]["vin"][0]["prevout"]["scriptpubkey_address"] == ADDR_B
+
+    records = index.records(ADDR_B)
+    assert {(r["from"], r["to"], r["amount"]) for r in records} >= {(ADDR_A, ADDR_B, 1.0), (ADDR_B, ADDR_C, 0.9999)}
+    return index
+
+
+def test_scan_builds_address_index():
+    check_index(tempfile.mkdtemp())
+
+
+def test_obfuscated_block_files_and_corpus_export():
+    blocks_dir = tempfile.mkdtemp()
+    build_chain(blocks_dir, xor_key=bytes.fromhex("0123456789abcdef"))
+    index = BlockFileIndex(blocks_dir, watch=[ADDR_B]).scan()
+    assert len(index.history(ADDR_B)) == 2
+    # 파일 전체가 아니라 블록 하나씩만 풀어서 넘김 (블록 길이가 8 의 배수가 아니어도 키 위치가 맞아야 함)
+    blocks = list(iter_blocks(blocks_dir))
+    file_size = os.path.getsize(os.path.join(blocks_dir, "blk00000.dat"))
+    assert len(blocks) == 4 and all(len(buf) < file_size / 2 for *_, buf, _, _ in blocks)
+    assert [block[0] for block in blocks] == [MAINNET] * 4
+
+    corpus = tempfile.mkdtemp()
+    index.write_corpus(corpus, addresses=[ADDR_B])
+    status, page, _ = FixtureBackend(corpus).get_json(f"/address/{ADDR_B}/txs")
+    assert status == 200 and page == index.history(ADDR_B)
+
+
+if __name__ == "__main__":
+    test_address_round_trip()
+    test_segwit_txid_ignores_witness()
+    test_scan_builds_address_index()
+    test_obfuscated_block_files_and_corpus_export()
+    print("✅ Block file tests passed!")
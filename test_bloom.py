@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+mmap 라벨 필터 테스트 (Bloom + 정렬 주소 배열, 오탐 없음)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logic.bloom import LabelFilter, build_filter, filter_params
+from logic.labels import LabelIndex
+
+
+def make_entries(n):
+    return {f"1Feed{i:07d}": ("Sanctions" if i % 3 else "Abuse") for i in range(n)}
+
+
+def test_lookup_exact():
+    entries = make_entries(5000)
+    entries["bc1qlonger0000000000000000000000000000000000"] = "Sanctions"
+    path = build_filter(entries, os.path.join(tempfile.mkdtemp(), "blacklist.lbf"), fp_rate=0.01)
+    label_filter = LabelFilter(path)
+
+    assert len(label_filter) == len(entries)
+    assert all(address in label_filter for address in entries)
+    assert label_filter["1Feed0000003"] == "Abuse"
+    assert label_filter.get("1Feed0000004") == "Sanctions"
+    assert label_filter["bc1qlonger0000000000000000000000000000000000"] == "Sanctions"
+
+    # Bloom 오탐이 생겨도 정렬 배열 확인으로 걸러짐
+    misses = [f"1Miss{i:07d}" for i in range(5000)] + ["1Feed000000", "1Feed00000001x"]
+    assert not label_filter.contains_many(misses).any()
+    assert label_filter.get("1Miss0000001") is None
+    assert 123 not in label_filter
+    assert sorted(label_filter)[:2] == ["1Feed0000000", "1Feed0000001"]
+
+
+def test_params():
+    m_bits, k = filter_params(1_000_000, 0.001)
+    # 원소당 약 14.4 비트, 해시 10 개
+    assert 14 * 1_000_000 < m_bits < 15 * 1_000_000
+    assert k == 10
+
+
+def test_label_index_uses_filter():
+    data_dir, filter_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+    with open(os.path.join(data_dir, "blacklist.txt"), "w", encoding="utf-8") as f:
+        f.write("1TxtOnly\n")
+    build_filter({"1Feed": "blacklist", "bc1qmix": "blacklist"}, os.path.join(filter_dir, "blacklist.lbf"),
+                 category="blacklist")
+    build_filter({"bc1qmix": "Wasabi (OXT)"}, os.path.join(filter_dir, "mixer.lbf"), category="mixer")
+
+    index = LabelIndex(data_dir, filter_dir)
+    blacklist = index.category("blacklist")
+    assert "1Feed" in blacklist and "1TxtOnly" not in blacklist
+    assert index.missing("blacklist") == []
+    assert index.labels("bc1qmix") == (("blacklist", "blacklist"), ("mixer", "Wasabi (OXT)"))
+    assert index.labels("1Nobody") == ()
+
+
+if __name__ == "__main__":
+    test_lookup_exact()
+    test_params()
+    test_label_index_uses_filter()
+    print("✅ Bloom filter tests passed!")
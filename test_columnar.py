@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+컬럼형 파서 테스트 (기존 from×to 레코드와 동일한 결과인지 확인)
+"""
+
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from api.parser import parse_mempool_columns, parse_mempool_transactions
+
+
+def legacy_parse(txs):
+    """columnar 도입 전 parse_mempool_transactions 의 펼치기 규칙"""
+    tx_list = []
+    for tx in txs:
+        timestamp = tx.get("status", {}).get("block_time")
+        if not timestamp:
+            continue
+        dt = datetime.utcfromtimestamp(timestamp)
+        from_addresses = [i["prevout"]["scriptpubkey_address"] for i in tx.get("vin", [])
+                          if i.get("prevout") and "scriptpubkey_address" in i["prevout"]]
+        for out in tx.get("vout", []):
+            to = out.get("scriptpubkey_address")
+            if not to:
+                continue
+            for from_addr in from_addresses or ["unknown"]:
+                tx_list.append({"timestamp": dt.isoformat(), "amount": round(out.get("value", 0) / 1e8, 8),
+                                "from": from_addr, "to": to, "tx_hash": tx.get("txid", ""),
+                                "fee": tx.get("fee", 0) / 1e8 if tx.get("fee") else 0})
+    return tx_list
+
+
+def make_tx(txid, ins, outs, block_time=1700000000, fee=1234):
+    return {
+        "txid": txid,
+        "fee": fee,
+        "vin": [{"prevout": {"scriptpubkey_address": a, "value": v}} for a, v in ins],
+        "vout": [{"scriptpubkey_address": a, "value": v} if a else {"value": v} for a, v in outs],
+        "status": {"confirmed": bool(block_time), "block_time": block_time},
+    }
+
+
+SAMPLE = [
+    make_tx("t1", [("a", 5000), ("b", 7000)], [("c", 3000), (None, 0), ("a", 8000)]),
+    make_tx("t2", [], [("d", 123456789)], fee=0),
+    make_tx("t3", [("a", 10)], [("e", 1)], block_time=None),
+    {"txid": "cb", "vin": [{"is_coinbase": True, "prevout": None}], "vout": [{"scriptpubkey_address": "f", "value": 1}],
+     "status": {"block_time": 1700000600}},
+    make_tx("t4", [("b", 1), ("b", 2)], [("g", 3)], block_time=1700001200),
+]
+
+
+def legacy_fields(records):
+    return [{k: v for k, v in r.items() if k not in ("io", "block_time", "block_height")} for r in records]
+
+
+def test_records_match_legacy_expansion():
+    assert legacy_fields(parse_mempool_transactions(SAMPLE)) == legacy_parse(SAMPLE)
+    assert legacy_fields(parse_mempool_transactions({"txs": SAMPLE})) == legacy_parse(SAMPLE)
+    assert parse_mempool_transactions([]) == []
+
+
+def test_io_table_is_shared_per_transaction():
+    records = parse_mempool_transactions(SAMPLE)
+    t1_rows = [r for r in records if r["tx_hash"] == "t1"]
+    assert len(t1_rows) == 4
+    assert all(r["io"] is t1_rows[0]["io"] for r in t1_rows)
+    io = t1_rows[0]["io"]
+    assert io["n_inputs"] == 2 and io["n_outputs"] == 3
+    assert io["output_values"] == [3000, 0, 8000]
+    assert io["input_values"] == [5000, 7000]
+
+    coinbase = next(r for r in records if r["tx_hash"] == "cb")
+    assert coinbase["io"]["input_types"] == ["coinbase"] and coinbase["from"] == "unknown"
+
+
+def test_coinjoin_is_stored_linearly():
+    ins = [(f"in{i}", 100000) for i in range(50)]
+    outs = [(f"out{i}", 99000) for i in range(50)]
+    columns = parse_mempool_columns([make_tx("cj", ins, outs)])
+
+    assert len(columns.in_tx) == 50 and len(columns.out_tx) == 50
+    assert columns.n_edges == 2500
+    edges = columns.edges()
+    assert len(edges["src"]) == 2500
+    assert columns.addresses[edges["src"][1]] == "in1"
+    assert columns.addresses[edges["dst"][50]] == "out1"
+    assert columns.block_time.dtype.kind == "i" and columns.out_value.dtype.name == "int64"
+
+
+def test_mixer_detection_sees_equal_output_coinjoin():
+    from logic.detection import mixer_detection_score
+    from logic.preprocess import preprocess
+
+    whirlpool = make_tx("wp", [(f"in{i}", 1_050_000) for i in range(5)],
+                        [(f"out{i}", 1_000_000) for i in range(5)])
+    payment = make_tx("pay", [(f"p{i}", 500) for i in range(4)], [(f"q{i}", 100 + i) for i in range(4)],
+                      block_time=1700000600)
+    tx_list = preprocess(parse_mempool_transactions([whirlpool, payment]))
+
+    score, indicators = mixer_detection_score(tx_list)
+    assert "다중 I/O 패턴: 2개 트랜잭션" in indicators
+    assert "동일 금액 출력 CoinJoin: 1개 트랜잭션" in indicators
+    assert score >= 20
+
+
+if __name__ == "__main__":
+    test_records_match_legacy_expansion()
+    test_io_table_is_shared_per_transaction()
+    test_coinjoin_is_stored_linearly()
+    test_mixer_detection_sees_equal_output_coinjoin()
+    print("✅ Columnar parser tests passed!")
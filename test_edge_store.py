@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+엣지 저장소 테스트 (append-only 추가, 주소 주변 레코드 복원, TTL, compact)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from api.edge_store import EdgeStore
+from api.parser import parse_mempool_transactions
+
+KEYS = ("timestamp", "block_time", "amount", "from", "to", "tx_hash", "fee")
+
+
+def esplora_tx(i, inputs, outputs):
+    return {"txid": f"{i:064x}", "fee": 700,
+            "vin": [{"prevout": {"scriptpubkey_address": a, "value": v}} for a, v in inputs],
+            "vout": [{"scriptpubkey_address": a, "value": v} for a, v in outputs],
+            "status": {"confirmed": True, "block_height": 800000 + i, "block_time": 1700000000 + i * 600}}
+
+
+def records():
+    return parse_mempool_transactions([
+        esplora_tx(2, [("hub", 90000)], [("x", 30000), ("x", 30000), ("y", 29300)]),
+        esplora_tx(1, [("a", 50000), ("b", 50000)], [("hub", 99300)]),
+    ])
+
+
+def test_append_and_neighborhood_roundtrip():
+    store = EdgeStore(":memory:")
+    history = records()
+    assert store.neighborhood("hub") is None
+    assert store.append("hub", history) == len(history)
+    # 이미 있는 tx 는 다시 넣지 않음
+    assert store.append("hub", history) == 0
+
+    restored = store.neighborhood("hub")
+    expected = sorted(({k: tx[k] for k in KEYS} for tx in history), key=lambda tx: tx["block_time"])
+    assert restored == expected
+    # 같은 tx 안의 같은 (보낸, 받은, 금액) 레코드 두 개도 그대로
+    assert sum(1 for tx in restored if tx["to"] == "x") == 2
+
+    assert [peer for peer, *_ in store.edges("hub", "in")] == ["a", "b"]
+    assert [(peer, value) for peer, _, _, value in store.edges("hub", "out")] == [("x", 0.0003), ("x", 0.0003),
+                                                                                ("y", 0.000293)]
+
+
+def test_ttl_and_compact():
+    path = os.path.join(tempfile.mkdtemp(), "edges.sqlite")
+    store = EdgeStore(path, ttl=3600)
+    store.append("hub", records())
+    assert store.neighborhood("hub", max_age=1e-9) is None
+    assert len(store.neighborhood("hub")) == 5
+
+    # 동시에 쓰다 생긴 중복을 흉내 — compact 가 (tx_hash, ord) 기준으로 정리
+    store._conn.execute("INSERT INTO edge SELECT * FROM edge")
+    store._conn.commit()
+    assert store.summary()["edges"] == 10
+    assert len(store.neighborhood("hub")) == 5
+    assert store.compact() == 5
+    assert store.summary()["edges"] == 5
+
+    reopened = EdgeStore(path, ttl=3600)
+    assert len(reopened.neighborhood("hub")) == 5
+
+
+def test_truncated_history_is_miss_when_more_is_needed():
+    store = EdgeStore(":memory:")
+    history = records()  # tx 2개
+    # 상한 2 로 가져와 2개가 나옴 → 잘렸을 수 있는 히스토리
+    store.append("hub", history, max_txs=2)
+    assert store.expanded_entry("hub")["complete"] is False
+    assert store.neighborhood("hub") is None
+    assert store.neighborhood("hub", min_txs=5000) is None
+    assert len(store.neighborhood("hub", min_txs=2)) == 5
+
+    # 상한보다 적게 나왔으면 전체 히스토리
+    store.append("hub", history, max_txs=200)
+    assert store.expanded_entry("hub")["complete"] is True
+    assert len(store.neighborhood("hub", min_txs=5000)) == 5
+
+
+def test_old_store_file_gains_completeness_columns():
+    import sqlite3
+    path = os.path.join(tempfile.mkdtemp(), "edges.sqlite")
+    conn = sqlite3.connect(path)
+    conn.executescript("CREATE TABLE expanded (address_id INTEGER PRIMARY KEY, n_records INTEGER NOT NULL, "
+                       "fetched_at REAL NOT NULL); INSERT INTO expanded VALUES (1, 5, 1e12);"
+                       "CREATE TABLE address (id INTEGER PRIMARY KEY, address TEXT NOT NULL UNIQUE);"
+                       "INSERT INTO address VALUES (1, 'hub');")
+    conn.close()
+    store = EdgeStore(path, ttl=0)
+    # 상한을 모르는 예전 기록은 잘린 것으로 보고 다시 조회
+    assert store.expanded_entry("hub") == {"fetched_at": 1e12, "complete": False, "max_txs": 0}
+    assert store.neighborhood("hub", min_txs=200) is None
+
+
+if __name__ == "__main__":
+    test_append_and_neighborhood_roundtrip()
+    test_ttl_and_compact()
+    test_truncated_history_is_miss_when_more_is_needed()
+    test_old_store_file_gains_completeness_columns()
+    print("✅ edge store tests passed")
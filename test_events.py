@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로직 알림 통로 테스트 (구독/콘솔 출력, 탐지 워커 스레드 전달, logic/ 의 streamlit 비의존)
+"""
+
+import sys
+import os
+import subprocess
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logic.events import emit, listening, has_listeners
+from logic.registry import Detector, DetectorRegistry
+from logic.scoring import AnomalyScores
+from test_scoring import make_records
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_listening_scopes_sinks():
+    received = []
+    with listening(received.append):
+        assert has_listeners()
+        emit("warning", "⚠️ inside", source="test", path="x")
+    assert not has_listeners()
+    emit("info", "outside", source="test")
+    assert [(e.level, e.message, e.data) for e in received] == [("warning", "⚠️ inside", {"path": "x"})]
+
+
+def test_worker_thread_events_reach_caller():
+    def noisy(name):
+        def detector(frame):
+            emit("warning", f"{name} {len(frame)}", source="test")
+            return 0, []
+        return detector
+
+    registry = DetectorRegistry([Detector(key, noisy(key), key, 1, cost="io") for key in ("a", "b", "c")])
+    received = []
+    with listening(received.append):
+        AnomalyScores(make_records(), registry=registry, workers=2).run()
+    assert sorted(e.message for e in received) == ["a 12", "b 12", "c 12"]
+
+
+def test_logic_does_not_import_streamlit():
+    code = ("import sys; import logic.scoring, logic.detection, logic.exchange_identifier, "
+            "logic.exchange_pattern_analyzer; "
+            "print(sorted(m for m in ('streamlit', 'pandas') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("[]")
+
+
+def test_streamlit_sink_switches_and_restores_session():
+    import threading
+    import types
+    import ui.events as ui_events
+
+    def fake_ctx(name):
+        return types.SimpleNamespace(name=name, pages_manager=types.SimpleNamespace(main_script_hash=name))
+
+    a, b = fake_ctx("a"), fake_ctx("b")
+    drawn = []
+    render = ui_events._render
+    ui_events._render = lambda event: drawn.append((event.message, ui_events.get_script_run_ctx().name))
+    try:
+        ui_events.add_script_run_ctx(threading.current_thread(), a)
+        sink_a = ui_events.streamlit_sink()
+        ui_events.add_script_run_ctx(threading.current_thread(), b)
+        sink_b = ui_events.streamlit_sink()
+
+        def worker():
+            # 세션 A 이벤트를 그린 뒤에도 풀 스레드에 A 컨텍스트가 남지 않아야 B 이벤트가 B 화면으로 감
+            with listening(sink_a):
+                emit("info", "from a")
+            assert ui_events.get_script_run_ctx(suppress_warning=True) is None
+            with listening(sink_b):
+                emit("info", "from b")
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    finally:
+        ui_events._render = render
+        delattr(threading.current_thread(), ui_events.SCRIPT_RUN_CONTEXT_ATTR_NAME)
+    assert drawn == [("from a", "a"), ("from b", "b")]
+
+
+if __name__ == "__main__":
+    test_listening_scopes_sinks()
+    test_worker_thread_events_reach_caller()
+    test_logic_does_not_import_streamlit()
+    test_streamlit_sink_switches_and_restores_session()
+    print("✅ events tests passed")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+mempool.space 페이지네이션 테스트 (네트워크 없이 _get_json 을 가짜 응답으로 교체)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import api.fetch as fetch
+
+_real_get_json = fetch._get_json
+
+
+def make_history(n_confirmed, n_mempool=0):
+    """최신순 정렬된 가짜 트랜잭션 히스토리"""
+    mempool = [{"txid": f"m{i}", "status": {"confirmed": False}} for i in range(n_mempool)]
+    chain = [{"txid": f"c{i}", "status": {"confirmed": True, "block_time": 1700000000 - i * 600}}
+             for i in range(n_confirmed)]
+    return mempool, chain
+
+
+def install_fake_api(mempool, chain):
+    calls = []
+
+    def fake_get_json(url):
+        calls.append(url)
+        page_size = fetch.MEMPOOL_CHAIN_PAGE_SIZE
+        if "/txs/chain/" in url:
+            last = url.rsplit("/", 1)[1]
+            idx = next(i for i, tx in enumerate(chain) if tx["txid"] == last) + 1
+            page = chain[idx:idx + page_size]
+        else:
+            page = mempool + chain[:page_size]
+        return 200, page, 100 * len(page)
+
+    fetch._get_json = fake_get_json
+    return calls
+
+
+def test_follows_chain_cursor_until_exhausted():
+    mempool, chain = make_history(60, n_mempool=3)
+    calls = install_fake_api(mempool, chain)
+
+    txs, stats = fetch.fetch_all_from_mempool("addr", max_txs=0)
+
+    assert [tx["txid"] for tx in txs] == [tx["txid"] for tx in mempool + chain]
+    assert stats["pages"] == 3
+    assert stats["complete"] is True
+    assert stats["bytes"] == 100 * len(txs)
+    assert calls[1].endswith("/txs/chain/c24")
+    assert calls[2].endswith("/txs/chain/c49")
+
+
+def test_max_txs_budget_stops_pagination():
+    mempool, chain = make_history(200)
+    calls = install_fake_api(mempool, chain)
+
+    txs, stats = fetch.fetch_all_from_mempool("addr", max_txs=30)
+
+    assert len(txs) == 30
+    assert stats["complete"] is False
+    assert len(calls) == 2
+
+
+def test_pages_are_streamed():
+    mempool, chain = make_history(50)
+    install_fake_api(mempool, chain)
+
+    pages = fetch.iter_mempool_pages("addr", max_txs=0)
+    first = next(pages)
+    assert len(first) == fetch.MEMPOOL_CHAIN_PAGE_SIZE
+
+
+def teardown_module(module):
+    fetch._get_json = _real_get_json
+
+
+if __name__ == "__main__":
+    test_follows_chain_cursor_until_exhausted()
+    test_max_txs_budget_stops_pagination()
+    test_pages_are_streamed()
+    print("✅ Pagination tests passed!")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+실시간 다중 hop 확장 테스트 (녹화 코퍼스에서 이웃 주소를 hop 별로 조회)
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from api.backends import FixtureBackend, set_backend
+from api.edge_store import EdgeStore
+from logic.frontier import FrontierExpansion
+from logic.graph import expand_network
+
+# (보낸 주소, 받은 주소, 금액 sat)
+TRANSFERS = [
+    ("A", "B1", 500000), ("A", "B2", 300000), ("A", "B3", 100000),
+    ("B1", "C1", 400000), ("B2", "C2", 200000), ("B1", "A", 1000),
+    ("C1", "D1", 300000),
+]
+
+
+def make_corpus():
+    corpus = tempfile.mkdtemp()
+    os.makedirs(os.path.join(corpus, "address"))
+    histories = {}
+    for i, (sender, receiver, value) in enumerate(TRANSFERS):
+        tx = {"txid": f"{i:064x}", "fee": 500,
+              "vin": [{"prevout": {"scriptpubkey_address": sender, "value": value + 500}}],
+              "vout": [{"scriptpubkey_address": receiver, "value": value}],
+              "status": {"confirmed": True, "block_height": 800000 + i, "block_time": 1700000000 + i * 600}}
+        for address in (sender, receiver):
+            histories.setdefault(address, []).insert(0, tx)
+    for address, history in histories.items():
+        with open(os.path.join(corpus, "address", f"{address}.json"), "w") as f:
+            json.dump(history, f)
+    return corpus
+
+
+def run(corpus=None, **kwargs):
+    previous = set_backend(FixtureBackend(corpus or make_corpus()))
+    try:
+        return list(FrontierExpansion("A", **kwargs).run())
+    finally:
+        set_backend(previous)
+
+
+def test_expands_hop_by_hop_without_duplicates():
+    results = run(max_hops=3)
+    assert [r.hop for r in results] == [0, 1, 2, 3]
+    assert results[1].fetched == ["B1", "B2", "B3"]  # 거래량 순
+    assert sorted(results[2].fetched) == ["C1", "C2"]
+    assert results[3].fetched == ["D1"] and results[3].exhausted is None
+    final = results[-1]
+    # 여러 주소 히스토리에 같이 나온 tx 도 한 번만
+    assert len(final.records) == len(TRANSFERS)
+    assert final.hop_of == {"A": 0, "B1": 1, "B2": 1, "B3": 1, "C1": 2, "C2": 2, "D1": 3}
+
+    # 확장한 그래프에서는 hop 2 이상도 실제 거래로 이어짐
+    graph = final.graph()
+    visited, edges = expand_network(graph, graph.node_id("A"), 3)
+    assert graph.node_id("D1") in visited
+    assert (graph.node_id("C1"), graph.node_id("D1")) in edges
+
+
+def test_fanout_and_budgets():
+    results = run(max_hops=3, fanout=1)
+    assert results[1].fetched == ["B1"] and results[2].fetched == ["C1"]
+
+    results = run(max_hops=3, max_addresses=2)
+    assert results[1].fetched == ["B1", "B2"]
+    assert results[-1].exhausted == "max_addresses"
+
+    results = run(max_hops=3, max_txs=4)
+    assert len(results[-1].records) == 4 and results[-1].exhausted == "max_txs"
+
+    results = run(max_hops=5)
+    assert results[-1].hop == 3 and results[-1].exhausted == "no_neighbors"
+
+
+def test_repeat_case_served_from_edge_store():
+    store = EdgeStore(":memory:")
+    first = run(max_hops=3, store=store)[-1]
+    # 두 번째는 빈 코퍼스(네트워크에 아무것도 없음)여도 저장소에서 같은 이웃이 나옴
+    empty = tempfile.mkdtemp()
+    os.makedirs(os.path.join(empty, "address"))
+    expansion = FrontierExpansion("A", max_hops=3, store=store)
+    previous = set_backend(FixtureBackend(empty))
+    try:
+        second = list(expansion.run())[-1]
+    finally:
+        set_backend(previous)
+    assert second.hop_of == first.hop_of and not second.errors
+    assert expansion.store_hits == len(first.hop_of)
+    key = lambda tx: (tx["tx_hash"], tx["from"], tx["to"])
+    assert sorted(map(key, second.records)) == sorted(map(key, first.records))
+
+
+def test_truncated_neighbors_refetched_with_larger_budget():
+    store = EdgeStore(":memory:")
+    corpus = make_corpus()
+    # 이웃마다 tx 1개로 잘라서 가져옴 → 저장소에는 잘린 히스토리로 기록
+    first = run(corpus, max_hops=3, store=store, txs_per_address=1)[-1]
+    assert len(first.records) < len(TRANSFERS)
+
+    expansion = FrontierExpansion("A", max_hops=3, store=store)
+    previous = set_backend(FixtureBackend(corpus))
+    try:
+        second = list(expansion.run())[-1]
+    finally:
+        set_backend(previous)
+    # 시작 주소만 저장소에서, 잘린 이웃들은 다시 조회해서 전체 레코드
+    assert expansion.store_hits == 1
+    assert len(second.records) == len(TRANSFERS)
+
+
+if __name__ == "__main__":
+    test_expands_hop_by_hop_without_duplicates()
+    test_fanout_and_budgets()
+    test_repeat_case_served_from_edge_store()
+    test_truncated_neighbors_refetched_with_larger_budget()
+    print("✅ frontier tests passed")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+증분 재채점 테스트 (블록 단위로 update / merge 한 결과가 전체 재계산과 같은지 확인)
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from api.cache import TxCache
+from logic.detection import amount_anomaly_score
+from logic.incremental import DetectorState, load_state, rescore_address
+from logic.registry import BUILTIN_DETECTORS, Detector, DetectorRegistry
+from logic.scoring import AnomalyScores
+from logic.sketch import HeavyHitters, KLLSketch
+
+BASE = 1700000000
+
+
+def make_records(n=150, seed=7):
+    rng = random.Random(seed)
+    records, t = [], BASE
+    for i in range(n):
+        t += rng.choice([5, 20, 45, 300, 4000])
+        io = {"n_inputs": 5, "n_outputs": 5, "output_values": [7] * 5} if i % 17 == 0 else None
+        record = {"timestamp": "", "block_time": t, "block_height": 800000 + i // 4, "from": f"s{rng.randrange(4)}",
+                  "to": rng.choice(["bc1qhot", "1dest", f"1once{i}", "3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy"]),
+                  "tx_hash": f"t{i // 2}", "fee": 0.0001}
+        if i == 100:
+            record["to"] = "12t9YDPgwueZ9NyMgw519p7AA8isjr6SMw"  # data/blacklist.txt
+        if i % 9:
+            record["amount"] = rng.choice([0.5, 0.5, 1.25, 3.0, 2500000.0, 10.0 * i])
+        if io:
+            record["io"] = io
+        records.append(record)
+    return records
+
+
+def without_order(results):
+    # 집합에서 만든 지표 목록은 순서가 정해져 있지 않음
+    results = dict(results)
+    results.pop("detector_timings", None)
+    for key in ("mixer_indicators", "cross_chain_indicators", "laundering_indicators"):
+        results[key] = sorted(results[key])
+    return results
+
+
+def test_update_matches_full_recompute():
+    records = make_records()
+    expected = without_order(AnomalyScores(records).results())
+
+    state = DetectorState()
+    for start in range(0, len(records), 23):
+        state.update(records[start:start + 23])
+    assert without_order(state.results()) == expected
+
+    assert without_order(DetectorState.from_transactions(records[:1]).results()) == \
+        without_order(AnomalyScores(records[:1]).results())
+
+
+def test_merge_matches_full_recompute():
+    records = make_records(120, seed=3)
+    left = DetectorState.from_transactions(records[:50])
+    right = DetectorState.from_transactions(records[50:])
+    merged = left.merge(right)
+    assert without_order(merged.results()) == without_order(AnomalyScores(records).results())
+    assert merged.n_rows == 120
+
+
+def test_sketch_error_bounded():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(0, 2, 200000)
+    sketch = KLLSketch()
+    for chunk in np.array_split(values, 37):
+        sketch.update(chunk)
+    assert not sketch.exact and sketch.n == len(values)
+    assert sum(len(level) for level in sketch.levels) < 4 * sketch.k
+    for q in (0.25, 0.5, 0.75):
+        estimate = sketch.quantile(q)
+        true_rank = np.count_nonzero(values <= estimate) / len(values)
+        assert abs(true_rank - q) < 0.02, (q, true_rank)
+
+    small = KLLSketch().update([3.0, 1.0, 2.0, 10.0])
+    assert np.allclose(small.quantile([0.25, 0.75]), np.quantile([3.0, 1.0, 2.0, 10.0], [0.25, 0.75]))
+
+
+def test_state_roundtrip_and_rescore():
+    records = make_records()
+    state = DetectorState.from_transactions(records[:80])
+    restored = DetectorState.from_bytes(state.to_bytes())
+    assert without_order(restored.results()) == without_order(state.results())
+
+    cache = TxCache(":memory:")
+    rescore_address("watched", records[:80], cache=cache)
+    saved = load_state("watched", cache=cache)
+    assert saved.n_rows == 80
+    # 다음 블록: 전체 히스토리를 다시 넘겨도 새 행만 더해짐
+    results = rescore_address("watched", records, cache=cache)
+    assert load_state("watched", cache=cache).n_rows == len(records)
+    assert without_order(results) == without_order(AnomalyScores(records).results())
+    assert rescore_address("watched", records, cache=cache) == results
+    cache.reset("watched")
+    assert load_state("watched", cache=cache) is None
+
+
+def test_rescore_with_non_monotonic_block_times():
+    # block_time 은 MTP 규칙상 앞 블록보다 이를 수 있음 — 높이로 거르면 늦게 온 블록도 빠지지 않음
+    cache = TxCache(":memory:")
+    blocks = [(800000, BASE + 1000), (800001, BASE + 2000), (800002, BASE + 1990)]
+    history = []
+    for height, t in blocks:
+        history.append({"timestamp": "", "block_time": t, "block_height": height, "amount": 1.0,
+                        "from": "s", "to": f"r{height}", "tx_hash": f"h{height}"})
+        rescore_address("watched", history, cache=cache)
+        assert load_state("watched", cache=cache).n_rows == len(history)
+    # 미확인 tx(높이 없음)는 넣지 않고, 같은 블록의 새 tx 는 넣음
+    state = load_state("watched", cache=cache)
+    pending = {"timestamp": "", "block_time": BASE + 3000, "amount": 1.0, "from": "s", "to": "r", "tx_hash": "p"}
+    late = dict(history[-1], tx_hash="h800002b")
+    assert state.unseen(history + [pending, late]) == [late]
+
+
+def test_rescore_frames_only_new_rows():
+    # 재채점은 새 행만 TxFrame 으로 만듦 (전체 히스토리 프레임 없음) — 플러그인도 새 행만 받음
+    import logic.txframe as txframe
+
+    records = make_records(400)
+    registry = DetectorRegistry(BUILTIN_DETECTORS + [
+        Detector("row_count", lambda frame: (len(frame), len(frame)), "Row Count", 1000,
+                 fields=("row_count_score", "row_count_rows")),
+    ])
+    cache = TxCache(":memory:")
+    rescore_address("watched", records[:390], cache=cache)
+    sizes = []
+    original = txframe.TxFrame.__init__
+
+    def counting_init(self, tx_list):
+        sizes.append(len(tx_list))
+        original(self, tx_list)
+
+    txframe.TxFrame.__init__ = counting_init
+    try:
+        state = load_state("watched", cache=cache)
+        new_rows = state.unseen(records)
+        state.update(new_rows)
+        results = state.results(new_rows, registry=registry)
+        rescore_address("watched", records, cache=cache)
+        plain = state.results(records)
+    finally:
+        txframe.TxFrame.__init__ = original
+    assert len(new_rows) == 10 and max(sizes) == 10
+    assert results["row_count_rows"] == 10 and plain["total_score"] == results["total_score"] - 10
+
+
+def test_sketch_serialize_and_merge_shards():
+    rng = np.random.default_rng(1)
+    shards = [rng.normal(100, 10, 30000) for _ in range(4)]
+    merged = KLLSketch()
+    for shard in shards:
+        merged.merge(KLLSketch.from_bytes(KLLSketch().update(shard).to_bytes()))
+    assert merged.n == 120000
+    assert len(merged.to_bytes()) < 64 * merged.k
+    q1, q3 = merged.quantile([0.25, 0.75])
+    true_q1, true_q3 = np.quantile(np.concatenate(shards), [0.25, 0.75])
+    assert abs(q1 - true_q1) < 1.0 and abs(q3 - true_q3) < 1.0
+
+    # 전체 히스토리 스케치로 최근 tx 만 판정
+    recent = [{"amount": a, "block_time": BASE + i} for i, a in enumerate([100.0, 101.0, 180.0])]
+    assert amount_anomaly_score(recent, sketch=merged) == (5, [180.0])
+    assert amount_anomaly_score(recent)[0] == 0
+
+
+def test_state_size_bounded():
+    # 매번 다른 수신 주소/금액이 섞여 있어도 저장 크기와 요약 크기는 히스토리 길이와 무관
+    sizes = []
+    for n in (3000, 20000):
+        records = make_records(n)
+        state = DetectorState()
+        for start in range(0, n, 500):
+            state.update(records[start:start + 500])
+        assert len(state.receivers) <= state.receivers.k and len(state.amount_counts) <= state.amount_counts.k
+        assert len(state.short_intervals) <= 128 and state.n_short > 128
+        sizes.append(len(state.to_bytes()))
+        results = state.results()
+        # 자주 나온 수신 주소/금액과 블랙리스트 매칭은 남음
+        assert results["address_score"] == 15 and results["blacklist_flag"]
+        assert results["interval_score"] == 25
+        restored = DetectorState.from_bytes(state.to_bytes())
+        assert without_order(restored.results()) == without_order(results)
+    assert sizes[1] <= sizes[0] * 1.2 and sizes[1] < 16 * 1024
+
+
+def test_heavy_hitters_exact_until_full():
+    summary = HeavyHitters(k=4).update(["a", "b", "a", "c"], orders=[0, 1, 2, 3])
+    assert summary.count("a") == 2 and summary.error == 0 and summary.entries["a"][1] == 0
+    summary.update([f"once{i}" for i in range(10)] + ["a"] * 5)
+    assert len(summary) <= 4 and "a" in summary
+    # 하한: 실제 횟수(7) 이하, 오차 이내
+    assert 7 - summary.error <= summary.count("a") <= 7
+    left, right = HeavyHitters(k=8).update("xxyz"), HeavyHitters(k=8).update("xyy", orders=[0, 1, 2])
+    merged = HeavyHitters.from_list(left.to_list()).merge(right, order_offset=4)
+    assert merged.count("x") == 3 and merged.count("y") == 3 and merged.entries["y"][1] is None
+
+
+def test_registry_plugins_in_state_results():
+    records = make_records()
+    registry = DetectorRegistry(BUILTIN_DETECTORS + [
+        Detector("row_count", lambda frame: (len(frame), len(frame)), "Row Count", 10,
+                 fields=("row_count_score", "row_count_rows")),
+        Detector("state_rows", lambda frame: (0, 0), "State Rows", 10, fields=("state_rows_score",),
+                 state_func=lambda state: (1, state.n_rows)),
+    ])
+    state = DetectorState.from_transactions(records[:80]).update(records[80:])
+    results = state.results(records[-30:], registry=registry)
+    full = AnomalyScores(records, registry=registry).results()
+    assert results["scores_dict"]["Row Count"] == 30 and full["scores_dict"]["Row Count"] == len(records)
+    assert results["scores_dict"]["State Rows"] == 1 and full["scores_dict"]["State Rows"] == 0
+    assert results["row_count_rows"] == 30 and results["state_rows_score"] == 1
+    builtin = {key: value for key, value in results["scores_dict"].items() if key not in ("Row Count", "State Rows")}
+    assert builtin == AnomalyScores(records).scores_dict
+    assert results["total_score"] == sum(results["scores_dict"].values())
+
+
+if __name__ == "__main__":
+    test_update_matches_full_recompute()
+    test_merge_matches_full_recompute()
+    test_sketch_error_bounded()
+    test_state_roundtrip_and_rescore()
+    test_rescore_with_non_monotonic_block_times()
+    test_rescore_frames_only_new_rows()
+    test_sketch_serialize_and_merge_shards()
+    test_state_size_bounded()
+    test_heavy_hitters_exact_until_full()
+    test_registry_plugins_in_state_results()
+    print("✅ Incremental scoring tests passed!")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+주소 라벨 인덱스 테스트 (한 번만 로드, mtime 이 바뀐 경우에만 다시 로드)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logic.labels import LabelIndex
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def make_data_dir():
+    data_dir = tempfile.mkdtemp()
+    write(os.path.join(data_dir, "blacklist.txt"), "1Bad\n\n1Shared\n")
+    write(os.path.join(data_dir, "mixer_addresses.txt"), "# 주석\nbc1qmix,Wasabi,CoinJoin,Chainalysis\nshort,line\n")
+    write(os.path.join(data_dir, "wbtc_bridge.txt"), "1Shared,WBTC,Custody\n")
+    write(os.path.join(data_dir, "exchange_addresses.txt"), "1Ex,Binance,Hot,Batch,OXT\n")
+    return data_dir
+
+
+def test_merged_labels():
+    index = LabelIndex(make_data_dir()).refresh()
+    assert dict(index.category("mixer")) == {"bc1qmix": "Wasabi (Chainalysis)"}
+    assert index.labels("1Shared") == (("blacklist", "blacklist"), ("bridge", "WBTC (Unknown)"))
+    assert index.labels("1Ex") == (("exchange", "Binance (Hot, Batch, OXT)"),)
+    assert index.labels("1Nobody") == ()
+    assert ("samourai_mixer.txt", os.path.join(index.data_dir, "samourai_mixer.txt")) in index.missing("mixer")
+    # real_exchange_addresses.txt 가 없어서 폴백 파일을 씀
+    assert [name for name, _ in index.missing("exchange")] == ["real_exchange_addresses.txt"]
+
+
+def test_reload_only_on_mtime_change():
+    data_dir = make_data_dir()
+    index = LabelIndex(data_dir)
+    for _ in range(3):
+        index.category("blacklist")
+    assert index.loads == 1
+
+    path = os.path.join(data_dir, "blacklist.txt")
+    write(path, "1Bad\n1New\n")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert "1New" in index.category("blacklist")
+    assert index.loads == 2
+
+    # 우선순위가 높은 거래소 파일이 생기면 그것으로 교체
+    write(os.path.join(data_dir, "real_exchange_addresses.txt"), "3Real,Kraken,Cold,Multisig,Docs\n")
+    assert list(index.category("exchange")) == ["3Real"]
+    assert index.loads == 3
+
+
+if __name__ == "__main__":
+    test_merged_labels()
+    test_reload_only_on_mtime_change()
+    print("✅ Label index tests passed!")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+네트워크 레이아웃 테스트 (numpy force 배치, 노드 집합별 캐시, warm start 시 남은 노드 고정)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from logic.layout import LayoutCache, force_layout
+
+
+def ring(n, prefix="n"):
+    nodes = [f"{prefix}{i}" for i in range(n)]
+    edges = [(nodes[i], nodes[(i + 1) % n]) for i in range(n)]
+    return nodes, edges
+
+
+def test_force_layout_deterministic_and_spread():
+    src, dst = np.arange(20), (np.arange(20) + 1) % 20
+    a = force_layout(20, src, dst, k=3.0, iterations=150)
+    b = force_layout(20, src, dst, k=3.0, iterations=150)
+    assert np.array_equal(a, b)
+    # 노드끼리 겹치지 않고 퍼짐
+    distance = np.linalg.norm(a[:, None] - a[None, :], axis=-1) + np.eye(20)
+    assert distance.min() > 1e-3
+
+    fixed = np.zeros(20, dtype=bool)
+    fixed[:5] = True
+    start = np.random.default_rng(0).random((20, 2))
+    moved = force_layout(20, src, dst, k=3.0, iterations=30, pos=start, fixed=fixed)
+    assert np.array_equal(moved[:5], start[:5]) and not np.array_equal(moved[5:], start[5:])
+
+
+def test_cache_hit_subset_and_warm_start():
+    cache = LayoutCache(size=4)
+    nodes, edges = ring(20)
+    first = cache.layout(nodes, edges, scope="A")
+    assert cache.layout(reversed(nodes), edges, scope="A") == first
+    assert cache.stats["hits"] == 1
+
+    # 노드 수를 줄이면 (모두 배치한 적 있는 노드) 위치 그대로
+    fewer = cache.layout(nodes[:12], edges[:11], scope="A")
+    assert fewer == {node: first[node] for node in nodes[:12]}
+    assert cache.stats["reused"] == 1
+
+    # 노드가 늘어도 남아 있던 노드는 움직이지 않고 새 노드만 배치
+    extra, extra_edges = ring(5, prefix="x")
+    more = cache.layout(nodes + extra, edges + extra_edges + [(nodes[0], extra[0])], scope="A")
+    assert all(more[node] == first[node] for node in nodes)
+    assert all(np.isfinite(more[node]).all() for node in extra)
+    assert cache.stats["warm"] == 1
+
+    # 다른 범위(다른 분석 주소)는 처음부터
+    cache.layout(nodes, edges, scope="B")
+    assert cache.stats["cold"] == 2
+    # LRU 크기 제한
+    for n in range(3, 9):
+        cache.layout(*ring(n, prefix=f"r{n}_"), scope="C")
+    assert len(cache._layouts) == 4
+
+
+if __name__ == "__main__":
+    test_force_layout_deterministic_and_spread()
+    test_cache_hit_subset_and_warm_start()
+    print("✅ layout tests passed")
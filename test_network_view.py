@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+네트워크 패널 테스트 (build_network_view 배열 + Plotly WebGL 렌더러의 LOD)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logic.graph import build_network_view
+from ui.network import network_figure
+
+TX_LIST = [
+    {'from': 'A', 'to': 'B', 'amount': 1.0, 'tx_hash': 'tx1', 'timestamp': '2024-01-01'},
+    {'from': 'A', 'to': 'C', 'amount': 0.5, 'tx_hash': 'tx2', 'timestamp': '2024-01-02'},
+    {'from': 'B', 'to': 'D', 'amount': 2.0, 'tx_hash': 'tx3', 'timestamp': '2024-01-03'},
+    {'from': 'C', 'to': 'D', 'amount': 0.25, 'tx_hash': 'tx4', 'timestamp': '2024-01-04'},
+]
+
+
+def tree(branching, depth):
+    """S 에서 hop 마다 branching 개씩 갈라지는 거래 (노드 1 + b + b² + ...)"""
+    tx_list, level = [], ['S']
+    for hop in range(depth):
+        following = []
+        for parent in level:
+            for i in range(branching):
+                child = f'{parent}.{i}'
+                tx_list.append({'from': parent, 'to': child, 'amount': 1 + i, 'tx_hash': f'tx{len(tx_list)}',
+                                'timestamp': '2024-01-01'})
+                following.append(child)
+        level = following
+    return tx_list
+
+
+def test_view_arrays():
+    view = build_network_view(TX_LIST, max_hops=2, top_n=10, source_address='A')
+    assert sorted(view['nodes']) == ['A', 'B', 'C', 'D']
+    n = len(view['nodes'])
+    assert len(view['x']) == len(view['y']) == len(view['role']) == len(view['hop']) == n
+    roles = dict(zip(view['nodes'], view['role']))
+    hops = dict(zip(view['nodes'], view['hop']))
+    assert roles['A'] == 'source' and roles['D'] == 'recipient'
+    assert hops['A'] == 0 and hops['B'] == 1
+    edges = {(view['nodes'][s], view['nodes'][d]): (h, w) for s, d, h, w
+             in zip(view['src'], view['dst'], view['tx_hash'], view['weight'])}
+    assert edges[('B', 'D')] == ('tx3', 2.0)
+    assert build_network_view([]) is None
+
+
+def test_figure_hover_and_lod():
+    view = build_network_view(TX_LIST, max_hops=2, top_n=10, source_address='A')
+    fig = network_figure(view)
+    assert all(trace.type == 'scattergl' for trace in fig.data)
+    arrows = [trace for trace in fig.data if trace.customdata is not None and trace.mode == 'markers'
+              and trace.marker.symbol == 'triangle-up']
+    assert sorted(row[0] for row in arrows[0].customdata) == ['tx1', 'tx2', 'tx3', 'tx4']
+    assert {trace.name for trace in fig.data if trace.name} == {
+        'Source Address', 'Recipient Addresses', 'Intermediate Addresses'}
+
+    # 노드 수천 개: 엣지는 상한까지만, 라벨은 상위 노드만
+    big = build_network_view(tree(12, 3), max_hops=3, top_n=2000, source_address='S')
+    assert len(big['nodes']) > 1500
+    fig = network_figure(big, max_edges=500, label_nodes=20)
+    arrows = [trace for trace in fig.data if trace.marker.symbol == 'triangle-up'][0]
+    assert len(arrows.x) == 500
+    text = [trace for trace in fig.data if trace.mode == 'text'][0]
+    assert len(text.text) <= 21 and 'S' in text.text
+
+
+def test_view_path_without_networkx():
+    # 화면용 배열은 CSR/선택된 엣지 배열 연산만으로 (networkx 는 PNG 경로에서만)
+    import logic.graph as graph
+    original = graph.nx
+    graph.nx = None
+    try:
+        view = build_network_view(tree(6, 3), max_hops=3, top_n=400, source_address='S')
+    finally:
+        graph.nx = original
+    roles = dict(zip(view['nodes'], view['role']))
+    degree = dict(zip(view['nodes'], view['degree']))
+    leaf = view['nodes'][view['hop'].index(3)]
+    assert roles['S'] == 'source' and roles['S.0'] == 'intermediate' and roles[leaf] == 'recipient'
+    assert degree['S'] == 6 and degree['S.0'] == 7 and degree[leaf] == 1
+
+
+if __name__ == "__main__":
+    test_view_arrays()
+    test_figure_hover_and_lod()
+    test_view_path_without_networkx()
+    print("✅ network view tests passed")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+preprocess / 시간 기반 탐지 테스트 (epoch 초 block_time 사용)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from api.parser import parse_mempool_transactions
+from logic.preprocess import preprocess
+from logic.detection import interval_anomaly_score, time_gap_anomaly_score
+
+
+def make_tx(txid, block_time):
+    return {"txid": txid, "fee": 100,
+            "vin": [{"prevout": {"scriptpubkey_address": "a", "value": 1000}}],
+            "vout": [{"scriptpubkey_address": "b", "value": 900}],
+            "status": {"confirmed": True, "block_time": block_time}}
+
+
+def test_preprocess_sorts_by_block_time():
+    records = parse_mempool_transactions([make_tx("t3", 1700007200), make_tx("t1", 1700000000),
+                                          make_tx("t2", 1700000030)])
+    result = preprocess(records)
+    assert [r["tx_hash"] for r in result] == ["t1", "t2", "t3"]
+    assert [r["block_time"] for r in result] == [1700000000, 1700000030, 1700007200]
+    assert result[0]["timestamp"] == "2023-11-14T22:13:20"
+
+
+def test_legacy_records_without_block_time_are_parsed():
+    records = [{"timestamp": "2023-01-01T00:01:00", "amount": 1},
+               {"timestamp": "not a date", "amount": 2},
+               {"timestamp": "2023-01-01T00:00:00", "amount": 3}]
+    result = preprocess(records)
+    assert [r["amount"] for r in result] == [3, 1]
+    assert result[0]["block_time"] == 1672531200
+
+
+def test_time_detectors_use_epoch_seconds():
+    tx_list = preprocess(parse_mempool_transactions([make_tx("t1", 1700000000), make_tx("t2", 1700000030),
+                                                     make_tx("t3", 1700007200)]))
+    assert interval_anomaly_score(tx_list) == (5, [30.0])
+    assert time_gap_anomaly_score(tx_list) == (5, [7170.0])
+
+
+if __name__ == "__main__":
+    test_preprocess_sorts_by_block_time()
+    test_legacy_records_without_block_time_are_parsed()
+    test_time_detectors_use_epoch_seconds()
+    print("✅ Preprocess tests passed!")
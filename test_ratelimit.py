@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프로세스 간 공유 토큰 버킷 테스트
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import multiprocessing
+import tempfile
+import time
+
+from api.ratelimit import TokenBucket
+
+
+def test_burst_then_steady_rate():
+    state_dir = tempfile.mkdtemp()
+    bucket = TokenBucket("example.org", rate=20, burst=2, state_dir=state_dir)
+
+    start = time.time()
+    for _ in range(6):
+        bucket.acquire()
+    elapsed = time.time() - start
+
+    assert 0.15 <= elapsed < 0.5
+    assert bucket.stats["acquired"] == 6
+    assert bucket.stats["waited"] > 0
+
+
+def test_penalize_blocks_until_retry_after():
+    bucket = TokenBucket("example.org", rate=10, burst=5, state_dir=tempfile.mkdtemp())
+    bucket.penalize(0.3)
+    assert bucket.current_wait() > 0.25
+
+
+def _worker(state_dir, n):
+    bucket = TokenBucket("shared.example", rate=20, burst=1, state_dir=state_dir)
+    for _ in range(n):
+        bucket.acquire()
+
+
+def test_bucket_is_shared_across_processes():
+    state_dir = tempfile.mkdtemp()
+    procs = [multiprocessing.Process(target=_worker, args=(state_dir, 5)) for _ in range(2)]
+
+    start = time.time()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    elapsed = time.time() - start
+
+    # 프로세스마다 따로 셌다면 ~0.2초, 공유하면 10개 요청에 ~0.45초
+    assert elapsed >= 0.4
+
+
+def test_metrics_read_shared_state_before_first_request():
+    from api import ratelimit
+    state_dir = tempfile.mkdtemp()
+    previous_dir, previous_buckets = ratelimit.RATE_LIMIT_DIR, dict(ratelimit._buckets)
+    ratelimit.RATE_LIMIT_DIR = state_dir
+    ratelimit._buckets.clear()
+    try:
+        # 다른 프로세스가 429 를 받아 버킷을 비운 상황 — 이 프로세스는 아직 요청 전
+        rate, burst = ratelimit._limit_for("mempool.space")
+        TokenBucket("mempool.space", rate, burst, state_dir=state_dir).penalize(3)
+        assert "mempool.space" not in ratelimit.metrics()
+        wait = ratelimit.metrics(hosts=("mempool.space",))["mempool.space"]["current_wait"]
+        assert 2.5 < wait <= 3.2
+    finally:
+        ratelimit.RATE_LIMIT_DIR = previous_dir
+        ratelimit._buckets.clear()
+        ratelimit._buckets.update(previous_buckets)
+
+
+if __name__ == "__main__":
+    test_burst_then_steady_rate()
+    test_penalize_blocks_until_retry_after()
+    test_bucket_is_shared_across_processes()
+    test_metrics_read_shared_state_before_first_request()
+    print("✅ Rate limiter tests passed!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+통합 점수 엔진 테스트 (개별 탐지 함수와 같은 결과, 공유 결과 재사용 확인)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logic.registry import BUILTIN_DETECTORS, Detector, DetectorRegistry
+from logic.scoring import AnomalyScores, SCORE_KEYS, score_transactions
+from logic.txframe import TxFrame
+from logic.detection import (interval_anomaly_score, amount_anomaly_score, repeated_address_score,
+                             time_gap_anomaly_score, blacklist_score, mixer_detection_score,
+                             cross_chain_detection_score, money_laundering_risk_score)
+
+from test_txframe import make_records as make_frame_records
+
+
+def make_records():
+    return make_frame_records(with_io=True)
+
+
+def test_matches_individual_detectors():
+    records = make_records()
+    results = score_transactions(records)
+    assert list(results['scores_dict']) == SCORE_KEYS
+    expected = [
+        interval_anomaly_score(records)[0],
+        amount_anomaly_score(records)[0],
+        repeated_address_score(records)[0],
+        time_gap_anomaly_score(records)[0],
+        blacklist_score(records)[1],
+        mixer_detection_score(records)[0],
+        cross_chain_detection_score(records)[0],
+        money_laundering_risk_score(records)[0],
+    ]
+    assert list(results['scores_dict'].values()) == expected
+    assert results['total_score'] == sum(expected)
+    assert results['mixer_indicators'] == mixer_detection_score(records)[1]
+    assert results['laundering_indicators'] == money_laundering_risk_score(records)[1]
+
+
+def test_shared_results_computed_once():
+    calls = []
+
+    def counting(tx_list):
+        calls.append(tx_list)
+        return mixer_detection_score(tx_list)
+
+    registry = DetectorRegistry(BUILTIN_DETECTORS)
+    registry.register(Detector("mixer", counting, "Mixer Score", 95, cost="io",
+                               fields=("mixer_score_val", "mixer_indicators")))
+    scores = AnomalyScores(TxFrame(make_records()), registry=registry)
+    scores.results()
+    scores.scores_dict
+    assert len(calls) == 1
+    assert set(scores.timings) == {d.key for d in registry}
+
+
+def test_registered_detector_joins_total():
+    registry = DetectorRegistry(BUILTIN_DETECTORS)
+    registry.register(Detector("fee_spike", lambda frame, mixer: (7 if mixer[0] else 0, []), "Fee Spike Score", 10,
+                               params={"mixer": "mixer"}, cost="heavy"))
+    results = AnomalyScores(make_records(), registry=registry, workers=2).results()
+    assert list(results['scores_dict'])[-1] == "Fee Spike Score"
+    assert results['scores_dict']["Fee Spike Score"] == 7
+    assert results['total_score'] == score_transactions(make_records())['total_score'] + 7
+    assert [d.key for d in registry.waves()[-1]] == ["money_laundering", "fee_spike"]
+
+    registry.register(Detector("loop", lambda frame, x: x, "Loop", 0, params={"x": "loop"}))
+    try:
+        registry.waves()
+        assert False, "dependency cycle must be rejected"
+    except ValueError:
+        pass
+
+
+def test_explicit_workers_ignore_global_setting():
+    import logic.scoring as scoring
+    previous = scoring.DETECTOR_WORKERS
+    scoring.DETECTOR_WORKERS = 0
+    try:
+        # 전역 설정이 0(순차)이어도 workers=2 를 넘기면 그 크기의 풀로 실행
+        results = AnomalyScores(make_records(), workers=2).results()
+    finally:
+        scoring.DETECTOR_WORKERS = previous
+    assert results['total_score'] == score_transactions(make_records())['total_score']
+
+
+if __name__ == "__main__":
+    test_matches_individual_detectors()
+    test_shared_results_computed_once()
+    test_registered_detector_joins_total()
+    test_explicit_workers_ignore_global_setting()
+    print("✅ Scoring tests passed!")
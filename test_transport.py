@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공유 HTTP 전송 계층 테스트 (가짜 세션으로 재시도/백오프 동작 확인)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+import api.transport as transport
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b"{}"
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def run_with_session(session, url="https://mempool.space/api/x", **kwargs):
+    real_session, real_base = transport._session, transport.HTTP_BACKOFF_BASE
+    transport._session, transport.HTTP_BACKOFF_BASE = session, 0
+    try:
+        return transport.http_get(url, **kwargs)
+    finally:
+        transport._session, transport.HTTP_BACKOFF_BASE = real_session, real_base
+
+
+def test_retries_429_and_5xx_then_succeeds():
+    session = FakeSession([FakeResponse(429), FakeResponse(503), FakeResponse(200)])
+    response = run_with_session(session)
+    assert response.status_code == 200
+    assert session.calls == 3
+
+
+def test_returns_last_response_when_retries_exhausted():
+    session = FakeSession([FakeResponse(502)] * 3)
+    response = run_with_session(session, retries=2)
+    assert response.status_code == 502
+    assert session.calls == 3
+
+
+def test_client_errors_are_not_retried():
+    session = FakeSession([FakeResponse(404)])
+    assert run_with_session(session).status_code == 404
+    assert session.calls == 1
+
+
+def test_connection_errors_reraise_after_retries():
+    session = FakeSession([requests.ConnectionError("boom")] * 2)
+    try:
+        run_with_session(session, retries=1)
+    except requests.ConnectionError:
+        pass
+    else:
+        raise AssertionError("ConnectionError was swallowed")
+    assert session.calls == 2
+
+
+def test_backoff_honours_retry_after():
+    assert transport.backoff_delay(0, retry_after=3) >= 3
+    assert transport.backoff_delay(10) <= transport.HTTP_BACKOFF_MAX
+
+
+if __name__ == "__main__":
+    test_retries_429_and_5xx_then_succeeds()
+    test_returns_last_response_when_retries_exhausted()
+    test_client_errors_are_not_retried()
+    test_connection_errors_reraise_after_retries()
+    test_backoff_honours_retry_after()
+    print("✅ Transport tests passed!")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+디스크 트랜잭션 캐시 테스트 (가짜 mempool.space 응답 사용)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import api.fetch as fetch
+from api.cache import TxCache
+
+_real_get_json = fetch._get_json
+
+
+class FakeChain:
+    """최신순 히스토리와 tip 높이를 흉내내는 가짜 API"""
+
+    def __init__(self, n_confirmed, tip=1000):
+        self.tip = tip
+        self.mempool = []
+        self.chain = [self._tx(f"c{i}", tip - i) for i in range(n_confirmed)]
+        self.calls = []
+
+    def _tx(self, txid, height):
+        return {"txid": txid, "status": {"confirmed": True, "block_height": height,
+                                         "block_time": 1700000000 + height * 600}}
+
+    def mine(self, n_new):
+        self.tip += 1
+        new = [self._tx(f"n{self.tip}_{i}", self.tip) for i in range(n_new)]
+        self.chain = new + self.chain
+
+    def get_json(self, url):
+        self.calls.append(url)
+        size = fetch.MEMPOOL_CHAIN_PAGE_SIZE
+        if url.endswith("/blocks/tip/height"):
+            return 200, self.tip, 4
+        if url.endswith("/txs/mempool"):
+            return 200, list(self.mempool), 10
+        if "/txs/chain/" in url:
+            last = url.rsplit("/", 1)[1]
+            idx = next(i for i, tx in enumerate(self.chain) if tx["txid"] == last) + 1
+            page = self.chain[idx:idx + size]
+        else:
+            page = self.mempool + self.chain[:size]
+        return 200, page, 100 * len(page)
+
+
+def setup_chain(n_confirmed):
+    chain = FakeChain(n_confirmed)
+    fetch._get_json = chain.get_json
+    return chain
+
+
+def test_second_lookup_is_served_from_cache():
+    chain = setup_chain(60)
+    cache = TxCache(":memory:")
+
+    txs, stats = fetch.fetch_with_cache("addr", max_txs=0, cache=cache)
+    assert stats["cache"] == "miss"
+    assert [tx["txid"] for tx in txs] == [tx["txid"] for tx in chain.chain]
+
+    chain.calls.clear()
+    txs2, stats2 = fetch.fetch_with_cache("addr", max_txs=0, cache=cache)
+    assert stats2["cache"] == "hit"
+    assert chain.calls == []
+    assert txs2 == txs
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_unchanged_tip_only_refreshes_mempool():
+    chain = setup_chain(30)
+    cache = TxCache(":memory:", unconfirmed_ttl=0)
+    fetch.fetch_with_cache("addr", max_txs=0, cache=cache)
+
+    chain.mempool = [{"txid": "m0", "status": {"confirmed": False}}]
+    chain.calls.clear()
+    txs, stats = fetch.fetch_with_cache("addr", max_txs=0, cache=cache)
+
+    assert stats["cache"] == "partial"
+    assert len(chain.calls) == 2
+    assert txs[0]["txid"] == "m0"
+    assert len(txs) == 31
+
+
+def test_new_block_fetches_only_new_pages():
+    chain = setup_chain(100)
+    cache = TxCache(":memory:", unconfirmed_ttl=0)
+    fetch.fetch_with_cache("addr", max_txs=0, cache=cache)
+
+    chain.mine(3)
+    chain.calls.clear()
+    txs, stats = fetch.fetch_with_cache("addr", max_txs=0, cache=cache)
+
+    assert [tx["txid"] for tx in txs] == [tx["txid"] for tx in chain.chain]
+    assert stats["pages"] == 1
+    assert stats["complete"] is True
+
+
+def test_budget_is_extended_from_oldest_cursor():
+    chain = setup_chain(120)
+    cache = TxCache(":memory:", unconfirmed_ttl=0)
+    txs, _ = fetch.fetch_with_cache("addr", max_txs=50, cache=cache)
+    assert len(txs) == 50
+
+    txs, stats = fetch.fetch_with_cache("addr", max_txs=0, cache=cache)
+    assert [tx["txid"] for tx in txs] == [tx["txid"] for tx in chain.chain]
+    assert stats["complete"] is True
+
+
+def test_lru_eviction_keeps_size_bounded():
+    setup_chain(200)
+    cache = TxCache(":memory:", max_bytes=64 * 1024)
+    for i in range(5):
+        fetch.fetch_with_cache(f"addr{i}", max_txs=0, cache=cache)
+    assert cache.stats["evictions"] > 0
+    assert cache.get_entry("addr4") is not None
+
+
+def test_state_only_address_is_not_a_cached_history():
+    chain = setup_chain(30)
+    cache = TxCache(":memory:", max_bytes=64 * 1024)
+    cache.put_state("watched", "detector_state", b"state")
+    assert cache.get_entry("watched") is None
+
+    # tip 조회가 실패해도 빈 히스토리(stale)가 아니라 오류로
+    chain.get_json = lambda url: (503, None, 0)
+    fetch._get_json = chain.get_json
+    txs, stats = fetch.fetch_with_cache("watched", max_txs=0, cache=cache)
+    assert txs == [] and stats["error"] and stats["cache"] == "miss"
+
+    # 상태만 있는 주소도 LRU 로 제거됨
+    setup_chain(200)
+    for i in range(5):
+        fetch.fetch_with_cache(f"addr{i}", max_txs=0, cache=cache)
+    assert cache.get_state("watched", "detector_state") is None
+
+
+def teardown_module(module):
+    fetch._get_json = _real_get_json
+
+
+if __name__ == "__main__":
+    test_second_lookup_is_served_from_cache()
+    test_unchanged_tip_only_refreshes_mempool()
+    test_new_block_fetches_only_new_pages()
+    test_budget_is_extended_from_oldest_cursor()
+    test_lru_eviction_keeps_size_bounded()
+    test_state_only_address_is_not_a_cached_history()
+    print("✅ Cache tests passed!")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TxFrame 테스트 (dict 리스트와 TxFrame 입력의 탐지 결과가 같은지 확인)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from logic.txframe import TxFrame, as_frame
+from logic.detection import (interval_anomaly_score, amount_anomaly_score, repeated_address_score,
+                             time_gap_anomaly_score, mixer_detection_score, cross_chain_detection_score,
+                             money_laundering_risk_score)
+from logic.exchange_pattern_analyzer import ExchangePatternAnalyzer
+
+BASE = 1700000000
+
+
+def make_records(with_io=False):
+    """45초 간격 12개 레코드 (tx 하나에 레코드 두 개). with_io 면 입출력 5개짜리 io 정보도 (test_scoring 등에서 공유)"""
+    records = []
+    for i in range(12):
+        records.append({"timestamp": "", "block_time": BASE + i * 45, "amount": 0.5 if i % 6 else 12.0,
+                        "from": f"src{i % 2}", "to": "bc1qhot" if i % 4 == 0 else f"1dest{i}",
+                        "tx_hash": f"t{i // 2}", "fee": 0.0001})
+        if with_io:
+            records[-1]["io"] = {"n_inputs": 5, "n_outputs": 5, "input_values": [10] * 5,
+                                 "output_values": [10] * 5, "input_types": ["v0_p2wpkh"] * 5,
+                                 "output_types": ["v0_p2wpkh"] * 5}
+    return records
+
+
+def test_frame_arrays():
+    frame = TxFrame(make_records())
+    assert len(frame) == 12
+    assert frame.intervals.tolist() == [45] * 11
+    assert frame.tx_first_rows.tolist() == [0, 2, 4, 6, 8, 10]
+    assert frame.unique_to_addresses()[0] == "bc1qhot"
+    assert frame.repeated_receivers(3) == ["bc1qhot"]
+    assert as_frame(frame) is frame
+    try:
+        frame.amounts[0] = 1.0
+        assert False, "frame arrays must be read-only"
+    except ValueError:
+        pass
+
+
+def test_detectors_accept_frame_or_list():
+    records = make_records()
+    frame = TxFrame(records)
+    for detector in (interval_anomaly_score, amount_anomaly_score, repeated_address_score,
+                     time_gap_anomaly_score, mixer_detection_score, cross_chain_detection_score,
+                     money_laundering_risk_score):
+        assert detector(records) == detector(frame), detector.__name__
+
+    assert interval_anomaly_score(frame) == (25, [45.0] * 11)
+    assert repeated_address_score(frame) == (5, ["bc1qhot"])
+    assert amount_anomaly_score(frame)[1] == [12.0] * 2
+
+
+def test_frame_from_columns():
+    # 파서 컬럼에서 바로 만든 프레임 = 레코드로 펼쳐 preprocess 한 프레임 (레코드는 읽을 때만 만듦)
+    from api.parser import parse_mempool_columns
+    from logic.preprocess import preprocess
+    from logic.scoring import AnomalyScores
+    from test_columnar import SAMPLE, make_tx
+
+    txs = SAMPLE + [make_tx("t5", [("c", 900), ("a", 100)], [("bc1qhot", 500), ("h", 400)], block_time=1699999000),
+                    make_tx("t6", [("h", 400)], [("bc1qhot", 400)], block_time=1700000600)]
+    columns = parse_mempool_columns(txs)
+    frame = TxFrame.from_columns(columns)
+    expected = TxFrame(preprocess(columns.to_records()))
+    assert frame._records is None and len(frame) == len(expected)
+    for name in ("times", "valid", "intervals", "sorted_times", "hours", "amounts", "has_amount", "from_ids",
+                 "to_ids", "address_ids", "tx_ids", "tx_first_rows"):
+        assert np.array_equal(getattr(frame, name), getattr(expected, name)), name
+    assert frame.addresses == expected.addresses and frame.receivers == expected.receivers
+    scores = AnomalyScores(frame, workers=0).results()
+    scores.pop("detector_timings")
+    assert scores == {key: value for key, value in AnomalyScores(expected, workers=0).results().items()
+                      if key != "detector_timings"}
+    assert list(frame) == list(expected)
+
+
+def analyze_like_app(frame, source):
+    """app/배치와 같은 분석 단계 (탐지 전부, 거래소 패턴, 시나리오 통계, 네트워크 뷰)"""
+    from logic.detection import exchange_detection_score
+    from logic.graph import build_network_view
+    from logic.scenario_matcher import compute_tx_stats
+    from logic.scoring import AnomalyScores
+    from logic.txgraph import TxGraph
+
+    scores = AnomalyScores(frame, workers=0).results()
+    scores.pop("detector_timings")
+    exchange = exchange_detection_score(frame)
+    stats = compute_tx_stats(frame, scores["short_intervals"], scores["flagged_addresses"])
+    view = build_network_view(TxGraph(frame), max_hops=2, top_n=50, source_address=source)
+    return scores, exchange, stats, view
+
+
+def coinjoin_txs(n_txs, width):
+    from test_columnar import make_tx
+
+    return [make_tx(f"cj{t}", [(f"in{t}_{i}", 10000 + i) for i in range(width)],
+                    [(f"out{t}_{o}", 5000) for o in range(width)] + [("bc1qhot", 700 + t)],
+                    block_time=1700000000 + (t * 7919) % 40 * 600, fee=0 if t % 3 else 51000000000)
+            for t in range(n_txs)]
+
+
+def test_columns_analysis_without_records():
+    # 컬럼 프레임으로 분석 전체를 돌려도 레코드 dict 를 만들지 않고, 결과는 레코드 경로와 같음
+    import tracemalloc
+    from api.parser import parse_mempool_columns
+    from logic.preprocess import preprocess
+
+    columns = parse_mempool_columns(coinjoin_txs(12, 6))
+    frame = TxFrame.from_columns(columns)
+    scores, exchange, stats, view = analyze_like_app(frame, "in0_0")
+    assert frame._records is None
+    expected = analyze_like_app(TxFrame(preprocess(columns.to_records())), "in0_0")
+    assert (scores, exchange, stats) == expected[:3] and stats["high_fee_flag"]
+    assert scores["scores_dict"]["Mixer Score"] > 0
+    for key in ("nodes", "role", "degree", "tx_hash", "timestamp"):
+        assert list(view[key]) == list(expected[3][key]), key
+
+    # CoinJoin 40개 (50 입력 × 50 출력 = 엣지 10만 개): 레코드로 펼치면 수십 MB
+    tracemalloc.start()
+    frame = TxFrame.from_columns(parse_mempool_columns(coinjoin_txs(40, 50)))
+    analyze_like_app(frame, "in0_0")
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert frame._records is None and peak < 32 * 1024 * 1024
+
+
+def test_exchange_time_patterns():
+    analyzer = ExchangePatternAnalyzer()
+    patterns = analyzer.analyze_time_patterns(make_records())
+    assert patterns["total_transactions"] == 12
+    assert patterns["regular_intervals"] == 1.0
+    assert patterns["batch_processing"] == 1.0
+    assert np.isclose(patterns["avg_interval"], 45)
+
+
+if __name__ == "__main__":
+    test_frame_arrays()
+    test_detectors_accept_frame_or_list()
+    test_frame_from_columns()
+    test_columns_analysis_without_records()
+    test_exchange_time_patterns()
+    print("✅ TxFrame tests passed!")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSR 트랜잭션 그래프 테스트 (인접 배열, hop 확장, 통계 공유)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logic.txgraph import TxGraph
+from logic.graph import expand_network, get_network_stats, get_max_available_nodes, resolve_source
+
+CHAIN = [
+    {'from': 'A', 'to': 'B', 'amount': 1, 'tx_hash': 'tx1', 'timestamp': '2024-01-01'},
+    {'from': 'B', 'to': 'C', 'amount': 2, 'tx_hash': 'tx2', 'timestamp': '2024-01-02'},
+    {'from': 'C', 'to': 'D', 'amount': 3, 'tx_hash': 'tx3', 'timestamp': '2024-01-03'},
+    {'from': 'A', 'to': 'C', 'amount': 4, 'tx_hash': 'tx4', 'timestamp': '2024-01-04'},
+    {'from': 'A', 'to': 'B', 'amount': 5, 'tx_hash': 'tx5', 'timestamp': '2024-01-05'},
+]
+
+
+def names(graph, ids):
+    return [graph.addresses[i] for i in ids]
+
+
+def test_csr_adjacency():
+    graph = TxGraph(CHAIN)
+    a = graph.node_id('A')
+    targets, weights, rows = graph.out_edges(a)
+    assert names(graph, targets.tolist()) == ['B', 'C', 'B']
+    assert weights.tolist() == [1, 4, 5] and rows.tolist() == [0, 3, 4]
+    assert graph.out_degree(graph.node_id('D')) == 0
+    assert graph.first_incoming_row(graph.node_id('C')) == 1
+    assert graph.node_id('Z') == -1
+    assert not graph.out_targets.flags.writeable
+
+
+def test_expand_by_hops():
+    graph = TxGraph(CHAIN)
+    a = graph.node_id('A')
+    visited, edges = expand_network(graph, a, 1)
+    assert {graph.addresses[n]: hop for n, hop in visited.items()} == {'A': 0, 'B': 1, 'C': 1, 'D': 1}
+    # 같은 주소 쌍은 첫 레코드로 한 번만
+    assert edges[(a, graph.node_id('B'))] == 0
+    visited, _ = expand_network(graph, a, 3)
+    assert len(visited) == 4
+
+
+def test_shared_stats_and_source():
+    graph = TxGraph(CHAIN)
+    stats = get_network_stats(graph)
+    assert stats == {'total_nodes': 4, 'total_edges': 5, 'unique_recipients': 3, 'total_volume': 15.0,
+                     'max_available_nodes': 4}
+    assert get_max_available_nodes(graph) == 4
+    assert get_network_stats([]) is None and get_max_available_nodes([]) == 15
+    # 나가는 거래가 없는 주소면 들어온 첫 거래의 보낸 주소에서 시작
+    assert resolve_source(graph, 'D') == 'C'
+    assert resolve_source(graph, 'nowhere') == 'A'
+
+
+if __name__ == "__main__":
+    test_csr_adjacency()
+    test_expand_by_hops()
+    test_shared_stats_and_source()
+    print("✅ txgraph tests passed")
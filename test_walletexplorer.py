@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import requests
 import time
+from api.transport import http_get
 from logic.exchange_identifier import ExchangeIdentifier
 
 def test_walletexplorer_api():
@@ -36,7 +36,7 @@ def test_walletexplorer_api():
                 'Upgrade-Insecure-Requests': '1',
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
+            response = http_get(url, headers=headers, timeout=15)
             print(f"   상태 코드: {response.status_code}")
             
             if response.status_code == 200:
@@ -0,0 +1,91 @@
+import threading
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+try:
+    from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+except ImportError:  # 예전 streamlit
+    from streamlit.runtime.scriptrunner.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+
+# logic.events 구독자 — 로직 계층이 보낸 알림을 Streamlit 화면에 그림
+# 사용: with listening(streamlit_sink()): ... (app.main 전체를 감쌈)
+
+METHOD_NAMES = {
+    'public_database': '공개 데이터베이스 검색',
+    'pattern_analysis': '거래 패턴 분석',
+    'official_address': '공식 주소 확인',
+    'cluster_analysis': '지갑 클러스터 분석'
+}
+
+
+def render_exchange_steps(steps, cross_validation, methods_used):
+    """거래소 식별 단계별 진행상황 스텝바 (가로 행) + 교차 검증 상세"""
+    cols = st.columns(len(steps))
+    for i, (name, success, icon) in enumerate(steps):
+        with cols[i]:
+            color = "#08BDBD" if success else "#ccc"
+            status = "✅ 성공" if success else "❌ 실패"
+            st.markdown(f"""
+            <div style='text-align: center; padding: 12px; border: 2px solid {color}; border-radius: 8px; background: {color}22;'>
+                <div style='font-size: 28px; color: {color}; margin-bottom: 8px;'>{icon}</div>
+                <div style='font-size: 16px; color: {color}; font-weight: bold; margin-bottom: 4px;'>{name}</div>
+                <div style='font-size: 14px; color: {color};'>{status}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # 교차 검증/세부 정보는 토글(expander)로
+    with st.expander("🔬 교차 검증 상세 보기", expanded=False):
+        st.markdown(f"""
+        <ul>
+            <li>검증 점수: <b>{cross_validation.get('validation_score', 0)}/{cross_validation.get('total_methods', 0)}</b></li>
+            <li>검증 비율: <b>{cross_validation.get('cross_validation_ratio', 0):.1%}</b></li>
+            <li>최종 신뢰도: <b>{cross_validation.get('final_confidence', 'low')}</b></li>
+        </ul>
+        """, unsafe_allow_html=True)
+        if methods_used:
+            st.markdown(f"**📋 사용된 식별 방법:**")
+            for method in methods_used:
+                st.caption(f"• {METHOD_NAMES.get(method, method)}")
+
+
+RENDERERS = {
+    "exchange_steps": render_exchange_steps,
+}
+
+
+def _render(event):
+    renderer = RENDERERS.get(event.kind)
+    if renderer is not None:
+        renderer(**event.data)
+    elif event.level == "error":
+        st.error(event.message)
+    else:
+        st.markdown(f"**{event.message}**")
+
+
+def streamlit_sink():
+    """
+    현재 세션 화면에 그리는 구독자
+    탐지 워커 스레드에서 온 이벤트도 이 세션에 붙도록, 만들 때의 스크립트 컨텍스트를 기억해 둠
+    풀 스레드는 여러 세션이 돌려 쓰므로 그릴 때만 이 세션 컨텍스트를 붙이고 끝나면 원래대로 되돌림
+    (다른 세션 컨텍스트가 붙어 있던 스레드에서도 이 세션 화면에 그려짐)
+    """
+    ctx = get_script_run_ctx()
+
+    def sink(event):
+        thread = threading.current_thread()
+        previous = get_script_run_ctx(suppress_warning=True)
+        if ctx is None or previous is ctx:
+            _render(event)
+            return
+        add_script_run_ctx(thread, ctx)
+        try:
+            _render(event)
+        finally:
+            if previous is None:
+                delattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME)
+            else:
+                add_script_run_ctx(thread, previous)
+
+    return sink
@@ -78,6 +78,7 @@ def get_text(lang):
             **정의:** Wasabi, Samourai, JoinMarket 등 믹서 서비스의 특징적 패턴 탐지  
             **탐지 방법:**
             - 다중 입력/출력 패턴: 3개 이상 입력/출력 시 +5점 (최대 20점)
+            - 동일 금액 출력 CoinJoin: 같은 금액 출력 3개 이상인 트랜잭션당 +10점 (최대 25점)
             - 동일 금액 반복: 같은 금액 2회 이상 반복 시 +3점 (최대 15점)
             - 빠른 연속 트랜잭션: 30초 이내 연속이 50% 이상 시 +10점
             **점수 기준:** 최대 25점
@@ -195,6 +196,9 @@ def get_text(lang):
             "saved_settings": "저장된 설정",
             "current_settings": "현재 설정",
             "not_saved": "저장되지 않음",
+            "live_expansion": "실시간 다중 hop 확장",
+            "live_expansion_help": "hop 마다 이웃 주소의 거래를 실제로 조회해 네트워크를 넓힙니다 (조회 주소/거래 수 예산 있음)",
+            "live_expansion_status": "hop {hop}: 조회한 주소 {addresses}개, 레코드 {records}개",
             
             # 시나리오 매칭 설정
             "scenario_matching_settings": "시나리오 매칭 설정",
@@ -283,6 +287,7 @@ def get_text(lang):
             **Definition:** Detects characteristic patterns of mixer services like Wasabi, Samourai, JoinMarket  
             **Detection Methods:**
             - Multi I/O Pattern: +5 pts per transaction with >3 inputs/outputs (max 20 pts)
+            - Equal-output CoinJoin: +10 pts per transaction with ≥3 equal-value outputs (max 25 pts)
             - Repeated Amount Pattern: +3 pts per repeated amount ≥2 times (max 15 pts)
             - Fast Sequential Transactions: +10 pts if >50% intervals <30s
             **Scoring:** Maximum 25 points
@@ -400,6 +405,9 @@ def get_text(lang):
             "saved_settings": "Saved Settings",
             "current_settings": "Current Settings",
             "not_saved": "Not Saved",
+            "live_expansion": "Live multi-hop expansion",
+            "live_expansion_help": "Fetch neighbor addresses' transactions hop by hop to grow the network (bounded address/tx budget)",
+            "live_expansion_status": "hop {hop}: {addresses} addresses fetched, {records} records",
             
             # Scenario Matching Settings
             "scenario_matching_settings": "Scenario Matching Settings",
@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+from dotenv import load_dotenv
+
+from logic.graph import NODE_COLORS
+
+load_dotenv()
+
+# 네트워크 패널 렌더러 — logic.graph.build_network_view 의 배열을 Plotly WebGL(Scattergl) 트레이스로
+# 서버는 배열을 JSON 으로 보내기만 하고 그리기/확대/hover 는 브라우저에서
+# 노드가 많을 때(LOD):
+#   - 엣지는 거래량 상위 NETWORK_MAX_EDGES 개만, 굵기 4단계로 나눠 단계마다 선 트레이스 하나
+#   - 라벨은 연결 수 상위 NETWORK_LABEL_NODES 개(+ 소스)만, 나머지 노드는 hover 로 주소 확인
+#   - 노드 크기는 노드 수에 맞춰 줄임
+NETWORK_MAX_EDGES = int(os.getenv("NETWORK_MAX_EDGES", "5000"))
+NETWORK_LABEL_NODES = 30
+
+ROLE_LABELS = {'source': 'Source Address', 'recipient': 'Recipient Addresses',
+               'intermediate': 'Intermediate Addresses'}
+ROLE_SIZES = {'source': 28, 'recipient': 18, 'intermediate': 16}
+EDGE_COLOR = '#FF6B6B'
+EDGE_WIDTHS = (1.0, 2.0, 3.5, 5.0)
+# 화살표(엣지 hover 지점)는 받는 노드 쪽 80% 지점
+ARROW_AT = 0.8
+
+
+def _short(address):
+    return address[:8] + "..." if len(address) > 8 else address
+
+
+def _segments(x0, y0, x1, y1):
+    """선분들을 한 트레이스로 — (x0, x1, 끊김) 반복"""
+    gap = np.full(len(x0), np.nan)
+    return np.column_stack([x0, x1, gap]).ravel(), np.column_stack([y0, y1, gap]).ravel()
+
+
+def _edge_traces(view, x, y, max_edges):
+    weight = np.asarray(view['weight'], dtype=np.float64)
+    keep = np.argsort(-weight, kind='stable')[:max_edges]
+    src = np.asarray(view['src'], dtype=np.int64)[keep]
+    dst = np.asarray(view['dst'], dtype=np.int64)[keep]
+    weight = weight[keep]
+    if not len(keep):
+        return [], 0
+
+    traces = []
+    ratio = weight / weight.max() if weight.max() > 0 else np.zeros(len(weight))
+    level = np.minimum((ratio * len(EDGE_WIDTHS)).astype(np.int64), len(EDGE_WIDTHS) - 1)
+    for i, width in enumerate(EDGE_WIDTHS):
+        mask = level == i
+        if mask.any():
+            sx, sy = _segments(x[src[mask]], y[src[mask]], x[dst[mask]], y[dst[mask]])
+            traces.append(go.Scattergl(x=sx, y=sy, mode='lines', line=dict(color=EDGE_COLOR, width=width),
+                                       hoverinfo='skip', showlegend=False))
+
+    # 방향 화살표 겸 엣지 hover (tx_hash, timestamp, weight)
+    dx, dy = x[dst] - x[src], y[dst] - y[src]
+    tx_hash = np.asarray(view['tx_hash'], dtype=object)[keep]
+    timestamp = np.asarray(view['timestamp'], dtype=object)[keep]
+    traces.append(go.Scattergl(
+        x=x[src] + dx * ARROW_AT, y=y[src] + dy * ARROW_AT, mode='markers',
+        marker=dict(symbol='triangle-up', size=9, color=EDGE_COLOR,
+                    angle=np.degrees(np.arctan2(dx, dy))),
+        customdata=np.column_stack([tx_hash, timestamp, weight]),
+        hovertemplate="tx: %{customdata[0]}<br>%{customdata[1]}<br>%{customdata[2]:.8f} BTC<extra></extra>",
+        showlegend=False))
+    return traces, len(keep)
+
+
+def network_figure(view, max_edges=NETWORK_MAX_EDGES, label_nodes=NETWORK_LABEL_NODES):
+    """build_network_view 결과 → Plotly Figure (WebGL)"""
+    x = np.asarray(view['x'], dtype=np.float64)
+    y = np.asarray(view['y'], dtype=np.float64)
+    nodes = view['nodes']
+    role = np.asarray(view['role'])
+    degree = np.asarray(view['degree'], dtype=np.int64)
+    hop = np.asarray(view['hop'], dtype=np.int64)
+
+    traces, n_edges = _edge_traces(view, x, y, max_edges)
+
+    # 노드가 라벨 수보다 많으면 크기를 줄임 (최소 4px)
+    scale = min(1.0, np.sqrt(label_nodes / max(len(nodes), 1)))
+    for name in ROLE_LABELS:
+        mask = role == name
+        if not mask.any():
+            continue
+        members = np.flatnonzero(mask)
+        traces.append(go.Scattergl(
+            x=x[mask], y=y[mask], mode='markers', name=ROLE_LABELS[name],
+            marker=dict(color=NODE_COLORS[name], size=max(ROLE_SIZES[name] * scale, 4),
+                        line=dict(color='black', width=1.5 if scale == 1.0 else 0.5)),
+            customdata=np.column_stack([np.asarray(nodes, dtype=object)[members], hop[mask], degree[mask]]),
+            hovertemplate="%{customdata[0]}<br>hop %{customdata[1]} · %{customdata[2]} links<extra></extra>"))
+
+    # 라벨은 연결 수 상위 노드(+ 소스)만
+    labeled = np.argsort(-degree, kind='stable')[:label_nodes]
+    labeled = np.union1d(labeled, np.flatnonzero(role == 'source'))
+    traces.append(go.Scattergl(
+        x=x[labeled], y=y[labeled], mode='text', text=[_short(nodes[i]) for i in labeled.tolist()],
+        textposition='top center', textfont=dict(size=12), hoverinfo='skip', showlegend=False))
+
+    fig = go.Figure(traces)
+    culled = f", Culled edges: {len(view['src']) - n_edges}" if n_edges < len(view['src']) else ""
+    fig.update_layout(
+        title=f"Transaction Network Visualization<br><sup>(Max Hops: {view['max_hops']}, "
+              f"Total Nodes: {view['total_nodes']}, Displayed: {len(nodes)}, Edges: {n_edges}{culled})</sup>",
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False, scaleanchor='x'),
+        hovermode='closest',
+        dragmode='pan',
+        height=700,
+        margin=dict(l=10, r=10, t=70, b=10),
+        legend=dict(x=1, y=1, xanchor='right'),
+    )
+    return fig